@@ -0,0 +1,112 @@
+"""
+Compares the JSON codecs available in `kloudless.codec` on a large CRM batch
+request body and a page of events:
+
+    python benchmarks/bench_json_codec.py [--number N]
+"""
+from __future__ import print_function
+
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from kloudless import codec  # noqa: E402
+
+
+def crm_batch(size=500):
+    return {'requests': [{
+        'method': 'POST',
+        'url': 'crm/contacts',
+        'data': {
+            'first_name': u'Contact %s' % i,
+            'last_name': u'Müller',
+            'email': 'contact%s@example.com' % i,
+            'phone': '+1 555 %07d' % i,
+            'title': 'Director of Engineering',
+            'description': u'Imported from the spreadsheet ☀ ' * 4,
+            'raw': {'Industry': 'Software', 'AnnualRevenue': i * 1000.5},
+        },
+    } for i in range(size)]}
+
+
+def event_page(size=1000):
+    return {
+        'count': size,
+        'cursor': 'a' * 40,
+        'remaining': 12345,
+        'objects': [{
+            'id': str(i),
+            'account': 1234,
+            'action': 'add',
+            'ip': '127.0.0.1',
+            'modified': '2019-02-28T20:26:56.630000Z',
+            'type': 'add',
+            'user_id': '5678',
+            'metadata': {
+                'id': 'fMEI3NFBzcEhad3BzTVZFeFFTbGd0U3paUU9FVQ==%s' % i,
+                'name': 'report-%s.pdf' % i,
+                'path': '/Documents/Reports/report-%s.pdf' % i,
+                'size': 873171 + i,
+                'mime_type': 'application/pdf',
+                'created': '2019-02-28T20:26:56.285000Z',
+                'modified': '2019-02-28T20:26:56.630000Z',
+                'downloadable': True,
+                'parent': {'id': 'root', 'name': 'Documents'},
+                'ancestors': None,
+            },
+        } for i in range(size)],
+    }
+
+
+def available_codecs():
+    codecs = []
+    for cls in codec.CODECS:
+        try:
+            codecs.append(cls())
+        except ImportError:
+            print('%s is not installed.' % cls.name)
+    return codecs
+
+
+def time_codec(json_codec, data, encoded, number):
+    """
+    Returns the seconds taken to encode `data` and to decode `encoded`.
+    """
+    encode = min(timeit.repeat(lambda: json_codec.encode(data),
+                               number=number, repeat=3))
+    decode = min(timeit.repeat(lambda: json_codec.loads(encoded),
+                               number=number, repeat=3))
+    return encode / number, decode / number
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('--number', type=int, default=50,
+                        help='Number of times to run each operation.')
+    args = parser.parse_args()
+
+    payloads = [('CRM batch body', crm_batch()), ('Event page', event_page())]
+    codecs = available_codecs()
+    baseline = codec.JSONCodec()
+
+    print('%-16s %-8s %8s %10s %10s %9s %9s' % (
+        'payload', 'codec', 'KiB', 'encode ms', 'decode ms', 'enc gain',
+        'dec gain'))
+    for label, data in payloads:
+        encoded = baseline.encode(data)
+        base_encode, base_decode = time_codec(baseline, data, encoded,
+                                              args.number)
+        for json_codec in codecs:
+            encode, decode = time_codec(json_codec, data, encoded,
+                                        args.number)
+            print('%-16s %-8s %8.1f %10.2f %10.2f %8.1fx %8.1fx' % (
+                label, json_codec.name, len(encoded) / 1024.0,
+                encode * 1000, decode * 1000, base_encode / encode,
+                base_decode / decode))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""
+Compares the memory used by the objects of a large folder listing, as
+created by default, with the `lazy_resources` configuration option and as
+records with the `compact_lists` option:
+
+    python benchmarks/bench_memory.py [--count N]
+
+Requires Python 3 for `tracemalloc`.
+"""
+from __future__ import print_function
+
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from kloudless import codec  # noqa: E402
+from kloudless.resources import Account, Folder  # noqa: E402
+from kloudless.transport import FakeTransport  # noqa: E402
+from payloads import folder_contents  # noqa: E402
+
+
+def measure(configuration, content):
+    """
+    Returns the seconds taken to list the folder, and the bytes allocated
+    for the listing once the response has been decoded.
+    """
+    transport = FakeTransport()
+    transport.add('get', 'accounts/7/storage/folders/root/contents',
+                  content=content)
+    configuration = dict(configuration, transport=transport, api_key='FAKE')
+    folder = Folder(id='root', parent_resource=Account(id=7),
+                    configuration=configuration)
+
+    gc.collect()
+    tracemalloc.start()
+    start = time.time()
+    contents = folder.contents()
+    elapsed = time.time() - start
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del contents
+    return elapsed, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('--count', type=int, default=100000,
+                        help='Number of files in the listing.')
+    args = parser.parse_args()
+
+    data = folder_contents(args.count)
+    content = codec.JSONCodec().encode(data)
+    options = [
+        ('default', {}),
+        ('lazy_resources', {'lazy_resources': True}),
+        ('compact_lists', {'compact_lists': True}),
+    ]
+
+    # The memory of the decoded response itself, for reference.
+    tracemalloc.start()
+    decoded = codec.JSONCodec().loads(content)
+    raw_size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del decoded
+
+    print('%-16s %10s %10s %12s' % ('objects', 'time ms', 'MiB',
+                                    'bytes/object'))
+    print('%-16s %10s %10.1f %12d' % ('decoded JSON', '-',
+                                      raw_size / 1048576.0,
+                                      raw_size // args.count))
+    for label, configuration in options:
+        elapsed, size = measure(configuration, content)
+        print('%-16s %10.1f %10.1f %12d' % (label, elapsed * 1000,
+                                            size / 1048576.0,
+                                            size // args.count))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,182 @@
+"""
+Measures the time and peak memory of creating, serializing and diffing
+resources, without making network requests:
+
+    python benchmarks/bench_resources.py [--sizes 100,10000,100000]
+        [--cases NAME,...] [--repeat N] [--no-memory]
+        [--save FILE] [--compare FILE [--tolerance 0.25]]
+
+Use `--save` to record the results of a release and `--compare` to report
+the cases that became slower or use more memory than recorded, in which
+case the exit status is 1.
+"""
+from __future__ import print_function
+
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from kloudless import config  # noqa: E402
+from kloudless.resources import Account, AnnotatedList, File  # noqa: E402
+import payloads  # noqa: E402
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+configuration = config.merge({'api_key': 'FAKE'})
+account = Account(id=7, configuration=configuration)
+
+
+def files(n):
+    return File.create_from_data(
+        [payloads.file_metadata(i) for i in range(n)],
+        parent_resource=account, configuration=configuration)
+
+
+# Each case prepares its data for `n` objects and returns the function to
+# measure.
+
+def create_from_data(n):
+    data = [payloads.file_metadata(i) for i in range(n)]
+    return lambda: File.create_from_data(data, parent_resource=account,
+                                         configuration=configuration)
+
+
+def populate(n):
+    data = [payloads.file_metadata(i) for i in range(n)]
+    resources = [File(id=d['id'], parent_resource=account,
+                      configuration=configuration) for d in data]
+
+    def run():
+        for resource, d in zip(resources, data):
+            resource.populate(dict(d))
+    return run
+
+
+def serialize(n):
+    resources = files(n)
+    return lambda: [File.serialize(f) for f in resources]
+
+
+def serialize_account(n):
+    accounts = Account.create_from_data(
+        [payloads.account(i) for i in range(n)], configuration=configuration)
+    return lambda: [Account.serialize_account(a) for a in accounts]
+
+
+def save_diffing(n):
+    resources = files(n)
+    for f in resources:
+        f.name = 'renamed-%s' % f.name
+    return lambda: [f._changed_data() for f in resources]
+
+
+def annotated_list(n):
+    page = File.create_from_data(payloads.folder_contents(n),
+                                 parent_resource=account,
+                                 configuration=configuration)
+    return lambda: AnnotatedList(page)
+
+
+CASES = [create_from_data, populate, serialize, serialize_account,
+         save_diffing, annotated_list]
+
+
+def measure(case, n, repeat, memory):
+    """
+    Returns the best of `repeat` times taken in seconds, and the peak bytes
+    allocated while running the case once, or None.
+    """
+    run = case(n)
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.time()
+        run()
+        times.append(time.time() - start)
+
+    peak = None
+    if memory:
+        gc.collect()
+        tracemalloc.start()
+        run()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return min(times), peak
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__.strip(),
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default='100,10000,100000',
+                        help='Comma-separated numbers of objects.')
+    parser.add_argument('--cases', default=None,
+                        help='Comma-separated names of the cases to run.')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Number of times to time each case.')
+    parser.add_argument('--no-memory', action='store_true',
+                        help="Don't measure peak memory with tracemalloc.")
+    parser.add_argument('--save', help='Write the results to a JSON file.')
+    parser.add_argument('--compare',
+                        help='Compare with results written by --save.')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='Relative increase reported as a regression.')
+    args = parser.parse_args()
+
+    sizes = [int(n) for n in args.sizes.split(',')]
+    cases = CASES
+    if args.cases:
+        names = args.cases.split(',')
+        cases = [case for case in CASES if case.__name__ in names]
+    memory = not args.no_memory and tracemalloc is not None
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+    results = {}
+    regressions = []
+    print('%-18s %7s %11s %10s %9s' % ('case', 'objects', 'time ms',
+                                       'peak MiB', 'vs saved'))
+    for case in cases:
+        for n in sizes:
+            seconds, peak = measure(case, n, args.repeat, memory)
+            key = '%s/%s' % (case.__name__, n)
+            results[key] = {'time': seconds, 'peak': peak}
+
+            change = ''
+            saved = baseline.get(key)
+            if saved:
+                ratio = seconds / max(saved['time'], 1e-9)
+                change = '%.2fx' % ratio
+                # Times under a millisecond are too noisy to compare.
+                if (ratio > 1 + args.tolerance and
+                        saved['time'] >= 0.001) or (
+                        peak and saved['peak'] and
+                        peak > saved['peak'] * (1 + args.tolerance)):
+                    regressions.append(key)
+                    change += ' !'
+            print('%-18s %7d %11.2f %10s %9s' % (
+                case.__name__, n, seconds * 1000,
+                '-' if peak is None else '%.2f' % (peak / 1048576.0),
+                change))
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+    if regressions:
+        print('Regressions: %s' % ', '.join(regressions))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
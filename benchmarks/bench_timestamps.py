@@ -0,0 +1,71 @@
+"""
+Measures parsing the timestamps of a 10,000 file listing with
+`util.to_datetime` compared with `dateutil`, and creating the listing with
+and without the `lazy_resources` configuration option, which defers parsing
+until the timestamps are read:
+
+    python benchmarks/bench_timestamps.py [--count N] [--number N]
+"""
+from __future__ import print_function
+
+import argparse
+import os
+import sys
+import timeit
+
+import dateutil.parser
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from kloudless import config, util  # noqa: E402
+from kloudless.resources import Account, Folder  # noqa: E402
+from payloads import folder_contents  # noqa: E402
+
+
+def best(func, number):
+    return min(timeit.repeat(func, number=number, repeat=3)) / number
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('--count', type=int, default=10000,
+                        help='Number of files in the listing.')
+    parser.add_argument('--number', type=int, default=3,
+                        help='Number of times to run each operation.')
+    args = parser.parse_args()
+
+    data = folder_contents(args.count)
+    timestamps = [f[k] for f in data['objects']
+                  for k in ('created', 'modified')]
+    account = Account(id=7)
+
+    def create(configuration):
+        listing = Folder.create_from_data(data, parent_resource=account,
+                                          configuration=configuration)
+        return listing['objects']
+
+    eager = config.merge({'api_key': 'FAKE'})
+    lazy = config.merge({'api_key': 'FAKE', 'lazy_resources': True})
+
+    def create_lazy_and_read():
+        for f in create(lazy):
+            f.modified
+
+    results = [
+        ('dateutil.parser.parse',
+         best(lambda: [dateutil.parser.parse(t) for t in timestamps],
+              args.number)),
+        ('util.to_datetime',
+         best(lambda: [util.to_datetime(t) for t in timestamps],
+              args.number)),
+        ('create listing', best(lambda: create(eager), args.number)),
+        ('create lazy listing', best(lambda: create(lazy), args.number)),
+        ('  and read modified', best(create_lazy_and_read, args.number)),
+    ]
+    print('%-24s %10s' % ('%s files' % args.count, 'ms'))
+    for label, seconds in results:
+        print('%-24s %10.1f' % (label, seconds * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+"""
+Synthetic API responses for the benchmarks, modeled on the fixtures in
+`tests/unit/helpers.py`.
+"""
+
+
+def account(i=7):
+    return {
+        'id': i,
+        'account': 'test%s@example.com' % i,
+        'active': True,
+        'service': 'gdrive',
+        'created': '2014-04-01T20:48:23.472545Z',
+        'modified': '2014-04-23T21:34:49.427199Z',
+        'token': 'token-%s' % i,
+        'token_expiry': '2014-05-01T20:48:23.472545Z',
+        'refresh_token': 'refresh-token-%s' % i,
+        'refresh_token_expiry': None,
+    }
+
+
+def file_metadata(i=0):
+    return {
+        'account': '7',
+        'id': 'fMEI3NFBzcEhad3BzTVZqQXdRMkpIVVdkNGJtOA==%s' % i,
+        'name': 'derp-%s.burp' % i,
+        'type': 'file',
+        'size': 1024000 + i,
+        'mime_type': 'application/octet-stream',
+        'created': '2013-11-27T01:23:10.659000Z',
+        'modified': '2013-11-27T01:23:10.659000Z',
+        'downloadable': True,
+        'parent': {'id': 'root', 'name': 'All Files'},
+    }
+
+
+def folder_contents(count):
+    return {'count': count,
+            'objects': [file_metadata(i) for i in range(count)]}
+
+
+def account_list(count):
+    return {'total': count, 'count': count, 'page': 1,
+            'objects': [account(i) for i in range(count)]}
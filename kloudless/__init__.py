@@ -2,5 +2,6 @@ from .version import VERSION
 __version__ = VERSION
 
 from .config import configure
+from .deadlines import deadline
 from .resources import (BaseResource, Account, File, Folder, Link,
                         Application)
@@ -0,0 +1,393 @@
+"""
+asyncio counterparts of the blocking resource methods. Requires Python 3.5+
+and aiohttp (`pip install kloudless[async]`).
+
+The coroutines are normally reached through the `*_async` methods on the
+resource classes and their proxies, for example:
+
+    account = kloudless.Account(id=account_id)
+    folder = await account.folders.retrieve_async('root')
+
+A single `aiohttp.ClientSession` is shared by all requests made within an
+event loop. Call `await kloudless.aio.close()` before the loop is closed.
+"""
+import asyncio
+import json
+import time
+import weakref
+
+import aiohttp
+import six
+
+from . import cache
+from . import config
+from . import deadlines
+from . import exceptions
+from . import http
+from . import instrumentation
+from .util import account_id_from_path
+
+_sessions = weakref.WeakKeyDictionary()
+
+
+def get_session():
+    """
+    Returns the `aiohttp.ClientSession` for the running event loop.
+    """
+    loop = asyncio.get_event_loop()
+    session = _sessions.get(loop)
+    if session is None or session.closed:
+        session = _sessions[loop] = aiohttp.ClientSession()
+    return session
+
+
+async def close():
+    """
+    Closes the session used by the running event loop.
+    """
+    session = _sessions.pop(asyncio.get_event_loop(), None)
+    if session is not None:
+        await session.close()
+
+
+class Response(object):
+    """
+    Wraps an `aiohttp.ClientResponse` with the parts of the
+    `requests.Response` interface used by this library, so that the same
+    error handling applies. `content` is only available after `read()`.
+    """
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.status_code = raw.status
+        self.headers = raw.headers
+        self.url = str(raw.url)
+        self.encoding = raw.charset or 'utf-8'
+        self._content = None
+
+    @property
+    def ok(self):
+        return self.status_code < 400
+
+    @property
+    def content(self):
+        return self._content
+
+    @property
+    def text(self):
+        if self._content is None:
+            return ''
+        return self._content.decode(self.encoding, 'replace')
+
+    def json(self):
+        return json.loads(self.text)
+
+    async def read(self):
+        if self._content is None:
+            self._content = await self.raw.read()
+        return self._content
+
+    def close(self):
+        self.raw.release()
+
+
+def _encode_params(params):
+    """
+    aiohttp only accepts strings and numbers as query parameters. Convert
+    them the same way requests does, dropping None values.
+    """
+    encoded = {}
+    for k, v in six.iteritems(params or {}):
+        if v is None:
+            continue
+        if not isinstance(v, (six.string_types, int, float)) or \
+                isinstance(v, bool):
+            v = str(v)
+        encoded[k] = v
+    return encoded
+
+
+async def request(method, path, configuration=None, stream=False, **kwargs):
+    """
+    Coroutine counterpart of `http.request`. `method` is the HTTP method
+    name, such as 'get'. The response body is read unless `stream` is True.
+    """
+    configuration, url = http._prepare_request(path, configuration, kwargs)
+
+    auth = kwargs.pop('auth')
+    timeout = kwargs.pop('timeout', configuration['timeout'])
+    kwargs['headers']['Authorization'] = auth.auth_header
+    kwargs['params'] = _encode_params(kwargs.get('params'))
+
+    hooks = configuration['hooks']
+    if not hooks:
+        return await _request(method, path, url, configuration, auth, stream,
+                              kwargs, timeout=timeout)
+
+    event = instrumentation.RequestEvent(method, path)
+    event.bytes_sent = instrumentation.body_size(kwargs.get('data'))
+    start = time.time()
+    try:
+        return await _request(method, path, url, configuration, auth, stream,
+                              kwargs, event=event, timeout=timeout)
+    except Exception as e:
+        event.error = e
+        raise
+    finally:
+        event.latency = time.time() - start
+        instrumentation.emit(hooks, event)
+
+
+def _client_timeout(timeout):
+    """
+    Converts a timeout as accepted by requests, a number of seconds or a
+    (connect, read) tuple, to an aiohttp.ClientTimeout.
+    """
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+    else:
+        connect = read = timeout
+    return aiohttp.ClientTimeout(total=None, sock_connect=connect,
+                                 sock_read=read)
+
+
+async def _request(method, path, url, configuration, auth, stream, kwargs,
+                   event=None, timeout=None):
+    # Deadlines set with `deadlines.deadline()` are thread-local, so only
+    # the configured deadline applies to coroutines.
+    deadline = None
+    if configuration['deadline'] is not None:
+        deadline = deadlines.Deadline(configuration['deadline'])
+    # As with the blocking API, file-like bodies are rewound before they
+    # are sent again, and requests with bodies that can't be are not
+    # retried.
+    replayable, rewind = http._rewinder(kwargs.get('data'))
+    retry_policy = configuration['retry_policy']
+    state = None
+    if retry_policy is not None and replayable:
+        state = retry_policy.start(method)
+
+    rate_limiter = configuration['rate_limiter']
+    account_id = account_id_from_path(path)
+    breaker = None
+    if configuration['circuit_breaker'] is not None:
+        breaker = configuration['circuit_breaker'].get_breaker(account_id)
+
+    session = get_session()
+    attempt = 0
+    while True:
+        if attempt and rewind is not None:
+            rewind()
+        attempt += 1
+
+        if rate_limiter is not None:
+            # Nothing is reserved if the deadline would pass first.
+            max_delay = None
+            if deadline is not None:
+                max_delay = deadline.check()
+            delay = rate_limiter.reserve(auth.auth_header,
+                                         account_id=account_id,
+                                         max_delay=max_delay)
+            if delay > 0:
+                if deadline is not None:
+                    deadline.check(delay)
+                await asyncio.sleep(delay)
+
+        attempt_timeout = timeout
+        if deadline is not None:
+            attempt_timeout = deadline.timeout(timeout)
+        kwargs['timeout'] = _client_timeout(attempt_timeout)
+        try:
+            response = await _send(session, method, url, stream, kwargs,
+                                   breaker)
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+            delay = None
+            if state is not None:
+                delay = state.delay_for_error(
+                    e, connect_error=isinstance(
+                        e, aiohttp.ClientConnectorError))
+            if delay is None:
+                raise
+        else:
+            if event is not None:
+                event.record_response(response)
+            delay = http._retry_delay(response, configuration, state)
+            if delay is None:
+                return response
+            if not replayable:
+                raise exceptions.RateLimitException(response=response)
+
+        if deadline is not None:
+            deadline.check(delay)
+        if event is not None:
+            event.record_retry(delay)
+        await asyncio.sleep(delay)
+
+
+async def _send(session, method, url, stream, kwargs, breaker=None):
+    token = None
+    if breaker is not None:
+        token = breaker.acquire()
+    failed = None
+    try:
+        response = Response(
+            await session.request(method.upper(), url, **kwargs))
+        failed = response.status_code >= 500
+        if not stream or not response.ok:
+            try:
+                await response.read()
+            finally:
+                response.close()
+        return response
+    except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+        failed = True
+        raise
+    finally:
+        if breaker is not None:
+            breaker.release(token, failed)
+
+
+async def _get_json(path, configuration=None, refresh=False, **kwargs):
+    """
+    Coroutine counterpart of `BaseResource._get_json()`.
+    """
+    merged = config.merge(configuration)
+    response_cache = merged['response_cache']
+    validator_cache = merged['validator_cache']
+    if response_cache is None and validator_cache is None:
+        response = await request('get', path, configuration=configuration,
+                                 **kwargs)
+        return http.response_json(response, configuration)
+
+    key = cache.request_key(merged, path, kwargs.get('params'))
+    if response_cache is not None and not refresh:
+        data = response_cache.get(key)
+        if data is not None:
+            return data
+
+    data = None
+    if validator_cache is not None:
+        response = await request(
+            'get', path, configuration=configuration,
+            headers=validator_cache.request_headers(key), **kwargs)
+        if response.status_code == 304:
+            # None if the entry was discarded since the request was made.
+            data = validator_cache.revalidated(key)
+            if data is None:
+                response = await request('get', path,
+                                         configuration=configuration,
+                                         **kwargs)
+    else:
+        response = await request('get', path, configuration=configuration,
+                                 **kwargs)
+
+    if data is None:
+        data = http.response_json(response, configuration)
+        if validator_cache is not None:
+            validator_cache.store(key, response, data)
+    if response_cache is not None:
+        response_cache.set(key, data)
+    return data
+
+
+def _invalidate_cache(path, configuration=None):
+    cache.invalidate(config.merge(configuration), path)
+
+
+async def all_resources(cls, parent_resource=None, configuration=None,
+                        raw=False, **params):
+    data = await _get_json(cls.list_path(parent_resource),
+                           configuration=configuration, params=params)
+    if raw:
+        return data
+    return cls._list_from_data(data, parent_resource=parent_resource,
+                               configuration=configuration)
+
+
+async def retrieve(cls, id, parent_resource=None, configuration=None,
+                   raw=False, **params):
+    instance = cls(id=id, parent_resource=parent_resource,
+                   configuration=configuration)
+    data = await _get_json(instance.detail_path(),
+                           configuration=configuration, params=params)
+    if raw:
+        return data
+    instance.populate(data)
+    return instance
+
+
+async def refresh(resource):
+    resource.populate(await _get_json(resource.detail_path(),
+                                      configuration=resource._configuration,
+                                      refresh=True))
+
+
+async def create(cls, data=None, params=None, method='post',
+                 parent_resource=None, configuration=None):
+    data = cls.serialize(data or {})
+    response = await request(method, cls.list_path(parent_resource),
+                             configuration=configuration, data=data,
+                             params=params or {})
+    _invalidate_cache(cls.list_path(parent_resource), configuration)
+    return cls.create_from_data(
+        http.response_json(response, configuration),
+        parent_resource=parent_resource,
+        configuration=configuration)
+
+
+async def save(resource, **params):
+    new_data = resource._changed_data()
+
+    if new_data:
+        response = await request('patch', resource.detail_path(),
+                                 configuration=resource._configuration,
+                                 data=new_data, params=params)
+        _invalidate_cache(resource.detail_path(), resource._configuration)
+        resource.populate(
+            http.response_json(response, resource._configuration))
+
+        parent_resource = resource._moved_parent_resource()
+        if parent_resource is not None:
+            await parent_resource.refresh_async()
+
+        return True
+    return False
+
+
+async def save_account(account, **params):
+    await request('patch', account.detail_path(),
+                  configuration=account._configuration,
+                  data=account.serialize_account(account), params=params)
+    _invalidate_cache(account.detail_path(), account._configuration)
+
+
+async def delete(resource, **params):
+    await request('delete', resource.detail_path(),
+                  configuration=resource._configuration, params=params)
+    _invalidate_cache(resource.detail_path(), resource._configuration)
+    resource.populate({})
+
+
+async def file_contents(file_obj):
+    return await request('get', "%s/contents" % file_obj.detail_path(),
+                         configuration=file_obj._configuration, stream=True)
+
+
+async def upload_chunk(multipart, part_number=None, data='',
+                       configuration=None, **params):
+    params.update({'part_number': part_number})
+    headers = {'Content-Type': 'application/octet-stream'}
+    await request('put', multipart.detail_path(), data=data, params=params,
+                  headers=headers, configuration=configuration)
+    return True
+
+
+async def latest_cursor(cls, parent_resource=None, configuration=None):
+    response = await request('get',
+                             "%s/latest" % cls.list_path(parent_resource),
+                             configuration=configuration)
+    data = http.response_json(response, configuration)
+    if 'cursor' in data:
+        return data['cursor']
+    else:
+        return data
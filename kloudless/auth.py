@@ -0,0 +1,26 @@
+from abc import ABCMeta, abstractproperty
+
+class BaseAuth:
+    __metaclass__ = ABCMeta
+
+    scheme = abstractproperty()
+
+    def __init__(self, key):
+        self.key = key
+
+    @property
+    def auth_header(self):
+        return '%s %s' % (self.scheme, self.key)
+
+    def __call__(self, request):
+        request.headers['Authorization'] = self.auth_header
+        return request
+
+class APIKeyAuth(BaseAuth):
+    scheme = 'APIKey'
+
+class DevKeyAuth(BaseAuth):
+    scheme = 'DeveloperKey'
+
+class BearerTokenAuth(BaseAuth):
+    scheme = 'Bearer'
@@ -0,0 +1,294 @@
+import collections
+import threading
+import time
+
+import six
+from six.moves.urllib.parse import urlencode
+
+from . import http
+from .util import account_id_from_path
+
+
+def _copy(data):
+    # Decoded responses are shared between cache entries and callers, which
+    # may modify nested objects, such as the lists returned with
+    # `raw=True`. They only contain JSON types, so this is faster than
+    # `copy.deepcopy`.
+    if isinstance(data, dict):
+        return dict((k, _copy(v)) for k, v in six.iteritems(data))
+    if isinstance(data, list):
+        return [_copy(v) for v in data]
+    return data
+
+
+def request_key(configuration, path, params=None):
+    """
+    Returns the key of a GET request. Responses are cached per credential,
+    as different credentials may see different data.
+    """
+    auth = http._get_auth(configuration, path)
+    auth_header = auth.auth_header if auth is not None else None
+    query = urlencode(sorted(six.iteritems(params or {})), doseq=True)
+    return (auth_header, configuration.url_prefix, path, query)
+
+
+def invalidate(configuration, path):
+    """
+    Discards the responses in the configured `response_cache` that a write
+    to `path` may have changed: those of the same account, or all of those
+    of the same type of resource for writes to accounts or resources
+    outside of an account.
+    """
+    response_cache = configuration['response_cache']
+    if response_cache is None:
+        return
+    account_id = account_id_from_path(path)
+    if account_id is not None and path != 'accounts/%s' % account_id:
+        scope = 'accounts/%s' % account_id
+    else:
+        scope = path.split('/')[0]
+    response_cache.invalidate(configuration.url_prefix, scope)
+
+
+class ValidatorCache(object):
+    """
+    Remembers the ETag and Last-Modified validators of GET responses along
+    with their decoded data, so that requests for the same path can be
+    made conditional with If-None-Match and If-Modified-Since. When the
+    server responds with 304 Not Modified, the data decoded previously is
+    reused instead of downloading and decoding the body again.
+
+    Used by `all()`, `retrieve()`, `refresh()`, `Folder.contents()` and the
+    other methods that retrieve JSON with a GET request. Set it with
+    `kloudless.configure(validator_cache=ValidatorCache())`. Up to
+    `max_entries` responses are kept, discarding the least recently used.
+    Thread-safe.
+    """
+
+    def __init__(self, max_entries=1000):
+        self.max_entries = max_entries
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def request_headers(self, key):
+        """
+        Returns the conditional headers to send for `key`, which are empty
+        if no response with validators has been cached.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            return {}
+        etag, last_modified, _ = entry
+        headers = {}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+        return headers
+
+    def revalidated(self, key):
+        """
+        Returns a copy of the data cached for `key` after the server
+        responded with 304 Not Modified, or None if it has been discarded.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.pop(key)
+            self._entries[key] = entry
+            self._hits += 1
+        return _copy(entry[2])
+
+    def store(self, key, response, data):
+        """
+        Caches `data` decoded from `response` if it has validators.
+        """
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        with self._lock:
+            self._misses += 1
+            self._entries.pop(key, None)
+            if not etag and not last_modified:
+                return
+            self._entries[key] = (etag, last_modified, _copy(data))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """
+        Returns the number of entries, and the number of responses that
+        were revalidated (hits) or downloaded in full (misses).
+        """
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'hits': self._hits,
+                'misses': self._misses,
+            }
+
+
+class ResponseCache(object):
+    """
+    Keeps the data decoded from GET responses for up to `ttl` seconds, so
+    that repeated calls to `all()`, `retrieve()`, `Folder.contents()`,
+    `Property.all()`, `User.get_groups()` and `Group.get_users()` don't make
+    a request. Up to `max_entries` responses are kept, discarding the least
+    recently used. `refresh()` always makes a request, and updates the
+    cached response.
+
+    Writes made through the resource methods, such as `save()`, `delete()`
+    or `File.update()`, discard the responses they may have changed. Writes
+    made otherwise, or by other clients, are only seen once the cached
+    responses expire.
+
+    Set it with `kloudless.configure(response_cache=ResponseCache())`.
+    `stats()` reports the hits, misses and evictions. Thread-safe.
+    """
+
+    def __init__(self, max_entries=1000, ttl=60):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = dict.fromkeys(
+            ['hits', 'misses', 'evictions', 'expirations', 'invalidations'],
+            0)
+
+    def get(self, key):
+        """
+        Returns a copy of the data cached for `key`, or None if there is
+        none or it has expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= time.time():
+                del self._entries[key]
+                self._stats['expirations'] += 1
+                entry = None
+            if entry is None:
+                self._stats['misses'] += 1
+                return None
+            self._entries.pop(key)
+            self._entries[key] = entry
+            self._stats['hits'] += 1
+        return _copy(entry[1])
+
+    def set(self, key, data):
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (time.time() + self.ttl, _copy(data))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats['evictions'] += 1
+
+    def invalidate(self, url_prefix, scope):
+        """
+        Discards the responses for `scope` and the paths within it, such as
+        'accounts/7' and 'accounts/7/storage/files/abc', for all credentials.
+        """
+        nested = scope + '/'
+        with self._lock:
+            keys = [key for key in self._entries
+                    if key[1] == url_prefix and
+                    (key[2] == scope or key[2].startswith(nested))]
+            for key in keys:
+                del self._entries[key]
+            self._stats['invalidations'] += len(keys)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """
+        Returns the number of entries, and the number of hits, misses,
+        entries evicted to make room, entries found expired and entries
+        invalidated by writes.
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = len(self._entries)
+        return stats
+
+
+class _Call(object):
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight(object):
+    """
+    Coalesces identical GET requests made concurrently from different
+    threads, such as `Account.retrieve(id)`, so that only the first one is
+    sent and the others wait for and share its decoded response. Each caller
+    receives its own copy of the data, so resources created from it are
+    independent. If the request fails, all callers waiting for it raise the
+    same exception.
+
+    Set it with `kloudless.configure(single_flight=SingleFlight())`. It
+    applies to the same methods as `ResponseCache`, with the blocking API.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self._stats = {'requests': 0, 'shared': 0}
+
+    def do(self, key, func, deadline=None):
+        """
+        Returns a copy of the result of `func()`, calling it unless a call
+        for `key` is already in progress in which case its result is used.
+        Waiting for that result raises `DeadlineExceededException` once
+        `deadline`, a `deadlines.Deadline`, passes.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self._stats['requests'] += 1
+            else:
+                self._stats['shared'] += 1
+
+        if leader:
+            try:
+                call.result = func()
+            except BaseException as e:
+                # Includes KeyboardInterrupt and the like, so that waiting
+                # callers don't return None as if the request succeeded.
+                call.error = e
+                raise
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+        else:
+            if deadline is None:
+                call.done.wait()
+            else:
+                # `check()` raises once the deadline has passed.
+                while not call.done.wait(deadline.check()):
+                    pass
+            if call.error is not None:
+                raise call.error
+        return _copy(call.result)
+
+    def stats(self):
+        """
+        Returns the number of requests sent, and the number of calls that
+        shared the response of a request in progress instead.
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats['in_flight'] = len(self._calls)
+        return stats
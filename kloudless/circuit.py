@@ -0,0 +1,182 @@
+import collections
+import threading
+import time
+
+from . import exceptions
+from .concurrency import get_account_service
+from .util import lru_evict, lru_get
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitBreaker(object):
+    """
+    Stops sending requests to an upstream service that keeps failing.
+
+    The breaker is closed while the service is healthy. It opens once at
+    least `min_requests` of the last `window` requests were sent and the
+    fraction of them that failed reaches `failure_rate`. Requests fail
+    immediately with `CircuitOpenException` while it is open. After
+    `reset_timeout` seconds it becomes half-open and lets up to `probes`
+    requests through: it closes again once they all succeed, or re-opens if
+    one fails.
+
+    A request fails if it raises a connection error or timeout, or receives
+    a 5xx response. Other responses, including 4xx responses, show that the
+    service is up.
+    """
+
+    def __init__(self, failure_rate=0.5, min_requests=10, window=20,
+                 reset_timeout=30, probes=1, name='the service'):
+        self.name = name
+        self.failure_rate = failure_rate
+        self.min_requests = min_requests
+        self.reset_timeout = reset_timeout
+        self.probes = probes
+
+        self.state = CLOSED
+        self._outcomes = collections.deque(maxlen=window)
+        self._opened_at = None
+        # Changes with the state, so that the outcomes of requests allowed
+        # in a previous state are ignored.
+        self._generation = 0
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        self._rejected = 0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Raises `CircuitOpenException` if a request may not be sent now.
+        Otherwise returns a token to pass to `release()` with the outcome of
+        the request.
+        """
+        with self._lock:
+            if self.state == OPEN:
+                remaining = self._opened_at + self.reset_timeout - time.time()
+                if remaining > 0:
+                    self._rejected += 1
+                    raise exceptions.CircuitOpenException(
+                        "Requests to %s are failing. Retry in %.0fs." %
+                        (self.name, remaining),
+                        retry_after=remaining)
+                self.state = HALF_OPEN
+                self._generation += 1
+                self._probe_successes = 0
+
+            if self.state == HALF_OPEN:
+                if self._probes_in_flight >= self.probes:
+                    self._rejected += 1
+                    raise exceptions.CircuitOpenException(
+                        "Requests to %s are failing and are being probed." %
+                        self.name,
+                        retry_after=0)
+                self._probes_in_flight += 1
+            return self._generation
+
+    def release(self, token, failed):
+        """
+        Records the outcome of a request allowed by `acquire()`, which
+        returned `token`. `failed` is True if it failed, False if it
+        succeeded, or None if the outcome says nothing about the service,
+        such as when a local error occurred.
+
+        Outcomes of requests allowed before the state last changed are
+        ignored. In particular, only the probes allowed while half-open can
+        close the breaker.
+        """
+        with self._lock:
+            if token != self._generation:
+                return
+            if self.state == HALF_OPEN:
+                self._probes_in_flight -= 1
+                if failed:
+                    self._open()
+                elif failed is not None:
+                    self._probe_successes += 1
+                    if self._probe_successes >= self.probes:
+                        self.state = CLOSED
+                        self._generation += 1
+                        self._outcomes.clear()
+                return
+
+            if failed is None:
+                return
+            self._outcomes.append(failed)
+            if (len(self._outcomes) >= self.min_requests and
+                    sum(self._outcomes) >=
+                    self.failure_rate * len(self._outcomes)):
+                self._open()
+
+    def _open(self):
+        self.state = OPEN
+        self._generation += 1
+        self._opened_at = time.time()
+        self._probes_in_flight = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                'state': self.state,
+                'requests': len(self._outcomes),
+                'failures': sum(self._outcomes),
+                'rejected': self._rejected,
+            }
+
+
+class CircuitBreakers(object):
+    """
+    Keeps a `CircuitBreaker` for each account, so that requests for an
+    account whose service is failing stop being sent while it recovers. Set
+    it with `kloudless.configure(circuit_breaker=CircuitBreakers())`.
+
+    Set `per='service'` to keep a breaker per service, such as 'box' or
+    'gdrive', instead, so that failures of one account stop requests for
+    all accounts of the same service. Requests that don't belong to an
+    account, and requests for accounts with an unknown service, are never
+    stopped. At most `max_breakers` breakers are kept, discarding those of
+    the accounts or services used least recently, preferably closed ones.
+    Keyword arguments are passed on to `CircuitBreaker`.
+    """
+
+    def __init__(self, per='account', max_breakers=10000, **breaker_kwargs):
+        if per not in ('service', 'account'):
+            raise ValueError("'per' must be either 'service' or 'account'.")
+        self.per = per
+        self.max_breakers = max_breakers
+        self.breaker_kwargs = breaker_kwargs
+        self._breakers = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def _key(self, account_id):
+        if account_id is None or self.per == 'account':
+            return account_id
+        return get_account_service(account_id)
+
+    def get_breaker(self, account_id=None):
+        """
+        Returns the CircuitBreaker used for requests for `account_id`, or
+        None if they are never stopped.
+        """
+        key = self._key(account_id)
+        if key is None:
+            return None
+        with self._lock:
+            breaker = lru_get(self._breakers, key)
+            if breaker is None:
+                name = 'account %s' % key if self.per == 'account' else key
+                breaker = self._breakers[key] = CircuitBreaker(
+                    name=name, **self.breaker_kwargs)
+                lru_evict(self._breakers, self.max_breakers,
+                          idle=lambda b: b.state == CLOSED)
+        return breaker
+
+    def stats(self):
+        """
+        Returns the state and recent outcomes by account or service.
+        """
+        with self._lock:
+            breakers = dict(self._breakers)
+        return dict((k, v.stats()) for k, v in breakers.items())
@@ -0,0 +1,121 @@
+"""
+JSON codecs used to encode request bodies and decode responses. The default
+is the fastest library installed, falling back to the standard library:
+
+    kloudless.configure(json_codec=kloudless.codec.get_codec('json'))
+"""
+import json
+
+# Maps digits to '0' and everything else to ' ', to find runs of 20 digits:
+# integers that may not fit in 64 bits, which orjson decodes as floats.
+# Strings with as many digits match too, which only costs decoding them
+# with the standard library. This is several times faster than a regex.
+_DIGITS = bytes(bytearray(48 if 48 <= i <= 57 else 32 for i in range(256)))
+_LONG_DIGITS = b'0' * 20
+
+
+class JSONCodec(object):
+    """
+    Encodes and decodes JSON with the standard library's `json` module.
+    Subclasses override `encode()` and `loads()` to use other libraries.
+    """
+
+    name = 'json'
+
+    def encode(self, data):
+        """
+        Returns `data` encoded as UTF-8 JSON bytes, used for request bodies.
+        """
+        return json.dumps(data).encode('utf-8')
+
+    def loads(self, content):
+        """
+        Decodes JSON from bytes or a string. Raises ValueError if it isn't
+        valid JSON.
+        """
+        if isinstance(content, bytes):
+            content = content.decode('utf-8')
+        return json.loads(content)
+
+    def __repr__(self):
+        return '<%s %r>' % (type(self).__name__, self.name)
+
+    def __reduce__(self):
+        # Subclasses hold the module of their library, which can't be
+        # pickled.
+        return (type(self), ())
+
+
+class OrjsonCodec(JSONCodec):
+    """
+    Uses orjson. Data that orjson doesn't support, such as integers larger
+    than 64 bits or dictionaries with keys that aren't strings, is encoded
+    with the standard library instead. Responses that orjson rejects or
+    would decode differently, such as those with unpaired surrogate escapes
+    or integers larger than 64 bits, are decoded with the standard library
+    too.
+    """
+
+    name = 'orjson'
+
+    def __init__(self):
+        import orjson
+        self._orjson = orjson
+
+    def encode(self, data):
+        try:
+            return self._orjson.dumps(data)
+        except TypeError:
+            return super(OrjsonCodec, self).encode(data)
+
+    def loads(self, content):
+        if not isinstance(content, bytes):
+            content = content.encode('utf-8')
+        if _LONG_DIGITS not in content.translate(_DIGITS):
+            try:
+                return self._orjson.loads(content)
+            except ValueError:
+                pass
+        return super(OrjsonCodec, self).loads(content)
+
+
+class UJSONCodec(JSONCodec):
+    """
+    Uses ujson.
+    """
+
+    name = 'ujson'
+
+    def __init__(self):
+        import ujson
+        self._ujson = ujson
+
+    def encode(self, data):
+        return self._ujson.dumps(data, ensure_ascii=False).encode('utf-8')
+
+    def loads(self, content):
+        if isinstance(content, bytes):
+            content = content.decode('utf-8')
+        return self._ujson.loads(content)
+
+
+# In order of preference.
+CODECS = (OrjsonCodec, UJSONCodec, JSONCodec)
+
+
+def get_codec(name=None):
+    """
+    Returns the codec named `name`, such as 'orjson'. Raises ImportError if
+    its library isn't installed. Without a name, returns the first codec in
+    `CODECS` that is available.
+    """
+    for cls in CODECS:
+        if name is not None and cls.name != name:
+            continue
+        try:
+            return cls()
+        except ImportError:
+            if name is not None:
+                raise
+    raise ValueError("Unknown JSON codec %r. Choose from %s." % (
+        name, ', '.join(c.name for c in CODECS)))
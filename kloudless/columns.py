@@ -0,0 +1,124 @@
+"""
+Accumulates the files and folders of list responses into columns for
+analytics, without creating resource objects:
+
+    listing = kloudless.columns.ColumnarListing()
+    for folder_id in folder_ids:
+        listing.add_page(account.folders(id=folder_id).contents(raw=True))
+    arrays = listing.arrays()
+    total = arrays['size'][arrays['size'] != kloudless.columns.MISSING].sum()
+
+The columns are NumPy arrays if NumPy is installed, which it can be with
+`pip install kloudless[numpy]`.
+"""
+import calendar
+
+from .util import to_datetime
+
+# Stands in for a missing `size` or `modified` value in the integer
+# columns, like NumPy's NaT.
+MISSING = -(2 ** 63)
+
+# The columns and whether they hold integers, which are 64 bit integers in
+# NumPy arrays.
+COLUMNS = (
+    ('id', False),
+    ('name', False),
+    ('type', False),
+    ('size', True),
+    ('modified', True),
+    ('mime_type', False),
+    ('parent_id', False),
+)
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def _epoch(timestamp):
+    """
+    Returns the seconds since the epoch of an ISO 8601 timestamp, which is
+    assumed to be UTC if it has no offset.
+    """
+    if timestamp is None:
+        return MISSING
+    return calendar.timegm(to_datetime(timestamp).utctimetuple())
+
+
+class ColumnarListing(object):
+    """
+    The metadata of files and folders, held in one column per attribute.
+    `size` and `modified` are 64 bit integers, with `modified` in seconds
+    since the epoch and `MISSING` for missing values. `parent_id` is the ID
+    of the `parent` folder, if included in the metadata. The other columns
+    hold strings, or None for missing values.
+    """
+
+    def __init__(self):
+        self._columns = dict((name, []) for name, _ in COLUMNS)
+
+    def __len__(self):
+        return len(self._columns['id'])
+
+    def add(self, data):
+        """
+        Adds the metadata of a file or folder, as returned by the API.
+        """
+        columns = self._columns
+        columns['id'].append(data.get('id'))
+        columns['name'].append(data.get('name'))
+        columns['type'].append(data.get('type'))
+        size = data.get('size')
+        columns['size'].append(MISSING if size is None else int(size))
+        columns['modified'].append(_epoch(data.get('modified')))
+        columns['mime_type'].append(data.get('mime_type'))
+        parent = data.get('parent')
+        columns['parent_id'].append(
+            parent.get('id') if isinstance(parent, dict) else None)
+
+    def add_page(self, data):
+        """
+        Adds the objects of a list response, such as the one returned by
+        `Folder.contents(raw=True)` or `Search.all(raw=True)`.
+        """
+        for item in data['objects']:
+            self.add(item)
+
+    def arrays(self):
+        """
+        Returns a dict of the columns. They are NumPy arrays, with the dtype
+        int64 for integers and object for strings, if NumPy is installed.
+        Otherwise, they are lists.
+        """
+        numpy = _numpy()
+        if numpy is None:
+            return dict((name, self._columns[name][:])
+                        for name, _ in COLUMNS)
+
+        return dict(
+            (name, numpy.array(self._columns[name],
+                               dtype=numpy.int64 if integer else object))
+            for name, integer in COLUMNS)
+
+    def structured(self):
+        """
+        Returns the columns as a NumPy structured array. Raises ImportError
+        if NumPy isn't installed.
+        """
+        numpy = _numpy()
+        if numpy is None:
+            raise ImportError("NumPy is required for structured arrays. "
+                              "Install it with "
+                              "`pip install kloudless[numpy]`.")
+        arrays = self.arrays()
+        dtype = [(name, numpy.int64 if integer else object)
+                 for name, integer in COLUMNS]
+        result = numpy.empty(len(self), dtype=dtype)
+        for name, _ in COLUMNS:
+            result[name] = arrays[name]
+        return result
@@ -0,0 +1,182 @@
+import collections
+import threading
+import time
+
+from .util import lru_evict, lru_get
+
+# The service of each account seen in API responses, by account ID, for at
+# most `_max_account_services` of the accounts seen most recently.
+_account_services = collections.OrderedDict()
+_account_services_lock = threading.Lock()
+_max_account_services = 10000
+
+
+def register_account_service(account_id, service):
+    """
+    Records the service of an account so that requests for it can be
+    limited per service. Called when `Account` objects are populated.
+    """
+    account_id = str(account_id)
+    with _account_services_lock:
+        _account_services.pop(account_id, None)
+        _account_services[account_id] = service
+        lru_evict(_account_services, _max_account_services)
+
+
+def get_account_service(account_id):
+    with _account_services_lock:
+        return lru_get(_account_services, str(account_id))
+
+
+class AdaptiveLimit(object):
+    """
+    Limits the number of requests in flight, adjusting the limit with
+    additive increase and multiplicative decrease (AIMD).
+
+    The limit grows by about one for each `limit` requests that succeed
+    while the average latency stays within `latency_tolerance` times the
+    lowest average observed. It is multiplied by `backoff` when a request is
+    rate-limited or the latency rises above that, at most once per average
+    latency so that a single slow period doesn't collapse the limit.
+    """
+
+    def __init__(self, initial_limit=4, min_limit=1, max_limit=64,
+                 backoff=0.5, latency_tolerance=2.0, smoothing=0.2):
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff = backoff
+        self.latency_tolerance = latency_tolerance
+        self.smoothing = smoothing
+
+        self.in_flight = 0
+        self.latency = None
+        self.min_latency = None
+        self._last_decrease = 0
+        self._cond = threading.Condition()
+
+    def acquire(self, timeout=None):
+        """
+        Blocks until a request may be sent, or for at most `timeout`
+        seconds. Returns True, or False if the timeout expired first in
+        which case `release()` must not be called.
+        """
+        with self._cond:
+            if timeout is not None:
+                expires_at = time.time() + timeout
+            while self.in_flight >= int(self.limit):
+                if timeout is None:
+                    self._cond.wait()
+                    continue
+                remaining = expires_at - time.time()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+            self.in_flight += 1
+            return True
+
+    def release(self, response=None, latency=None):
+        """
+        Records the outcome of a request sent after `acquire()`. `response`
+        is None if the request failed without one.
+        """
+        with self._cond:
+            self.in_flight -= 1
+            if response is not None:
+                if response.status_code == 429:
+                    self._decrease()
+                elif response.ok and latency is not None:
+                    self._track_latency(latency)
+            self._cond.notify_all()
+
+    def _track_latency(self, latency):
+        if self.latency is None:
+            self.latency = latency
+        else:
+            self.latency += self.smoothing * (latency - self.latency)
+        if self.min_latency is None or self.latency < self.min_latency:
+            self.min_latency = self.latency
+
+        if self.latency > self.min_latency * self.latency_tolerance:
+            self._decrease()
+        else:
+            self.limit = min(self.max_limit, self.limit + 1.0 / self.limit)
+
+    def _decrease(self):
+        now = time.time()
+        if now - self._last_decrease < (self.latency or 0):
+            return
+        self._last_decrease = now
+        self.limit = max(self.min_limit, self.limit * self.backoff)
+        if self.latency is not None:
+            # Let the baseline adapt if the service has become slower.
+            self.min_latency = max(self.min_latency,
+                                   self.latency / self.latency_tolerance)
+
+    def idle(self):
+        """
+        Whether no requests are in flight.
+        """
+        with self._cond:
+            return self.in_flight == 0
+
+    def stats(self):
+        with self._cond:
+            return {
+                'limit': int(self.limit),
+                'in_flight': self.in_flight,
+                'latency': self.latency,
+            }
+
+
+class AdaptiveConcurrencyLimiter(object):
+    """
+    Keeps an `AdaptiveLimit` on the number of requests in flight for each
+    service, such as 'box' or 'gdrive', so that the concurrency used for each
+    adapts to how it responds. Set it with
+    `kloudless.configure(concurrency_limiter=AdaptiveConcurrencyLimiter())`.
+
+    Requests for accounts with an unknown service, and requests that don't
+    belong to an account, share a single limit. Set `per='account'` to keep
+    a limit per account instead. At most `max_limits` limits are kept,
+    discarding those of the services or accounts used least recently,
+    preferably without requests in flight. Keyword arguments are passed on
+    to `AdaptiveLimit`. Only requests made with the blocking API are
+    limited.
+    """
+
+    def __init__(self, per='service', max_limits=10000, **limit_kwargs):
+        if per not in ('service', 'account'):
+            raise ValueError("'per' must be either 'service' or 'account'.")
+        self.per = per
+        self.max_limits = max_limits
+        self.limit_kwargs = limit_kwargs
+        self._limits = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def _key(self, account_id):
+        if account_id is None or self.per == 'account':
+            return account_id
+        return get_account_service(account_id)
+
+    def get_limit(self, account_id=None):
+        """
+        Returns the AdaptiveLimit used for requests for `account_id`.
+        """
+        key = self._key(account_id)
+        with self._lock:
+            limit = lru_get(self._limits, key)
+            if limit is None:
+                limit = self._limits[key] = AdaptiveLimit(**self.limit_kwargs)
+                lru_evict(self._limits, self.max_limits,
+                          idle=AdaptiveLimit.idle)
+        return limit
+
+    def stats(self):
+        """
+        Returns the current limit, requests in flight and average latency
+        by service or account.
+        """
+        with self._lock:
+            limits = dict(self._limits)
+        return dict((k, v.stats()) for k, v in limits.items())
@@ -1,15 +1,106 @@
+from .auth import APIKeyAuth, DevKeyAuth, BearerTokenAuth
+from . import codec
+from . import retry
 from . import throttling
+from . import transport
 
+import collections
 import six
 
-_configuration = {
+try:
+    from collections.abc import Mapping
+except ImportError:
+    Mapping = collections.Mapping
+
+
+class Configuration(Mapping):
+    """
+    An immutable configuration with all options resolved. The authentication
+    and base URL used for requests are computed once when it is created.
+
+    Resources keep a reference to the Configuration they were created with
+    and share it with every resource created from them, so it is never
+    copied per request or per object. Create one with `merge()`:
+
+        configuration = kloudless.config.merge({'token': 'TOKEN'})
+        account = kloudless.Account(id=account_id,
+                                    configuration=configuration)
+    """
+
+    __slots__ = ('_values', 'url_prefix', 'auth', 'dev_auth')
+
+    def __init__(self, values):
+        set_attr = super(Configuration, self).__setattr__
+        set_attr('_values', dict(values))
+
+        set_attr('url_prefix', "%s/v%s/" % (values['base_url'],
+                                            values['api_version']))
+
+        # The API Key is used instead of the Bearer Token if both are set.
+        auth = None
+        if values['api_key']:
+            auth = APIKeyAuth(values['api_key'])
+        elif values['token']:
+            auth = BearerTokenAuth(values['token'])
+        set_attr('auth', auth)
+
+        dev_auth = None
+        if values['dev_key']:
+            dev_auth = DevKeyAuth(values['dev_key'])
+        set_attr('dev_auth', dev_auth)
+
+    def __getitem__(self, k):
+        return self._values[k]
+
+    def __iter__(self):
+        return iter(self._values)
+
+    def __len__(self):
+        return len(self._values)
+
+    def __setattr__(self, k, v):
+        raise AttributeError("Configuration objects are immutable. Use "
+                             "merge() to create a new one.")
+
+    def __repr__(self):
+        return 'Configuration(%r)' % self._values
+
+    def __reduce__(self):
+        # Unpickling would otherwise set the slots with __setattr__.
+        return (Configuration, (self._values,))
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        # Immutable, and the rate limiters, caches and such that it holds
+        # are shared by design, so copies of resources keep sharing it.
+        return self
+
+
+_configuration = Configuration({
     'api_key': None,
     'dev_key': None,
     'token': None,
     'api_version': '1',
     'base_url': 'https://api.kloudless.com',
     'throttle_retry_strategy': throttling.ExpFallback(),
-    }
+    'retry_policy': retry.RetryPolicy(),
+    'timeout': (10, 60),
+    'deadline': None,
+    'rate_limiter': None,
+    'concurrency_limiter': None,
+    'circuit_breaker': None,
+    'hooks': (),
+    'transport': transport.RequestsTransport(),
+    'json_codec': codec.get_codec(),
+    'validator_cache': None,
+    'response_cache': None,
+    'single_flight': None,
+    'hedging': None,
+    'lazy_resources': False,
+    'compact_lists': False,
+    })
 
 def configure(**params):
     """Update configuration based on params. Returns new configuration.
@@ -18,6 +109,7 @@ def configure(**params):
     :param api_key: API Key
     :param api_version: API Version
     :param base_url: Base API URL
+    :param transport: The `transport.Transport` used to send requests
     """
     global _configuration
     if not params:
@@ -27,8 +119,17 @@ def configure(**params):
     return _configuration
 
 def merge(config):
-    result = _configuration.copy()
+    """
+    Returns a Configuration with the options in `config` overriding the
+    current global configuration. A Configuration is returned as is.
+    """
+    if isinstance(config, Configuration):
+        return config
+    if not config:
+        return _configuration
+
+    result = dict(_configuration)
     for k, v in six.iteritems(config):
         if k in result:
             result[k] = v
-    return result
+    return Configuration(result)
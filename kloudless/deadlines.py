@@ -0,0 +1,118 @@
+"""
+Deadlines bound the total time spent by a call, including retries and the
+time spent waiting before them. A default applies to every request with the
+`deadline` configuration option, and calls can be given a tighter one with
+the `deadline()` context manager:
+
+    with kloudless.deadline(5):
+        folder = account.folders.retrieve('root')
+        contents = folder.contents()
+
+The context manager applies to the requests made by the current thread,
+with the blocking API.
+"""
+import contextlib
+import threading
+import time
+
+from . import exceptions
+
+_local = threading.local()
+
+
+class Deadline(object):
+    """
+    The time by which a call must complete.
+    """
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.expires_at = time.time() + seconds
+
+    def remaining(self):
+        return self.expires_at - time.time()
+
+    def check(self, delay=0):
+        """
+        Raises `DeadlineExceededException` if the deadline would pass after
+        waiting for `delay` seconds.
+        """
+        remaining = self.remaining()
+        if remaining <= delay:
+            if delay:
+                message = ("Waiting %.2fs to retry would exceed the %ss "
+                           "deadline." % (delay, self.seconds))
+            else:
+                message = "The %ss deadline was exceeded." % self.seconds
+            raise exceptions.DeadlineExceededException(message)
+        return remaining
+
+    def timeout(self, timeout):
+        """
+        Returns `timeout`, a number of seconds or a (connect, read) tuple as
+        accepted by requests, capped to the time remaining. Raises
+        `DeadlineExceededException` if none remains.
+        """
+        remaining = self.check()
+        if timeout is None:
+            return remaining
+        if isinstance(timeout, tuple):
+            return tuple(remaining if t is None else min(t, remaining)
+                         for t in timeout)
+        return min(timeout, remaining)
+
+    def __repr__(self):
+        return '<Deadline %.3fs remaining>' % self.remaining()
+
+
+def current():
+    """
+    Returns the innermost Deadline set with `deadline()` in this thread, or
+    None.
+    """
+    return getattr(_local, 'deadline', None)
+
+
+@contextlib.contextmanager
+def deadline(seconds):
+    """
+    Sets a deadline of `seconds` for the requests made within the block.
+    A nested deadline can't extend the one it is nested in.
+    """
+    outer = current()
+    inner = Deadline(seconds)
+    if outer is not None and outer.expires_at < inner.expires_at:
+        inner = outer
+    _local.deadline = inner
+    try:
+        yield inner
+    finally:
+        _local.deadline = outer
+
+
+@contextlib.contextmanager
+def using(deadline):
+    """
+    Applies `deadline`, such as one returned by `current()` in another
+    thread, to the requests made within the block in this thread.
+    """
+    outer = current()
+    _local.deadline = deadline
+    try:
+        yield deadline
+    finally:
+        _local.deadline = outer
+
+
+def for_request(configuration):
+    """
+    Returns the Deadline for a request starting now: the earliest of the one
+    set with `deadline()` and the configured `deadline`, or None.
+    """
+    result = current()
+    seconds = configuration['deadline']
+    if seconds is not None:
+        configured = Deadline(seconds)
+        if result is None or configured.expires_at < result.expires_at:
+            result = configured
+    return result
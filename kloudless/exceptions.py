@@ -49,5 +49,17 @@ class ServerException(KloudlessException):
         "An unknown error occurred! Please contact support@kloudless.com "
         "with the Request ID for more details.")
 
+class CircuitOpenException(KloudlessException):
+    default_message = (
+        "Requests to the service are failing and have been stopped "
+        "temporarily.")
+
+    def __init__(self, message=None, retry_after=None):
+        super(CircuitOpenException, self).__init__(message)
+        self.retry_after = retry_after
+
+class DeadlineExceededException(KloudlessException):
+    default_message = "The request could not complete before its deadline."
+
 class ConfigurationException(Exception):
     pass
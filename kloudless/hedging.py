@@ -0,0 +1,154 @@
+import collections
+import threading
+import time
+
+from six.moves import queue
+
+
+class _Attempts(object):
+    """
+    The attempts made to send one request. Results that arrive after one
+    has been used are closed.
+    """
+
+    def __init__(self):
+        self.results = queue.Queue()
+        self.done = False
+        self.lock = threading.Lock()
+
+    def run(self, index, send):
+        response = error = None
+        try:
+            response = send()
+        except Exception as e:
+            error = e
+        with self.lock:
+            if not self.done:
+                self.results.put((index, response, error))
+                return
+        if response is not None:
+            response.close()
+
+    def start(self, index, send):
+        thread = threading.Thread(target=self.run, args=(index, send))
+        # A request that never completes mustn't keep the process running.
+        thread.daemon = True
+        thread.start()
+
+    def finish(self):
+        with self.lock:
+            self.done = True
+        while True:
+            try:
+                _, response, _ = self.results.get_nowait()
+            except queue.Empty:
+                return
+            if response is not None:
+                response.close()
+
+
+class HedgingPolicy(object):
+    """
+    Sends a second, identical request when the first hasn't completed after
+    the `percentile`th percentile of the latencies recently observed for the
+    same endpoint, and uses whichever response arrives first. This reduces
+    the tail latency of reads from slow services at the cost of a few extra
+    requests. The response that arrives last is closed.
+
+    Set it with `kloudless.configure(hedging=HedgingPolicy())`. It applies to
+    GET requests made by `retrieve()`, `all()` (including `Search.all()`),
+    `Folder.contents()` and the other methods that retrieve metadata, with
+    the blocking API.
+
+    Requests are only hedged once `min_samples` latencies have been observed
+    for the endpoint, after at least `min_delay` seconds, and while hedged
+    requests are at most `max_ratio` of all requests.
+    """
+
+    def __init__(self, percentile=95, min_delay=0.05, min_samples=20,
+                 max_ratio=0.1, samples=200):
+        self.percentile = percentile
+        self.min_delay = min_delay
+        self.min_samples = min_samples
+        self.max_ratio = max_ratio
+        self.samples = samples
+        self._latencies = {}
+        self._lock = threading.Lock()
+        self._stats = {'requests': 0, 'hedged': 0, 'hedge_wins': 0}
+
+    def hedge_delay(self, endpoint):
+        """
+        Returns the number of seconds to wait for a response before sending
+        another request to `endpoint`, or None if it shouldn't be hedged.
+        """
+        with self._lock:
+            latencies = self._latencies.get(endpoint)
+            if latencies is None or len(latencies) < self.min_samples:
+                return None
+            ordered = sorted(latencies)
+        index = int(round(self.percentile / 100.0 * (len(ordered) - 1)))
+        return max(self.min_delay, ordered[index])
+
+    def observe(self, endpoint, latency):
+        with self._lock:
+            latencies = self._latencies.get(endpoint)
+            if latencies is None:
+                latencies = self._latencies[endpoint] = collections.deque(
+                    maxlen=self.samples)
+            latencies.append(latency)
+
+    def send(self, send, endpoint):
+        """
+        Calls `send()` to make a request to `endpoint` and returns its
+        response, calling it again in another thread if it is slow.
+        """
+        with self._lock:
+            self._stats['requests'] += 1
+            within_ratio = (self._stats['hedged'] + 1 <=
+                            self.max_ratio * self._stats['requests'])
+        delay = self.hedge_delay(endpoint) if within_ratio else None
+        start = time.time()
+        if delay is None:
+            response = send()
+            self.observe(endpoint, time.time() - start)
+            return response
+
+        attempts = _Attempts()
+        attempts.start(0, send)
+        pending = 1
+        errors = []
+        try:
+            try:
+                result = attempts.results.get(timeout=delay)
+            except queue.Empty:
+                with self._lock:
+                    self._stats['hedged'] += 1
+                attempts.start(1, send)
+                pending += 1
+                result = attempts.results.get()
+
+            while True:
+                index, response, error = result
+                pending -= 1
+                if error is None:
+                    break
+                errors.append(error)
+                if not pending:
+                    raise errors[0]
+                result = attempts.results.get()
+        finally:
+            attempts.finish()
+
+        self.observe(endpoint, time.time() - start)
+        if index:
+            with self._lock:
+                self._stats['hedge_wins'] += 1
+        return response
+
+    def stats(self):
+        """
+        Returns the number of requests, how many were hedged, and how many
+        of those used the response of the second request.
+        """
+        with self._lock:
+            return dict(self._stats)
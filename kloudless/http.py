@@ -1,57 +1,69 @@
-from .util import logger
+from .auth import BaseAuth, APIKeyAuth, DevKeyAuth, BearerTokenAuth
+from .util import logger, account_id_from_path
 from . import config
+from . import deadlines
 from . import exceptions
+from . import instrumentation
+from . import retry
 
 import functools
-import json
 import time
-from abc import ABCMeta, abstractproperty
 
-class BaseAuth:
-    __metaclass__ = ABCMeta
-
-    scheme = abstractproperty()
-
-    def __init__(self, key):
-        self.key = key
-
-    @property
-    def auth_header(self):
-        return '%s %s' % (self.scheme, self.key)
+_get_requestor = functools.partial
 
-    def __call__(self, request):
-        request.headers['Authorization'] = self.auth_header
-        return request
+def request(method, path, configuration=None, **kwargs):
+    configuration, url = _prepare_request(path, configuration, kwargs)
 
-class APIKeyAuth(BaseAuth):
-    scheme = 'APIKey'
+    # `method` is either the name of the HTTP method or the `requests`
+    # function of the same name.
+    method = getattr(method, '__name__', method)
+    timeout = kwargs.pop('timeout', configuration['timeout'])
+    hedge = kwargs.pop('hedge', False)
+    requestor = _get_requestor(configuration['transport'].send, method, url,
+                               **kwargs)
 
-class DevKeyAuth(BaseAuth):
-    scheme = 'DeveloperKey'
+    body = kwargs.get('data')
+    hooks = configuration['hooks']
+    if not hooks:
+        return _request(requestor, configuration, method, path=path,
+                        timeout=timeout, hedge=hedge, body=body)
 
-class BearerTokenAuth(BaseAuth):
-    scheme = 'Bearer'
+    event = instrumentation.RequestEvent(method, path)
+    event.bytes_sent = instrumentation.body_size(kwargs.get('data'))
+    start = time.time()
+    try:
+        return _request(requestor, configuration, method, path=path,
+                        event=event, timeout=timeout, hedge=hedge,
+                        body=body)
+    except Exception as e:
+        event.error = e
+        raise
+    finally:
+        event.latency = time.time() - start
+        instrumentation.emit(hooks, event)
 
-_get_requestor = functools.partial
+def response_json(response, configuration=None):
+    """
+    Decodes the JSON body of `response` with the configured `json_codec`.
+    """
+    return config.merge(configuration)['json_codec'].loads(response.content)
 
-def request(method, path, configuration=None, **kwargs):
-    if configuration is None: configuration = {}
+def _prepare_request(path, configuration, kwargs):
+    """
+    Merges the configuration, and adds authentication, headers and the
+    encoded body to `kwargs`. Returns the configuration and URL to use.
+    """
     configuration = config.merge(configuration)
 
-    if path.startswith('applications'):
-        if not configuration['dev_key']:
-            raise exceptions.ConfigurationException(
-                "A Developer Key must be provided. You can get one at "
-                "https://developers.kloudless.com and set it by calling "
-                "'kloudless.configure(dev_key=\"DEV_KEY\")' prior to making "
-                "requests.")
-
-        kwargs['auth'] = DevKeyAuth(configuration['dev_key'])
-
-    elif configuration['api_key']:
-        kwargs['auth'] = APIKeyAuth(configuration['api_key'])
-    elif configuration['token']:
-        kwargs['auth'] = BearerTokenAuth(configuration['token'])
+    auth = _get_auth(configuration, path)
+    if auth is not None:
+        kwargs['auth'] = auth
+    elif path.startswith('applications'):
+        raise exceptions.ConfigurationException(
+            "A Developer Key must be provided. You can get one at "
+            "https://developers.kloudless.com and set it by calling "
+            "'kloudless.configure(dev_key=\"DEV_KEY\")' prior to making "
+            "requests.")
     else:
         raise exceptions.ConfigurationException(
             "An API Key or Bearer Token must be provided. You can get an API Key at "
@@ -60,24 +72,185 @@ def request(method, path, configuration=None, **kwargs):
             "requests. You can get a Bearer token by authenticating an account and "
             "set it by calling 'kloudless.configure(token=\"TOKEN\")' as well.")
 
-    url = "%s/v%s/%s" % (configuration['base_url'],
-                         configuration['api_version'],
-                         path)
+    url = configuration.url_prefix + path
 
     headers = kwargs.setdefault('headers', {})
 
     if kwargs.get('data'):
         ctype = headers.setdefault('Content-Type', 'application/json')
         if ctype.lower() == 'application/json':
-            kwargs['data'] = json.dumps(kwargs['data'])
+            kwargs['data'] = configuration['json_codec'].encode(
+                kwargs['data'])
+
+    return configuration, url
+
+def _get_auth(configuration, path):
+    """
+    Returns the authentication used for requests to `path`, or None if the
+    required credentials aren't configured.
+    """
+    if path.startswith('applications'):
+        return configuration.dev_auth
+    return configuration.auth
+
+def _rewinder(body):
+    """
+    Returns whether a request with `body` can be sent again, and a function
+    that rewinds `body` to do so if it is a file-like object, or None.
+    """
+    if not hasattr(body, 'read'):
+        return True, None
+    try:
+        if hasattr(body, 'seekable') and not body.seekable():
+            return False, None
+        position = body.tell()
+    except (AttributeError, IOError, OSError, ValueError):
+        return False, None
+    return True, lambda: body.seek(position)
+
+def _request(requestor, configuration, method='get', path='', event=None,
+             timeout=None, hedge=False, body=None):
+    """
+    Sends the request, retrying it as required. `event` is the
+    `instrumentation.RequestEvent` to record the responses and retries in.
+    `timeout` is passed on to the transport, capped to the time remaining
+    before the deadline. `hedge` allows the configured `hedging` policy to
+    send the request again if it is slow, and must only be set for reads.
+    `body` is the request body. File-like bodies are rewound before they
+    are sent again, and requests with bodies that can't be rewound are not
+    retried.
+    """
+    replayable, rewind = _rewinder(body)
+    hedging = configuration['hedging'] if hedge else None
+    if hedging is not None:
+        endpoint = instrumentation.endpoint_template(path)
+    deadline = deadlines.for_request(configuration)
+    retry_policy = configuration['retry_policy']
+    state = None
+    if retry_policy is not None and replayable:
+        state = retry_policy.start(method)
+    rate_limiter = configuration['rate_limiter']
+    account_id = account_id_from_path(path)
 
-    requestor = _get_requestor(method, url, **kwargs)
-    response = _request(requestor, configuration)
-    return response
+    concurrency_limit = None
+    if configuration['concurrency_limiter'] is not None:
+        concurrency_limit = configuration['concurrency_limiter'].get_limit(
+            account_id)
+    breaker = None
+    if configuration['circuit_breaker'] is not None:
+        breaker = configuration['circuit_breaker'].get_breaker(account_id)
 
-def _request(requestor, configuration):
-    response = requestor()
+    attempt = 0
+    while True:
+        if attempt and rewind is not None:
+            rewind()
+        attempt += 1
 
+        if rate_limiter is not None:
+            # Nothing is reserved if the deadline would pass first.
+            max_delay = None
+            if deadline is not None:
+                max_delay = deadline.check()
+            delay = rate_limiter.reserve(
+                _get_auth(configuration, path).auth_header,
+                account_id=account_id, max_delay=max_delay)
+            if delay > 0:
+                if deadline is not None:
+                    deadline.check(delay)
+                time.sleep(delay)
+
+        attempt_timeout = timeout
+        if deadline is not None:
+            attempt_timeout = deadline.timeout(timeout)
+        send = functools.partial(
+            _send, functools.partial(requestor, timeout=attempt_timeout),
+            concurrency_limit, breaker, deadline)
+        try:
+            if hedging is not None:
+                response = hedging.send(send, endpoint)
+            else:
+                response = send()
+        except retry.RETRYABLE_ERRORS as e:
+            delay = state.delay_for_error(e) if state is not None else None
+            if delay is None:
+                raise
+            logger.warning("Request failed: %s. Retrying in %.2fs." %
+                           (e, delay))
+        else:
+            if event is not None:
+                event.record_response(response)
+            delay = _retry_delay(response, configuration, state)
+            if delay is None:
+                return response
+            if not replayable:
+                raise exceptions.RateLimitException(response=response)
+
+        if deadline is not None:
+            deadline.check(delay)
+        if event is not None:
+            event.record_retry(delay)
+        time.sleep(delay)
+
+def _send(requestor, concurrency_limit=None, breaker=None, deadline=None):
+    if breaker is None:
+        return _send_limited(requestor, concurrency_limit, deadline)
+
+    token = breaker.acquire()
+    failed = None
+    try:
+        response = _send_limited(requestor, concurrency_limit, deadline)
+        failed = response.status_code >= 500
+        return response
+    except retry.RETRYABLE_ERRORS:
+        failed = True
+        raise
+    finally:
+        breaker.release(token, failed)
+
+def _send_limited(requestor, concurrency_limit=None, deadline=None):
+    if concurrency_limit is None:
+        return requestor()
+
+    if deadline is None:
+        concurrency_limit.acquire()
+    else:
+        # `check()` raises once the deadline has passed.
+        while not concurrency_limit.acquire(timeout=deadline.check()):
+            pass
+    response = None
+    start = time.time()
+    try:
+        response = requestor()
+        return response
+    finally:
+        concurrency_limit.release(response, latency=time.time() - start)
+
+def _retry_delay(response, configuration, retry_state=None):
+    """
+    Returns the number of seconds to wait before retrying the request that
+    received `response`, or None if it succeeded. Raises the appropriate
+    exception if it failed and should not be retried.
+    """
+    if retry_state is not None:
+        delay = retry_state.delay_for_response(response)
+        if delay is not None:
+            logger.warning("Request to '%s' failed: %s. Retrying in %.2fs." %
+                           (response.url, response.status_code, delay))
+            return delay
+
+    delay = _check_response(response, configuration)
+    if delay is not None and retry_state is not None:
+        delay = retry_state.delay_for_throttle(delay)
+        if delay is None:
+            raise exceptions.RateLimitException(response=response)
+    return delay
+
+def _check_response(response, configuration):
+    """
+    Raises the appropriate exception if the request failed. Returns the
+    number of seconds to wait before retrying if it was rate-limited, or
+    None if no retry is required.
+    """
     if not response.ok:
         logger.error("Request to '%s' failed: %s - %s" %
                      (response.url, response.status_code, response.text))
@@ -90,10 +263,7 @@ def _request(requestor, configuration):
             if not throttle_obj:
                 raise exceptions.RateLimitException(response=response)
 
-            delay = throttle_obj.track_and_delay(response)
-            if delay is not None:
-                time.sleep(delay)
-                return _request(requestor, configuration)
+            return throttle_obj.track_and_delay(response)
         elif response.status_code >= 500:
             raise exceptions.ServerException(response=response)
         else:
@@ -101,5 +271,7 @@ def _request(requestor, configuration):
     else:
         logger.debug("Request to '%s' succeeded. Status code: %s" %
                      (response.url, response.status_code))
-
-    return response
+        throttle_obj = configuration.get('throttle_retry_strategy')
+        if throttle_obj:
+            # Resets the count of consecutive rate-limited attempts.
+            throttle_obj.track(response)
@@ -0,0 +1,227 @@
+import bisect
+import threading
+
+import six
+
+from .util import logger
+
+# Path segments that are followed by the ID of a resource.
+_COLLECTIONS = frozenset([
+    'accounts', 'files', 'folders', 'links', 'multipart', 'users', 'groups',
+    'objects', 'contacts', 'leads', 'opportunities', 'campaigns', 'tasks',
+    'applications', 'apikeys', 'webhooks',
+])
+
+# Path segments that follow a collection but aren't IDs.
+_ACTIONS = frozenset(['upload_url', 'latest'])
+
+
+def endpoint_template(path):
+    """
+    Replaces the IDs in a request path with '{id}', so that requests for
+    different resources of the same type can be grouped. For example,
+    'accounts/7/storage/files/abc/contents' becomes
+    'accounts/{id}/storage/files/{id}/contents'.
+    """
+    segments = path.split('/')
+    for i in range(1, len(segments)):
+        if segments[i - 1] in _COLLECTIONS and segments[i] not in _ACTIONS:
+            segments[i] = '{id}'
+    return '/'.join(segments)
+
+
+def body_size(data):
+    """
+    Returns the size in bytes of a request body, or None if it is unknown,
+    such as for file-like objects.
+    """
+    if data is None:
+        return 0
+    if isinstance(data, six.text_type):
+        return len(data.encode('utf-8'))
+    if isinstance(data, bytes):
+        return len(data)
+    return None
+
+
+class RequestEvent(object):
+    """
+    Describes a call to `http.request`, passed to each hook once it
+    completes:
+
+    method: The HTTP method, such as 'GET'.
+    path: The request path, such as 'accounts/7/storage/files/abc'.
+    endpoint: The path with IDs replaced, as by `endpoint_template()`.
+    status: The status code of the last response, or None.
+    error: The exception raised, or None if the request succeeded.
+    retries: The number of times the request was retried.
+    backoff_time: Seconds spent waiting before retries.
+    bytes_sent: The size of the request body, or None if unknown.
+    bytes_received: The size of the response body, or None if unknown.
+    ttfb: Seconds until the headers of the last response were received.
+    latency: Total seconds spent, including retries.
+    """
+
+    def __init__(self, method, path):
+        self.method = method.upper()
+        self.path = path
+        self.endpoint = endpoint_template(path)
+        self.status = None
+        self.error = None
+        self.retries = 0
+        self.backoff_time = 0.0
+        self.bytes_sent = None
+        self.bytes_received = None
+        self.ttfb = None
+        self.latency = None
+
+    def record_response(self, response):
+        self.status = response.status_code
+        elapsed = getattr(response, 'elapsed', None)
+        if elapsed is not None:
+            self.ttfb = elapsed.total_seconds()
+        # Streamed bodies haven't been read yet.
+        content = getattr(response, '_content', None)
+        if isinstance(content, bytes):
+            self.bytes_received = len(content)
+        elif 'Content-Length' in response.headers:
+            self.bytes_received = int(response.headers['Content-Length'])
+
+    def record_retry(self, delay):
+        self.retries += 1
+        self.backoff_time += delay
+
+    def __repr__(self):
+        return '<RequestEvent %s %s %s %.3fs>' % (
+            self.method, self.endpoint, self.status, self.latency or 0)
+
+
+def emit(hooks, event):
+    """
+    Calls each hook with `event`. Exceptions raised by hooks are logged
+    rather than raised.
+    """
+    for hook in hooks:
+        try:
+            hook(event)
+        except Exception:
+            logger.exception("Request hook %r failed." % hook)
+
+
+class Histogram(object):
+    """
+    Counts observed values in buckets with the given upper bounds. Values
+    above the last bound are counted in an overflow bucket. Thread-safe.
+    """
+
+    DEFAULT_BOUNDS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5,
+                      10, 30, 60)
+
+    def __init__(self, bounds=DEFAULT_BOUNDS):
+        self.bounds = tuple(sorted(bounds))
+        self._counts = [0] * (len(self.bounds) + 1)
+        self._sum = 0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        with self._lock:
+            self._counts[bisect.bisect_left(self.bounds, value)] += 1
+            self._sum += value
+            self._count += 1
+
+    def percentile(self, p):
+        """
+        Returns the upper bound of the bucket containing the `p`th
+        percentile, or None if there are no observations. Returns infinity
+        if it is above the last bound.
+        """
+        with self._lock:
+            if not self._count:
+                return None
+            rank = p / 100.0 * self._count
+            seen = 0
+            for i, count in enumerate(self._counts):
+                seen += count
+                if count and seen >= rank:
+                    if i < len(self.bounds):
+                        return self.bounds[i]
+                    return float('inf')
+
+    def export(self):
+        """
+        Returns the bucket bounds and counts, and the count and sum of
+        observed values.
+        """
+        with self._lock:
+            return {
+                'bounds': list(self.bounds),
+                'counts': list(self._counts),
+                'count': self._count,
+                'sum': self._sum,
+            }
+
+
+class MetricsCollector(object):
+    """
+    A hook that records histograms of latency, time to first byte, backoff
+    time and bytes transferred by method and endpoint, along with counts of
+    retries and status codes:
+
+        metrics = MetricsCollector()
+        kloudless.configure(hooks=[metrics])
+        ...
+        metrics.export()[('GET', 'accounts/{id}/storage/files/{id}')]
+    """
+
+    TIME_METRICS = ('latency', 'ttfb', 'backoff_time')
+    SIZE_METRICS = ('bytes_sent', 'bytes_received')
+    SIZE_BOUNDS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304,
+                   16777216)
+
+    def __init__(self):
+        self._endpoints = {}
+        self._lock = threading.Lock()
+
+    def _metrics(self, key):
+        with self._lock:
+            metrics = self._endpoints.get(key)
+            if metrics is None:
+                metrics = {'statuses': {}, 'retries': 0}
+                for name in self.TIME_METRICS:
+                    metrics[name] = Histogram()
+                for name in self.SIZE_METRICS:
+                    metrics[name] = Histogram(self.SIZE_BOUNDS)
+                self._endpoints[key] = metrics
+        return metrics
+
+    def __call__(self, event):
+        metrics = self._metrics((event.method, event.endpoint))
+        for name in self.TIME_METRICS + self.SIZE_METRICS:
+            value = getattr(event, name)
+            if value is not None:
+                metrics[name].observe(value)
+        status = event.status
+        if status is None and event.error is not None:
+            status = type(event.error).__name__
+        with self._lock:
+            statuses = metrics['statuses']
+            statuses[status] = statuses.get(status, 0) + 1
+            metrics['retries'] += event.retries
+
+    def export(self):
+        """
+        Returns the metrics by (method, endpoint). Histograms are exported
+        as by `Histogram.export()`.
+        """
+        exported = {}
+        with self._lock:
+            for key, metrics in six.iteritems(self._endpoints):
+                entry = exported[key] = {}
+                for name, value in six.iteritems(metrics):
+                    if isinstance(value, Histogram):
+                        value = value.export()
+                    elif isinstance(value, dict):
+                        value = dict(value)
+                    entry[name] = value
+        return exported
@@ -0,0 +1,93 @@
+"""
+Iteration over the pages of list responses, used by `iter_all()` and
+`Folder.iter_contents()`.
+"""
+import threading
+
+from six.moves import queue
+
+from . import exceptions
+
+_DONE = object()
+
+
+def next_params(data, params):
+    """
+    Returns the query parameters that request the page after the list
+    response `data`, which was requested with `params`, or None if it is the
+    last page. Pages follow `next_page`, or `cursor` while there are events
+    `remaining`.
+    """
+    if data.get('next_page'):
+        result = dict(params, page=data['next_page'])
+    elif data.get('remaining') and data.get('cursor') is not None:
+        result = dict(params, cursor=data['cursor'])
+    else:
+        return None
+    # Guards against requesting the same page forever.
+    return None if result == params else result
+
+
+def iter_pages(fetch, params):
+    """
+    Yields the list responses returned by `fetch(params)` for each page,
+    starting with the one requested with `params`.
+    """
+    while params is not None:
+        data = fetch(params)
+        params = next_params(data, params)
+        yield data
+
+
+def prefetch(pages, depth=1):
+    """
+    Yields the items of the iterator `pages`, consuming it in a background
+    thread up to `depth` items ahead of the one being used. At most `depth`
+    items wait to be used, so that a large listing isn't held in memory.
+    Exceptions raised while consuming `pages` are raised when the items
+    before them have been used.
+    """
+    results = queue.Queue(maxsize=depth)
+    stopped = threading.Event()
+
+    def put(item):
+        # Gives up once the iteration stopped, rather than waiting forever
+        # for room in the queue.
+        while not stopped.is_set():
+            try:
+                results.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def run():
+        try:
+            for page in pages:
+                if not put((page, None)):
+                    return
+        except BaseException as e:
+            put((None, e))
+            return
+        put((_DONE, None))
+
+    thread = threading.Thread(target=run)
+    # Iteration that is never completed mustn't keep the process running.
+    thread.daemon = True
+    thread.start()
+    try:
+        while True:
+            try:
+                page, error = results.get(timeout=0.1)
+            except queue.Empty:
+                if thread.is_alive() or not results.empty():
+                    continue
+                raise exceptions.KloudlessException(
+                    "The thread requesting pages stopped unexpectedly.")
+            if error is not None:
+                raise error
+            if page is _DONE:
+                return
+            yield page
+    finally:
+        stopped.set()
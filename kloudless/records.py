@@ -0,0 +1,110 @@
+import six
+
+
+class _Schema(object):
+    """
+    The keys of records and the resource they can be converted to, shared
+    by the records created from a list response that have the same keys.
+    """
+    __slots__ = ('keys', 'index', 'factory')
+
+    def __init__(self, keys, factory):
+        self.keys = keys
+        self.index = dict((k, i) for i, k in enumerate(keys))
+        self.factory = factory
+
+
+class Record(object):
+    """
+    A read-only object listed in a response, holding its values in a tuple
+    as returned by the API. Timestamps are not parsed and nested objects are
+    dicts. Values are accessed as attributes or items, as with resources:
+
+        record.name
+        record['size']
+
+    Call `to_resource()` to retrieve a full resource object, such as a
+    `File` or `Folder`, to modify or save it.
+    """
+    __slots__ = ('_schema', '_values')
+
+    def __init__(self, schema, values):
+        object.__setattr__(self, '_schema', schema)
+        object.__setattr__(self, '_values', values)
+
+    def __getattr__(self, k):
+        try:
+            return self._values[self._schema.index[k]]
+        except KeyError:
+            raise AttributeError(k)
+
+    def __setattr__(self, k, v):
+        raise AttributeError("Records are read-only. Use to_resource() to "
+                             "modify the object.")
+
+    def __getitem__(self, k):
+        return self._values[self._schema.index[k]]
+
+    def get(self, k, default=None):
+        index = self._schema.index.get(k)
+        if index is None:
+            return default
+        return self._values[index]
+
+    def __contains__(self, k):
+        return k in self._schema.index
+
+    def __iter__(self):
+        return iter(self._schema.keys)
+
+    def __len__(self):
+        return len(self._values)
+
+    def keys(self):
+        return list(self._schema.keys)
+
+    def to_dict(self):
+        return dict(zip(self._schema.keys, self._values))
+
+    def to_resource(self):
+        """
+        Returns the resource object this record describes.
+        """
+        factory = self._schema.factory
+        return factory.resource_class.create_from_data(
+            self.to_dict(), parent_resource=factory.parent_resource,
+            configuration=factory.configuration)
+
+    def __eq__(self, other):
+        if isinstance(other, Record):
+            other = other.to_dict()
+        return self.to_dict() == other
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        return 'Record(%r)' % self.to_dict()
+
+
+class RecordFactory(object):
+    """
+    Creates the records of a list response. Records with the same keys
+    share one `_Schema`, so each only holds a tuple of its values.
+    """
+
+    def __init__(self, resource_class, parent_resource=None,
+                 configuration=None):
+        self.resource_class = resource_class
+        self.parent_resource = parent_resource
+        self.configuration = configuration
+        self._schemas = {}
+
+    def create(self, data):
+        keys = tuple(data)
+        schema = self._schemas.get(keys)
+        if schema is None:
+            schema = self._schemas[keys] = _Schema(keys, self)
+        return Record(schema, tuple(six.itervalues(data)))
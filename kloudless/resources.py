@@ -1,13 +1,25 @@
 from .util import to_datetime, to_iso
-from .http import request
+from .http import request, response_json
 from .exceptions import KloudlessException as KException
+from . import cache
+from . import concurrency
 from . import config
+from . import deadlines
+from . import pagination
+from . import records
+from . import streaming
 
 import inspect
 import json
 import requests
 import six
 import warnings
+from six.moves import copyreg
+
+# The tuples of keys to convert seen with `lazy_resources`, so that objects
+# with the same keys share one. There are few distinct ones in practice.
+_shared_lazy_keys = {}
+_max_shared_lazy_keys = 1000
 
 
 class BaseResource(dict):
@@ -26,25 +38,36 @@ class BaseResource(dict):
 
     _parent_resource_class = None
 
-    # requests.Session's connection pool could cause failures due to the lack
-    # of keep-alives causing the connection to drop unexpectedly.
-    # Use `requests` to be safe, but alter if better performance is preferable.
+    # Keys whose values haven't been converted since `populate()` with the
+    # `lazy_resources` configuration option, as a tuple shared by the
+    # objects with the same keys to convert. None if there are none.
+    _lazy_keys = None
+
+    # Keys that used to be present that no longer are post-save.
+    # Useful for more helpful error messages. Replaced on the instance once
+    # there are any.
+    _removed_keys = frozenset()
+
+    # Keys set since the last `populate()`, to be sent by `save()`. None if
+    # there are none.
+    _changed_keys = None
+
+    # Copies of the lists set by `populate()` by key, to find those modified
+    # in place since. None if there are none.
+    _list_snapshots = None
+
+    # Only used to name the HTTP method of each request. Requests are sent
+    # by the configured `transport.Transport`, which defaults to opening a
+    # new connection each time. Configure a `sessions.SessionPool` instead
+    # if better performance is preferable.
     _api_session = requests
 
     def __init__(self, id=None, parent_resource=None, configuration=None):
-        if not configuration:
-            configuration = {}
+        # Resources created from this one share the same Configuration.
         self._configuration = config.merge(configuration)
 
         self['id'] = id
 
-        # Saved state, as returned by the Kloudless API.
-        self._previous_data = {}
-
-        # Keys that used to be present that no longer are post-save.
-        # Useful for more helpful error messages.
-        self._removed_keys = set()
-
         self._parent_resource = parent_resource
 
         if self._parent_resource_class is not None:
@@ -58,31 +81,87 @@ class BaseResource(dict):
     def populate(self, data):
         """
         data: Response from Kloudless with data on this object.
+
+        With the `lazy_resources` configuration option, the values are kept
+        as returned by the API and only converted when first accessed.
         """
         removed = set(self.keys()) - set(data.keys())
-        self._removed_keys |= removed
+        if removed:
+            self._removed_keys = self._removed_keys | removed
 
         id = self['id']
         self.clear()
-
-        for k, v in data.items():
-            if k in self._serializers:
-                data[k] = self._serializers[k][1](v)
-
-        for k, v in six.iteritems(data):
-            super(BaseResource, self).__setitem__(
-                k, self.__class__.create_from_data(
-                    v, parent_resource=self._parent_resource,
-                    configuration=self._configuration))
+        self._list_snapshots = None
+
+        if self._configuration['lazy_resources']:
+            super(BaseResource, self).update(data)
+            # Other values are the same once converted.
+            lazy_keys = tuple(
+                k for k, v in six.iteritems(data)
+                if k in self._serializers or isinstance(v, (dict, list)))
+            if not lazy_keys:
+                lazy_keys = None
+            elif len(_shared_lazy_keys) < _max_shared_lazy_keys:
+                lazy_keys = _shared_lazy_keys.setdefault(lazy_keys, lazy_keys)
+            self._lazy_keys = lazy_keys
+        else:
+            self._lazy_keys = None
+            for k, v in six.iteritems(data):
+                v = self._deserialize(k, v)
+                if isinstance(v, list):
+                    self._snapshot_list(k, v)
+                super(BaseResource, self).__setitem__(k, v)
 
         if 'id' not in self:
             self['id'] = id
 
         # Update our state.
-        self._previous_data = self.serialize(self)
+        self._changed_keys = None
+
+    def _deserialize(self, k, v):
+        """
+        Converts the value of `k` as returned by the API.
+        """
+        if k in self._serializers:
+            v = self._serializers[k][1](v)
+        return self.__class__.create_from_data(
+            v, parent_resource=self._parent_resource,
+            configuration=self._configuration)
+
+    def _materialize(self, k):
+        value = self._deserialize(k, super(BaseResource, self).__getitem__(k))
+        if isinstance(value, list):
+            self._snapshot_list(k, value)
+        super(BaseResource, self).__setitem__(k, value)
+        self._lazy_keys = tuple(x for x in self._lazy_keys if x != k) or None
+        return value
+
+    def _snapshot_list(self, k, value):
+        if self._list_snapshots is None:
+            self._list_snapshots = {}
+        self._list_snapshots[k] = _snapshot(value)
+
+    def _modified_lists(self):
+        """
+        Returns the keys of the lists set by `populate()` that were modified
+        in place since.
+        """
+        if not self._list_snapshots:
+            return []
+        return [k for k, v in six.iteritems(self._list_snapshots)
+                if super(BaseResource, self).__getitem__(k) != v]
+
+    def _materialize_all(self):
+        while self._lazy_keys:
+            self._materialize(self._lazy_keys[0])
 
     @classmethod
     def create_from_data(cls, data, parent_resource=None, configuration=None):
+        """
+        Creates resources from `data`, or lists of them from lists. All the
+        resources created share `parent_resource` and one Configuration.
+        """
+        configuration = config.merge(configuration)
         if isinstance(data, list):
             return [cls.create_from_data(
                     d, parent_resource=parent_resource,
@@ -111,8 +190,16 @@ class BaseResource(dict):
             to populate the resource.
         """
         serialized = {}
-        for k, v in six.iteritems(resource_data):
-            if isinstance(v, BaseResource):
+        lazy_keys = getattr(resource_data, '_lazy_keys', None)
+        if lazy_keys:
+            items = dict.items(resource_data)
+        else:
+            items = six.iteritems(resource_data)
+        for k, v in items:
+            if lazy_keys and k in lazy_keys:
+                # Not accessed yet, so still as returned by the API.
+                serialized[k] = v
+            elif isinstance(v, BaseResource):
                 serialized[k] = v.serialize(v)
             elif k in cls._serializers:
                 serialized[k] = cls._serializers[k][0](v)
@@ -120,6 +207,76 @@ class BaseResource(dict):
                 serialized[k] = v
         return serialized
 
+    @classmethod
+    def _get_json(cls, path, configuration=None, refresh=False, **kwargs):
+        """
+        Makes a GET request to `path` and returns the decoded response.
+
+        With a `response_cache` configured, a response cached for the same
+        request is returned instead unless `refresh` is True. With
+        `single_flight`, concurrent identical requests share one response.
+        """
+        merged = config.merge(configuration)
+        response_cache = merged['response_cache']
+        single_flight = merged['single_flight']
+        if (response_cache is None and single_flight is None and
+                merged['validator_cache'] is None and
+                merged['hedging'] is None):
+            response = request(cls._api_session.get, path,
+                               configuration=configuration, **kwargs)
+            return response_json(response, configuration)
+
+        key = cache.request_key(merged, path, kwargs.get('params'))
+        if response_cache is not None and not refresh:
+            data = response_cache.get(key)
+            if data is not None:
+                return data
+
+        def fetch():
+            return cls._fetch_json(path, key, configuration, **kwargs)
+
+        if single_flight is not None:
+            return single_flight.do(key, fetch,
+                                    deadline=deadlines.for_request(merged))
+        return fetch()
+
+    @classmethod
+    def _fetch_json(cls, path, key, configuration=None, **kwargs):
+        """
+        Makes the request for `_get_json()` and caches the response. With a
+        `validator_cache` configured, the request is conditional on the
+        validators of the last response and the data decoded from it is
+        reused if the server responds with 304 Not Modified. The requests
+        may be hedged by the configured `hedging` policy.
+        """
+        merged = config.merge(configuration)
+        validator_cache = merged['validator_cache']
+        data = None
+        if validator_cache is not None:
+            response = request(cls._api_session.get, path,
+                               configuration=configuration,
+                               headers=validator_cache.request_headers(key),
+                               hedge=True, **kwargs)
+            if response.status_code == 304:
+                # None if the entry was discarded since the request was made.
+                data = validator_cache.revalidated(key)
+                if data is None:
+                    response = request(cls._api_session.get, path,
+                                       configuration=configuration,
+                                       hedge=True, **kwargs)
+        else:
+            response = request(cls._api_session.get, path,
+                               configuration=configuration, hedge=True,
+                               **kwargs)
+
+        if data is None:
+            data = response_json(response, configuration)
+            if validator_cache is not None:
+                validator_cache.store(key, response, data)
+        if merged['response_cache'] is not None:
+            merged['response_cache'].set(key, data)
+        return data
+
     @classmethod
     def list_path(cls, parent_resource):
         raise NotImplementedError("Subclasses must implement list_path.")
@@ -147,11 +304,25 @@ class BaseResource(dict):
             raise AttributeError(*e.args)
 
     def __setitem__(self, k, v):
+        # Values not converted yet are converted to compare them, so `k`
+        # isn't in `_lazy_keys` any more.
+        if k not in self or self[k] != v:
+            if self._changed_keys is None:
+                self._changed_keys = set()
+            self._changed_keys.add(k)
         super(BaseResource, self).__setitem__(k, v)
 
+    def _has_changes(self):
+        """
+        Returns whether keys were set or lists modified in place since the
+        last `populate()`, on this object or on the objects nested in it.
+        """
+        return bool(self._changed_keys or self._modified_lists()) or any(
+            _has_changes(v) for v in dict.values(self))
+
     def __getitem__(self, k):
         try:
-            return super(BaseResource, self).__getitem__(k)
+            value = super(BaseResource, self).__getitem__(k)
         except KeyError:
             if k in self._removed_keys:
                 raise KeyError(
@@ -163,12 +334,107 @@ class BaseResource(dict):
                     (k, k, ', '.join(self.keys())))
             else:
                 raise
+        if self._lazy_keys and k in self._lazy_keys:
+            return self._materialize(k)
+        return value
 
     def __delitem__(self, k):
         raise TypeError(
             "Items cannot be deleted. Please set them to None instead if you "
             "wish to clear them.")
 
+    # Methods of dict that return values, which may not be converted yet.
+
+    def get(self, k, default=None):
+        if k in self:
+            return self[k]
+        return default
+
+    def setdefault(self, k, default=None):
+        if k not in self:
+            self[k] = default
+        return self[k]
+
+    def update(self, *args, **kwargs):
+        for k, v in six.iteritems(dict(*args, **kwargs)):
+            self[k] = v
+
+    def items(self):
+        self._materialize_all()
+        return super(BaseResource, self).items()
+
+    def values(self):
+        self._materialize_all()
+        return super(BaseResource, self).values()
+
+    if six.PY2:
+        def iteritems(self):
+            self._materialize_all()
+            return super(BaseResource, self).iteritems()
+
+        def itervalues(self):
+            self._materialize_all()
+            return super(BaseResource, self).itervalues()
+
+    def __reduce__(self):
+        # Copies and pickles restore the items with dict.update() rather
+        # than __setitem__, which would record them as changed. Shallow
+        # copies mustn't share the records of which keys were changed.
+        attributes = dict(self.__dict__)
+        for k in ('_changed_keys', '_list_snapshots'):
+            if attributes.get(k) is not None:
+                attributes[k] = attributes[k].copy()
+        return (copyreg.__newobj__, (self.__class__,),
+                (dict(dict.items(self)), attributes))
+
+    def __setstate__(self, state):
+        items, attributes = state
+        dict.update(self, items)
+        self.__dict__.update(attributes)
+
+    def __iter__(self):
+        # Overriding __iter__ makes dict(resource) and {**resource} get the
+        # values with __getitem__ rather than copying them as stored, on
+        # Python 3.
+        return super(BaseResource, self).__iter__()
+
+    def copy(self):
+        self._materialize_all()
+        return super(BaseResource, self).copy()
+
+    def __repr__(self):
+        self._materialize_all()
+        return super(BaseResource, self).__repr__()
+
+    def clear(self):
+        self._lazy_keys = None
+        super(BaseResource, self).clear()
+
+    def __eq__(self, other):
+        self._materialize_all()
+        if isinstance(other, BaseResource):
+            other._materialize_all()
+        return super(BaseResource, self).__eq__(other)
+
+    def __ne__(self, other):
+        return not self == other
+
+
+def _snapshot(value):
+    # Copies nested lists. Resources in them keep track of their own
+    # changes.
+    if isinstance(value, list):
+        return [_snapshot(v) for v in value]
+    return value
+
+
+def _has_changes(value):
+    if isinstance(value, BaseResource):
+        return value._has_changes()
+    elif isinstance(value, list):
+        return any(_has_changes(v) for v in value)
+    return False
+
 
 class AnnotatedList(list):
     """
@@ -192,42 +458,235 @@ class AnnotatedList(list):
         list.__init__(self, objects)
 
 
+class StreamedList(object):
+    """
+    Iterates over the objects in a list response while it is being
+    downloaded, parsing and creating one object at a time rather than
+    holding the whole response in memory. It can only be iterated once.
+
+    The other attributes of the response, such as `cursor` or `remaining`,
+    become attributes of this StreamedList object as they are parsed. Those
+    returned after the list are available once iteration is complete.
+    """
+    def __init__(self, response, create):
+        self._response = response
+        self._create = create
+        self._consumed = False
+
+    def __iter__(self):
+        if self._consumed:
+            raise KException("The objects of a StreamedList can only be "
+                             "iterated over once.")
+        self._consumed = True
+        try:
+            events = streaming.iter_list_response(
+                self._response.iter_content(chunk_size=65536))
+            for event, value in events:
+                if event == 'item':
+                    yield self._create(value)
+                else:
+                    setattr(self, value[0], value[1])
+        finally:
+            self._response.close()
+
+
+def _list_item_creator(cls, parent_resource=None, configuration=None):
+    """
+    Returns a function that creates an object from an item of a list
+    response: a `records.Record` with the `compact_lists` configuration
+    option, or a resource created by `cls.create_from_data()` otherwise.
+    """
+    configuration = config.merge(configuration)
+    if configuration['compact_lists']:
+        return records.RecordFactory(cls, parent_resource=parent_resource,
+                                     configuration=configuration).create
+
+    def create(data):
+        return cls.create_from_data(data, parent_resource=parent_resource,
+                                    configuration=configuration)
+    return create
+
+
+def _annotated_list(cls, data, parent_resource=None, configuration=None):
+    """
+    Returns an AnnotatedList of the objects in the list response `data`.
+    """
+    if not config.merge(configuration)['compact_lists']:
+        return AnnotatedList(cls.create_from_data(
+            data, parent_resource=parent_resource,
+            configuration=configuration))
+
+    create = _list_item_creator(cls, parent_resource=parent_resource,
+                                configuration=configuration)
+    data = dict(data)
+    for k in ('objects', 'permissions'):
+        if isinstance(data.get(k), list):
+            data[k] = [create(d) for d in data[k]]
+    return AnnotatedList(data)
+
+
+def _iter_list(fetch, create_list, params, prefetch):
+    """
+    Returns an iterator over the objects of each page returned by
+    `fetch(params)`, as created by `create_list(data)`, prefetching up to
+    `prefetch` pages. The deadline set when this is called applies to every
+    page, rather than the one set when each page is requested.
+    """
+    if 'raw' in params:
+        raise TypeError("raw=True isn't supported when iterating over every "
+                        "page. Use all(raw=True) and pagination.next_params() "
+                        "instead.")
+    deadline = deadlines.current()
+
+    def fetch_page(params):
+        with deadlines.using(deadline):
+            return fetch(params)
+
+    pages = pagination.iter_pages(fetch_page, params)
+    if prefetch:
+        pages = pagination.prefetch(pages, prefetch)
+    return (obj for data in pages for obj in create_list(data))
+
+
+def _invalidate_cache(path, configuration=None):
+    """
+    Discards the cached responses that a write to `path` may have changed.
+    """
+    cache.invalidate(config.merge(configuration), path)
+
+
 def allow_proxy(func):
     func.allow_proxy = True
     return func
 
 
+def _aio():
+    """
+    The asyncio counterparts live in a separate module since they require
+    Python 3 and aiohttp.
+    """
+    from . import aio
+    return aio
+
+
 class ListMixin(object):
     @classmethod
     @allow_proxy
-    def all(cls, parent_resource=None, configuration=None, **params):
+    def all(cls, parent_resource=None, configuration=None, raw=False,
+            **params):
+        """
+        Returns an AnnotatedList of the objects listed. With `raw=True`,
+        returns the decoded response instead, including the fields such as
+        `cursor` or `page`, without creating objects.
+        """
+        data = cls._get_json(cls.list_path(parent_resource),
+                             configuration=configuration, params=params)
+        if raw:
+            return data
+        return cls._list_from_data(data, parent_resource=parent_resource,
+                                   configuration=configuration)
+
+    @classmethod
+    @allow_proxy
+    def all_async(cls, parent_resource=None, configuration=None, **params):
+        """
+        Coroutine counterpart of `all()`.
+        """
+        return _aio().all_resources(cls, parent_resource=parent_resource,
+                                    configuration=configuration, **params)
+
+    @classmethod
+    @allow_proxy
+    def stream(cls, parent_resource=None, configuration=None, **params):
+        """
+        Like `all()`, but returns a StreamedList that parses and creates
+        the objects listed one at a time as the response is downloaded.
+        """
         response = request(cls._api_session.get,
                            cls.list_path(parent_resource),
-                           configuration=configuration, params=params)
-        data = cls.create_from_data(
-            response.json(), parent_resource=parent_resource,
-            configuration=configuration)
-        return AnnotatedList(data)
+                           configuration=configuration, params=params,
+                           stream=True)
+        return cls._streamed_list(response, parent_resource=parent_resource,
+                                  configuration=configuration)
+
+    @classmethod
+    @allow_proxy
+    def iter_all(cls, parent_resource=None, configuration=None, prefetch=1,
+                 **params):
+        """
+        Like `all()`, but iterates over the objects of every page, following
+        `next_page`, or `cursor` while there are events `remaining`. The
+        next `prefetch` pages are requested in a background thread while
+        the objects of the current one are used. Set `prefetch` to 0 to
+        request each page once the previous one has been used.
+
+        The deadline set with `kloudless.deadline()` when `iter_all()` is
+        called applies to every page, even when they are requested after
+        the `with` block.
+        """
+        def fetch(params):
+            return cls._get_json(cls.list_path(parent_resource),
+                                 configuration=configuration, params=params)
+
+        def create_list(data):
+            return cls._list_from_data(data, parent_resource=parent_resource,
+                                       configuration=configuration)
+        return _iter_list(fetch, create_list, params, prefetch)
+
+    @classmethod
+    def _list_from_data(cls, data, parent_resource=None, configuration=None):
+        return _annotated_list(cls, data, parent_resource=parent_resource,
+                               configuration=configuration)
+
+    @classmethod
+    def _streamed_list(cls, response, parent_resource=None,
+                       configuration=None):
+        return StreamedList(response, _list_item_creator(
+            cls, parent_resource=parent_resource,
+            configuration=configuration))
 
 
 class RetrieveMixin(object):
     @classmethod
     @allow_proxy
-    def retrieve(cls, id, parent_resource=None, configuration=None, **params):
+    def retrieve(cls, id, parent_resource=None, configuration=None,
+                 raw=False, **params):
+        """
+        Returns the resource with ID `id`. With `raw=True`, returns the
+        decoded response instead of creating an object.
+        """
         instance = cls(id=id, parent_resource=parent_resource,
                        configuration=configuration)
-        response = request(cls._api_session.get, instance.detail_path(),
-                           configuration=configuration, params=params)
-        instance.populate(response.json())
+        data = cls._get_json(instance.detail_path(),
+                             configuration=configuration, params=params)
+        if raw:
+            return data
+        instance.populate(data)
         return instance
 
+    @classmethod
+    @allow_proxy
+    def retrieve_async(cls, id, parent_resource=None, configuration=None,
+                       **params):
+        """
+        Coroutine counterpart of `retrieve()`.
+        """
+        return _aio().retrieve(cls, id, parent_resource=parent_resource,
+                               configuration=configuration, **params)
+
     def refresh(self):
         """
         Retrieves and sets new metadata for the resource.
         """
-        response = request(self._api_session.get, self.detail_path(),
-                           configuration=self._configuration)
-        self.populate(response.json())
+        self.populate(self._get_json(self.detail_path(),
+                                     configuration=self._configuration,
+                                     refresh=True))
+
+    def refresh_async(self):
+        """
+        Coroutine counterpart of `refresh()`.
+        """
+        return _aio().refresh(self)
 
 
 class ReadMixin(RetrieveMixin, ListMixin):
@@ -255,10 +714,23 @@ class CreateMixin(object):
         response = request(method, cls.list_path(parent_resource),
                            configuration=configuration, data=data,
                            params=params)
+        _invalidate_cache(cls.list_path(parent_resource), configuration)
         return cls.create_from_data(
-            response.json(), parent_resource=parent_resource,
+            response_json(response, configuration),
+            parent_resource=parent_resource,
             configuration=configuration)
 
+    @classmethod
+    @allow_proxy
+    def create_async(cls, data=None, params=None, method='post',
+                     parent_resource=None, configuration=None):
+        """
+        Coroutine counterpart of `create()`.
+        """
+        return _aio().create(cls, data=data, params=params, method=method,
+                             parent_resource=parent_resource,
+                             configuration=configuration)
+
 
 class UpdateMixin(object):
     def _data_to_save(self, new_data):
@@ -267,53 +739,85 @@ class UpdateMixin(object):
         """
         return new_data
 
-    def save(self, **params):
-        data = self.serialize(self)
-
-        new_data = {}
-        for k, v in six.iteritems(data):
-            if k not in self._previous_data or self._previous_data[k] != v:
-                # Attribute is new or was updated
-                new_data[k] = v
+    def _changed_data(self):
+        """
+        Returns the serialized attributes that were set or, for lists,
+        modified in place since the last save, including those containing
+        objects with attributes that were. Raises an exception if they
+        can't be saved.
+        """
+        changed = set(self._changed_keys or ())
+        changed.update(self._modified_lists())
+        for k, v in dict.items(self):
+            if k not in changed and _has_changes(v):
+                changed.add(k)
+        new_data = self.serialize(dict((k, self[k]) for k in changed))
 
         new_data = self._data_to_save(new_data)
 
+        if new_data and self['id'] is None:
+            if hasattr(self.__class__, 'create'):
+                raise KException("No ID provided. Use create() to create "
+                                 "new resources instead.")
+            else:
+                raise KException("No ID provided to identify the resource "
+                                 "to update.")
+        return new_data
+
+    def _moved_parent_resource(self):
+        """
+        For some resources (eg: File/Folder), the parent resource could
+        be different after saving. Check for that.
+        This assumes that if the metadata contains an 'account' key,
+        it maps to the correct Account ID. We update our parent
+        resource with the ID and return it if it is different, so that its
+        metadata can be refreshed.
+        """
+        res_type = resource_types[self.__class__]
+        if (self._parent_resource and res_type in ['file', 'folder', 'link']):
+            parent_res_type = resource_types[self._parent_resource_class]
+            if (hasattr(self, parent_res_type) and
+                    self._parent_resource.id != self[parent_res_type]):
+                self._parent_resource.id = self[parent_res_type]
+                return self._parent_resource
+
+    def save(self, **params):
+        new_data = self._changed_data()
+
         if new_data:
-            if self['id'] is None:
-                if hasattr(self.__class__, 'create'):
-                    raise KException("No ID provided. Use create() to create "
-                                     "new resources instead.")
-                else:
-                    raise KException("No ID provided to identify the resource "
-                                     "to update.")
             response = request(self._api_session.patch, self.detail_path(),
                                configuration=self._configuration,
                                data=new_data, params=params)
-            self.populate(response.json())
-
-            # For some resources (eg: File/Folder), the parent resource could
-            # be different. Check for that.
-            # This assumes that if the metadata contains an 'account' key,
-            # it maps to the correct Account ID. We update our parent
-            # resource with the ID and it's metadata if it is different.
-            res_type = resource_types[self.__class__]
-            if (self._parent_resource and res_type in ['file', 'folder', 'link']):
-                parent_res_type = resource_types[self._parent_resource_class]
-                if (hasattr(self, parent_res_type) and
-                        self._parent_resource.id != self[parent_res_type]):
-                    self._parent_resource.id = self[parent_res_type]
-                    self._parent_resource.refresh()
+            _invalidate_cache(self.detail_path(), self._configuration)
+            self.populate(response_json(response, self._configuration))
+
+            parent_resource = self._moved_parent_resource()
+            if parent_resource is not None:
+                parent_resource.refresh()
 
             return True
         return False
 
+    def save_async(self, **params):
+        """
+        Coroutine counterpart of `save()`.
+        """
+        return _aio().save(self, **params)
+
 
 class DeleteMixin(object):
     def delete(self, **params):
         request(self._api_session.delete, self.detail_path(),
                 configuration=self._configuration, params=params)
+        _invalidate_cache(self.detail_path(), self._configuration)
         self.populate({})
 
+    def delete_async(self, **params):
+        """
+        Coroutine counterpart of `delete()`.
+        """
+        return _aio().delete(self, **params)
+
 
 class CopyMixin(object):
     def _copy(self, **data):
@@ -323,8 +827,14 @@ class CopyMixin(object):
         response = request(self._api_session.post,
                            "%s/copy" % self.detail_path(),
                            configuration=self._configuration, data=data)
+        _invalidate_cache(self.detail_path(), self._configuration)
+        if data.get('account') is not None:
+            # Copied to another account.
+            _invalidate_cache('accounts/%s/storage' % data['account'],
+                              self._configuration)
         return self.__class__.create_from_data(
-            response.json(), parent_resource=self._parent_resource,
+            response_json(response, self._configuration),
+            parent_resource=self._parent_resource,
             configuration=self._configuration)
 
 
@@ -393,14 +903,30 @@ class Account(BaseResource, ReadMixin, WriteMixin, Proxy):
     def list_path(cls, parent_resource):
         return 'accounts'
 
+    def populate(self, data):
+        super(Account, self).populate(data)
+        # Only needed to limit requests or break circuits per service.
+        if self.get('service') and (
+                self._configuration['concurrency_limiter'] is not None or
+                self._configuration['circuit_breaker'] is not None):
+            concurrency.register_account_service(self['id'], self['service'])
+
     @classmethod
     def serialize_account(cls, resource_data):
         account_properties = ['active', 'account', 'service', 'token',
                               'token_secret', 'refresh_token', 'token_expiry',
                               'refresh_token_expiry']
         serialized = {}
-        for k, v in six.iteritems(resource_data):
-            if isinstance(v, BaseResource):
+        lazy_keys = getattr(resource_data, '_lazy_keys', None)
+        if lazy_keys:
+            items = dict.items(resource_data)
+        else:
+            items = six.iteritems(resource_data)
+        for k, v in items:
+            if lazy_keys and k in lazy_keys:
+                # Not accessed yet, so still as returned by the API.
+                serialized[k] = v
+            elif isinstance(v, BaseResource):
                 serialized[k] = v.serialize_account(v)
             elif k not in account_properties:
                 continue
@@ -420,13 +946,20 @@ class Account(BaseResource, ReadMixin, WriteMixin, Proxy):
                            configuration=self._configuration, data=data,
                            params=params)
 
-        return response.json()
+        return response_json(response, self._configuration)
 
     def save(self, **params):
         # TODO: add in fields token, token_secret, refresh_token
         request(self._api_session.patch, self.detail_path(),
                 configuration=self._configuration,
                 data=self.serialize_account(self), params=params)
+        _invalidate_cache(self.detail_path(), self._configuration)
+
+    def save_async(self, **params):
+        """
+        Coroutine counterpart of `save()`.
+        """
+        return _aio().save_account(self, **params)
 
     @property
     def links(self):
@@ -566,6 +1099,8 @@ class File(AccountBaseResource, RetrieveMixin, DeleteMixin, UpdateMixin,
         file-like object.
         """
         headers = {
+            # Header values must be ASCII, so this isn't encoded with the
+            # configured `json_codec`.
             'X-Kloudless-Metadata': json.dumps({
                 'name': file_name,
                 'parent_id': parent_id,
@@ -575,8 +1110,10 @@ class File(AccountBaseResource, RetrieveMixin, DeleteMixin, UpdateMixin,
         response = request(cls._api_session.post, cls.list_path(parent_resource),
                            data=file_data, params=params, headers=headers,
                            configuration=configuration)
+        _invalidate_cache(cls.list_path(parent_resource), configuration)
         return cls.create_from_data(
-            response.json(), parent_resource=parent_resource,
+            response_json(response, configuration),
+            parent_resource=parent_resource,
             configuration=configuration)
 
     def update(self, file_data='', params=None):
@@ -590,7 +1127,8 @@ class File(AccountBaseResource, RetrieveMixin, DeleteMixin, UpdateMixin,
         response = request(self._api_session.put, self.detail_path(),
                            data=file_data, params=params, headers=headers,
                            configuration=self._configuration)
-        self.populate(response.json())
+        _invalidate_cache(self.detail_path(), self._configuration)
+        self.populate(response_json(response, self._configuration))
         return True
 
     def contents(self):
@@ -612,6 +1150,19 @@ class File(AccountBaseResource, RetrieveMixin, DeleteMixin, UpdateMixin,
                            configuration=self._configuration, stream=True)
         return response
 
+    def contents_async(self):
+        """
+        Coroutine counterpart of `contents()`. It returns an
+        `aio.Response` object whose body has not been read yet:
+
+            response = await file_obj.contents_async()
+            try:
+                data = await response.read()
+            finally:
+                response.close()
+        """
+        return _aio().file_contents(self)
+
     def copy_file(self, **data):
         return self._copy(**data)
 
@@ -623,7 +1174,7 @@ class File(AccountBaseResource, RetrieveMixin, DeleteMixin, UpdateMixin,
         response = request(cls._api_session.post, upload_url_path,
                            configuration=configuration, data=data or {},
                            params=params or {})
-        return response.json()
+        return response_json(response, configuration)
 
 
 class Folder(AccountBaseResource, RetrieveMixin, DeleteMixin, UpdateMixin,
@@ -635,14 +1186,48 @@ class Folder(AccountBaseResource, RetrieveMixin, DeleteMixin, UpdateMixin,
         kwargs.setdefault('id', 'root')
         super(Folder, self).__init__(*args, **kwargs)
 
-    def contents(self):
+    def contents(self, raw=False):
+        """
+        Returns an AnnotatedList of the files and folders in this folder.
+        With `raw=True`, returns the decoded response instead.
+        """
+        data = self._get_json("%s/contents" % self.detail_path(),
+                              configuration=self._configuration)
+        if raw:
+            return data
+        return _annotated_list(self.__class__, data,
+                               parent_resource=self._parent_resource,
+                               configuration=self._configuration)
+
+    def iter_contents(self, prefetch=1, **params):
+        """
+        Like `contents()`, but iterates over the files and folders of every
+        page, requesting up to `prefetch` pages ahead as with `iter_all()`.
+        """
+        path = "%s/contents" % self.detail_path()
+
+        def fetch(params):
+            return self._get_json(path, configuration=self._configuration,
+                                  params=params)
+
+        def create_list(data):
+            return _annotated_list(self.__class__, data,
+                                   parent_resource=self._parent_resource,
+                                   configuration=self._configuration)
+        return _iter_list(fetch, create_list, params, prefetch)
+
+    def stream_contents(self):
+        """
+        Like `contents()`, but returns a StreamedList that parses and
+        creates the files and folders one at a time as the response is
+        downloaded.
+        """
         response = request(self._api_session.get,
                            "%s/contents" % self.detail_path(),
-                           configuration=self._configuration)
-        data = self.create_from_data(
-            response.json(), parent_resource=self._parent_resource,
-            configuration=self._configuration)
-        return AnnotatedList(data)
+                           configuration=self._configuration, stream=True)
+        return StreamedList(response, _list_item_creator(
+            self.__class__, parent_resource=self._parent_resource,
+            configuration=self._configuration))
 
     def copy_folder(self, **data):
         return self._copy(**data)
@@ -669,12 +1254,21 @@ class Events(AccountBaseResource, ListMixin):
         response = request(cls._api_session.get,
                            "%s/latest" % cls.list_path(parent_resource),
                            configuration=configuration)
-        data = response.json()
+        data = response_json(response, configuration)
         if 'cursor' in data:
             return data['cursor']
         else:
             return data
 
+    @classmethod
+    @allow_proxy
+    def latest_cursor_async(cls, parent_resource=None, configuration=None):
+        """
+        Coroutine counterpart of `latest_cursor()`.
+        """
+        return _aio().latest_cursor(cls, parent_resource=parent_resource,
+                                    configuration=configuration)
+
 
 class Multipart(AccountBaseResource, RetrieveMixin, CreateMixin, DeleteMixin):
     """
@@ -700,6 +1294,15 @@ class Multipart(AccountBaseResource, RetrieveMixin, CreateMixin, DeleteMixin):
                 configuration=configuration)
         return True
 
+    def upload_chunk_async(self, part_number=None, data='',
+                           parent_resource=None, configuration=None,
+                           **params):
+        """
+        Coroutine counterpart of `upload_chunk()`.
+        """
+        return _aio().upload_chunk(self, part_number=part_number, data=data,
+                                   configuration=configuration, **params)
+
     def complete(self, **params):
         """
         Completes the multipart upload and returns a File object.
@@ -707,8 +1310,10 @@ class Multipart(AccountBaseResource, RetrieveMixin, CreateMixin, DeleteMixin):
         response = request(self._api_session.post,
                            "%s/complete" % self.detail_path(),
                            params=params, configuration=self._configuration)
+        _invalidate_cache(self.detail_path(), self._configuration)
         return File.create_from_data(
-            response.json(), parent_resource=self._parent_resource,
+            response_json(response, self._configuration),
+            parent_resource=self._parent_resource,
             configuration=self._configuration)
 
 
@@ -716,21 +1321,26 @@ class Permission(FileSystemBaseResource, ListMixin, CreateMixin):
     _path_segment = 'permissions'
 
     @classmethod
-    @allow_proxy
-    def all(cls, parent_resource=None, configuration=None, **params):
-        response = request(cls._api_session.get,
-                           cls.list_path(parent_resource),
-                           configuration=configuration, params=params)
-
-        response_json = response.json()
-        permissions = response_json.get('permissions')
+    def _list_from_data(cls, data, parent_resource=None, configuration=None):
+        permissions = data.get('permissions')
         for perm in permissions:
             perm['type'] = 'permission'
-        response_json['permissions'] = permissions
-        data = cls.create_from_data(
-            response_json, parent_resource=parent_resource,
+        data['permissions'] = permissions
+        return super(Permission, cls)._list_from_data(
+            data, parent_resource=parent_resource,
             configuration=configuration)
-        return AnnotatedList(data)
+
+    @classmethod
+    def _streamed_list(cls, response, parent_resource=None,
+                       configuration=None):
+        create_item = _list_item_creator(cls,
+                                         parent_resource=parent_resource,
+                                         configuration=configuration)
+
+        def create(data):
+            data['type'] = 'permission'
+            return create_item(data)
+        return StreamedList(response, create)
 
     @classmethod
     @allow_proxy
@@ -741,6 +1351,14 @@ class Permission(FileSystemBaseResource, ListMixin, CreateMixin):
                                              configuration=configuration,
                                              method='put', data=data)
 
+    @classmethod
+    @allow_proxy
+    def create_async(cls, params=None, parent_resource=None,
+                     configuration=None, data=None):
+        return super(Permission, cls).create_async(
+            params=params, parent_resource=parent_resource,
+            configuration=configuration, method='put', data=data)
+
     @classmethod
     @allow_proxy
     def update(cls, params=None, parent_resource=None, configuration=None,
@@ -760,10 +1378,8 @@ class Property(FileSystemBaseResource):
         """
         Returns a full list of custom properties associated with this file.
         """
-        response = request(cls._api_session.get,
-                           cls.list_path(parent_resource),
-                           configuration=configuration)
-        return response.json()
+        return cls._get_json(cls.list_path(parent_resource),
+                             configuration=configuration)
 
     @classmethod
     @allow_proxy
@@ -777,7 +1393,8 @@ class Property(FileSystemBaseResource):
                            cls.list_path(parent_resource),
                            configuration=configuration, data=data,
                            params=params)
-        return response.json()
+        _invalidate_cache(cls.list_path(parent_resource), configuration)
+        return response_json(response, configuration)
 
     @classmethod
     @allow_proxy
@@ -787,6 +1404,7 @@ class Property(FileSystemBaseResource):
         """
         request(cls._api_session.delete, cls.list_path(parent_resource),
                 configuration=configuration)
+        _invalidate_cache(cls.list_path(parent_resource), configuration)
         return True
 
 
@@ -794,28 +1412,37 @@ class User(AccountBaseResource, ReadMixin):
     _path_segment = 'team/users'
 
     def get_groups(self, **params):
+        return _annotated_list(
+            Group,
+            self._get_json("%s/memberships" % self.detail_path(),
+                           configuration=self._configuration, params=params),
+            parent_resource=self._parent_resource,
+            configuration=self._configuration)
+
+    def stream_groups(self, **params):
+        """
+        Like `get_groups()`, but returns a StreamedList that parses and
+        creates the groups one at a time as the response is downloaded.
+        """
         response = request(self._api_session.get, "%s/%s" %
                            (self.detail_path(), "memberships"),
-                           configuration=self._configuration, params=params)
-
-        data = Group.create_from_data(
-            response.json(), parent_resource=self._parent_resource,
-            configuration=self._configuration)
-        return AnnotatedList(data)
+                           configuration=self._configuration, params=params,
+                           stream=True)
+        return Group._streamed_list(response,
+                                    parent_resource=self._parent_resource,
+                                    configuration=self._configuration)
 
 
 class Group(AccountBaseResource, ReadMixin):
     _path_segment = 'team/groups'
 
     def get_users(self, **params):
-        response = request(self._api_session.get, "%s/%s" %
-                           (self.detail_path(), "members"),
-                           configuration=self._configuration, params=params)
-
-        data = User.create_from_data(
-            response.json(), parent_resource=self._parent_resource,
+        return _annotated_list(
+            User,
+            self._get_json("%s/members" % self.detail_path(),
+                           configuration=self._configuration, params=params),
+            parent_resource=self._parent_resource,
             configuration=self._configuration)
-        return AnnotatedList(data)
 
 
 class CRMObject(AccountBaseResource, ListMixin, CreateMixin, RetrieveMixin,
@@ -834,6 +1461,16 @@ class CRMObject(AccountBaseResource, ListMixin, CreateMixin, RetrieveMixin,
         return super(CRMObject, cls).all(parent_resource=parent_resource,
                                          configuration=configuration, **params)
 
+    @classmethod
+    @allow_proxy
+    def iter_all(cls, parent_resource=None, configuration=None, prefetch=1,
+                 **params):
+        if cls.raw_type is not None:
+            params['raw_type'] = cls.raw_type
+        return super(CRMObject, cls).iter_all(
+            parent_resource=parent_resource, configuration=configuration,
+            prefetch=prefetch, **params)
+
     @classmethod
     @allow_proxy
     def create(cls, params=None, parent_resource=None, configuration=None,
@@ -856,17 +1493,57 @@ class CRMObject(AccountBaseResource, ListMixin, CreateMixin, RetrieveMixin,
                                               configuration=configuration,
                                               **params)
 
+    @classmethod
+    @allow_proxy
+    def all_async(cls, parent_resource=None, configuration=None, **params):
+        if cls.raw_type is not None:
+            params['raw_type'] = cls.raw_type
+        return super(CRMObject, cls).all_async(
+            parent_resource=parent_resource, configuration=configuration,
+            **params)
+
+    @classmethod
+    @allow_proxy
+    def create_async(cls, params=None, parent_resource=None,
+                     configuration=None, method='post', data=None):
+        params = {} if params is None else params
+        if cls.raw_type is not None:
+            params['raw_type'] = cls.raw_type
+        return super(CRMObject, cls).create_async(
+            params=params, parent_resource=parent_resource,
+            configuration=configuration, method=method, data=data)
+
+    @classmethod
+    @allow_proxy
+    def retrieve_async(cls, id, parent_resource=None, configuration=None,
+                       **params):
+        if cls.raw_type is not None:
+            params['raw_type'] = cls.raw_type
+        return super(CRMObject, cls).retrieve_async(
+            id, parent_resource=parent_resource, configuration=configuration,
+            **params)
+
     def save(self, **params):
         # TODO: change serializer
         if self.raw_type is not None:
             params['raw_type'] = self.raw_type
         super(CRMObject, self).save(**params)
 
+    def save_async(self, **params):
+        if self.raw_type is not None:
+            params['raw_type'] = self.raw_type
+        return super(CRMObject, self).save_async(**params)
+
     def delete(self, **params):
         if self.raw_type is not None:
             params['raw_type'] = self.raw_type
         super(CRMObject, self).delete(**params)
 
+    def delete_async(self, **params):
+        if self.raw_type is not None:
+            params['raw_type'] = self.raw_type
+        return super(CRMObject, self).delete_async(**params)
+
 
 class CRMAccount(CRMObject):
     _path_segment = 'crm/accounts'
@@ -0,0 +1,209 @@
+import random
+import threading
+
+import requests
+
+try:
+    from requests.packages.urllib3.exceptions import NewConnectionError
+except ImportError:
+    NewConnectionError = ()
+
+# Errors raised by `requests` that may succeed if the request is retried.
+RETRYABLE_ERRORS = (requests.exceptions.ConnectionError,
+                    requests.exceptions.Timeout)
+
+
+def is_connect_error(error):
+    """
+    Whether `error` occurred while connecting, in which case the request
+    never reached the server and is safe to retry whatever its method.
+    """
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    if isinstance(error, requests.exceptions.ConnectionError):
+        reason = error.args[0] if error.args else None
+        reason = getattr(reason, 'reason', reason)
+        return isinstance(reason, NewConnectionError)
+    return False
+
+
+class RetryBudget(object):
+    """
+    Limits retries to a share of the total number of requests, so that
+    retries can't multiply the load on an API that is already failing.
+
+    Each request deposits `ratio` tokens and each retry withdraws one.
+    The budget starts with `min_retries` tokens so that clients making few
+    requests can still retry, and holds at most `max_balance` tokens so that
+    a long run of successful requests can't fund a burst of retries.
+    """
+
+    def __init__(self, ratio=0.2, min_retries=10, max_balance=100):
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self.max_balance = max(max_balance, min_retries)
+        self._balance = float(min_retries)
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def deposit(self):
+        with self._lock:
+            self._balance = min(self._balance + self.ratio, self.max_balance)
+
+    def withdraw(self):
+        """
+        Returns True if a retry is allowed.
+        """
+        with self._lock:
+            if self._balance < 1:
+                return False
+            self._balance -= 1
+            return True
+
+
+class RetryPolicy(object):
+    """
+    Decides whether and when failed requests are retried. Set it with
+    `kloudless.configure(retry_policy=RetryPolicy(...))`, or None to never
+    retry.
+
+    Connection errors, timeouts and responses with a status code in
+    `retry_statuses` are retried with decorrelated jitter backoff: each delay
+    is chosen at random between `base_delay` and three times the previous
+    delay, or three times `base_delay` for the first retry, capped at
+    `max_delay`. Requests using a method that isn't in `idempotent_methods`
+    are only retried if they never reached the server.
+
+    Rate-limited requests are retried as decided by the configured
+    `throttle_retry_strategy`, with up to `throttle_jitter` times the delay
+    added at random so that throttled clients don't retry in lockstep.
+
+    All retries count against the `budget`, a `RetryBudget`. The policy is
+    shared by all requests using the same configuration, and `stats()`
+    reports the attempts made and time spent waiting.
+    """
+
+    def __init__(self, max_retries=3, base_delay=0.5, max_delay=10,
+                 retry_statuses=(502, 503, 504), throttle_jitter=0.5,
+                 idempotent_methods=('GET', 'HEAD', 'OPTIONS', 'PUT',
+                                     'DELETE'),
+                 budget=None):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_statuses = set(retry_statuses)
+        self.throttle_jitter = throttle_jitter
+        self.idempotent_methods = set(m.upper() for m in idempotent_methods)
+        self.budget = budget if budget is not None else RetryBudget()
+
+        self._lock = threading.Lock()
+        self._stats = {
+            'requests': 0,
+            'attempts': 0,
+            'retries': 0,
+            'wait_time': 0.0,
+            'budget_exhausted': 0,
+        }
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def start(self, method):
+        """
+        Returns the RetryState tracking the attempts of a new request.
+        """
+        self.budget.deposit()
+        self._record(requests=1)
+        return RetryState(self, method)
+
+    def stats(self):
+        """
+        Returns a dict with the number of requests, attempts and retries
+        made, the total time in seconds spent waiting before retries and
+        the number of retries denied by the budget.
+        """
+        with self._lock:
+            return dict(self._stats)
+
+    def _record(self, **counts):
+        with self._lock:
+            for k, v in counts.items():
+                self._stats[k] += v
+
+    def _backoff(self, previous_delay):
+        if previous_delay is None:
+            previous_delay = self.base_delay
+        return min(self.max_delay,
+                   random.uniform(self.base_delay, previous_delay * 3))
+
+
+class RetryState(object):
+    """
+    The attempts made for a single request. Each `delay_for_*` method returns
+    the number of seconds to wait before retrying, or None if the request
+    should not be retried.
+    """
+
+    def __init__(self, policy, method):
+        self.policy = policy
+        self.method = method.upper()
+        self.retries = 0
+        self.wait_time = 0.0
+        self._previous_delay = None
+        policy._record(attempts=1)
+
+    @property
+    def idempotent(self):
+        return self.method in self.policy.idempotent_methods
+
+    def delay_for_error(self, error, connect_error=None):
+        """
+        `connect_error`: Whether the request failed before reaching the
+            server. Determined from `error` if not provided.
+        """
+        if connect_error is None:
+            connect_error = is_connect_error(error)
+        if not (self.idempotent or connect_error):
+            return None
+        return self._retry_delay(self.policy._backoff(self._previous_delay))
+
+    def delay_for_response(self, response):
+        if (response.status_code not in self.policy.retry_statuses or
+                not self.idempotent):
+            return None
+        return self._retry_delay(self.policy._backoff(self._previous_delay))
+
+    def delay_for_throttle(self, delay):
+        """
+        `delay`: The delay requested by the throttle retry strategy.
+        """
+        delay += random.uniform(0, delay * self.policy.throttle_jitter)
+        # The throttle retry strategy limits the number of retries itself.
+        return self._retry_delay(delay, limit_retries=False)
+
+    def _retry_delay(self, delay, limit_retries=True):
+        if limit_retries and self.retries >= self.policy.max_retries:
+            return None
+        if not self.policy.budget.withdraw():
+            self.policy._record(budget_exhausted=1)
+            return None
+
+        self.retries += 1
+        self.wait_time += delay
+        self._previous_delay = delay
+        self.policy._record(attempts=1, retries=1, wait_time=delay)
+        return delay
@@ -0,0 +1,142 @@
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from six.moves.urllib.parse import urlsplit
+
+try:
+    from requests.packages.urllib3.exceptions import ProtocolError
+except ImportError:
+    ProtocolError = ()
+
+from .transport import Transport
+from .util import logger
+
+
+class SessionPool(Transport):
+    """
+    Keeps one `requests.Session` per base URL and credential so that TCP and
+    TLS connections are reused across API requests.
+
+    Connections kept alive by the pool may be dropped by the server or an
+    intermediate proxy without notice. Requests using a method in
+    `idempotent_methods` that fail because of such a stale connection are
+    transparently retried on a fresh connection up to `stale_retries` times.
+    Other requests may have been received by the server before the
+    connection was dropped, so they are left to the configured
+    `retry_policy`.
+
+    Enable it with `kloudless.configure(transport=SessionPool())`.
+    """
+
+    def __init__(self, pool_connections=10, pool_maxsize=10, stale_retries=1,
+                 idempotent_methods=('GET', 'HEAD', 'OPTIONS', 'PUT',
+                                     'DELETE')):
+        """
+        pool_connections: Number of connection pools (hosts) to cache per
+            session.
+        pool_maxsize: Maximum number of connections to keep per host.
+        stale_retries: Number of times a request is retried after failing
+            on a dropped keep-alive connection.
+        idempotent_methods: The methods of the requests that may be retried.
+        """
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.stale_retries = stale_retries
+        self.idempotent_methods = set(m.upper() for m in idempotent_methods)
+
+        self._sessions = {}
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._stale_retries = 0
+
+    def _create_session(self):
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.pool_connections,
+                              pool_maxsize=self.pool_maxsize)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    def get_session(self, url, auth=None):
+        """
+        Returns the session used for requests to `url` authenticated
+        with `auth`, creating it if necessary.
+        """
+        parts = urlsplit(url)
+        key = (parts.scheme, parts.netloc, getattr(auth, 'auth_header', None))
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is None:
+                session = self._sessions[key] = self._create_session()
+        return session
+
+    def send(self, method, url, **kwargs):
+        """
+        Makes a request with the pooled session for `url`. `method` is the
+        HTTP method name, such as 'get'.
+        """
+        session = self.get_session(url, auth=kwargs.get('auth'))
+        retries = 0
+        # File-like bodies have already been consumed and can't be replayed.
+        replayable = (method.upper() in self.idempotent_methods and
+                      not hasattr(kwargs.get('data'), 'read'))
+
+        with self._lock:
+            self._requests += 1
+
+        while True:
+            try:
+                return session.request(method, url, **kwargs)
+            except requests.exceptions.ConnectionError as e:
+                if (not replayable or retries >= self.stale_retries or
+                        not is_stale_connection_error(e)):
+                    raise
+                retries += 1
+                with self._lock:
+                    self._stale_retries += 1
+                logger.debug("Retrying request to '%s' after the pooled "
+                             "connection was dropped: %s" % (url, e))
+
+    def stats(self):
+        """
+        Returns a dict with the number of sessions, connection pools,
+        requests made and stale connection retries performed.
+        """
+        with self._lock:
+            sessions = list(self._sessions.values())
+            stats = {
+                'sessions': len(sessions),
+                'requests': self._requests,
+                'stale_retries': self._stale_retries,
+            }
+
+        connection_pools = 0
+        for session in sessions:
+            for adapter in set(session.adapters.values()):
+                poolmanager = getattr(adapter, 'poolmanager', None)
+                if poolmanager is not None:
+                    connection_pools += len(poolmanager.pools)
+        stats['connection_pools'] = connection_pools
+        return stats
+
+    def close(self):
+        """
+        Closes all sessions and their connections.
+        """
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions = {}
+        for session in sessions:
+            session.close()
+
+
+def is_stale_connection_error(error):
+    """
+    Whether a `requests.exceptions.ConnectionError` was caused by the server
+    closing a kept-alive connection, rather than by failing to connect.
+    """
+    reason = error.args[0] if error.args else None
+    if isinstance(reason, ProtocolError):
+        return True
+    return 'Connection aborted' in str(reason)
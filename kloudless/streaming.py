@@ -0,0 +1,114 @@
+import codecs
+import json
+
+# Keys of list responses that contain the objects listed.
+LIST_KEYS = ('objects', 'permissions')
+
+_WHITESPACE = ' \t\n\r'
+_DELIMITERS = _WHITESPACE + ',:]}'
+
+
+class _Reader(object):
+    """
+    Decodes JSON values one at a time from an iterable of byte chunks,
+    reading more chunks only when the buffered text is incomplete.
+    """
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._decoder = json.JSONDecoder()
+        self._text_decoder = codecs.getincrementaldecoder('utf-8')()
+        self._buffer = ''
+        self._pos = 0
+        self._eof = False
+
+    def _read_more(self):
+        if self._eof:
+            return False
+        try:
+            chunk = next(self._chunks)
+        except StopIteration:
+            self._eof = True
+            chunk = b''
+            text = self._text_decoder.decode(chunk, final=True)
+        else:
+            text = self._text_decoder.decode(chunk)
+        # Drop the text already parsed, so that the buffer only holds the
+        # current value.
+        self._buffer = self._buffer[self._pos:] + text
+        self._pos = 0
+        return True
+
+    def peek(self):
+        """
+        Skips whitespace and returns the next character, or '' at the end.
+        """
+        while True:
+            buf = self._buffer
+            pos = self._pos
+            while pos < len(buf) and buf[pos] in _WHITESPACE:
+                pos += 1
+            self._pos = pos
+            if pos < len(buf):
+                return buf[pos]
+            if not self._read_more():
+                return ''
+
+    def expect(self, chars):
+        char = self.peek()
+        if char not in chars:
+            raise ValueError("Expected %r at position %s of the response but "
+                             "found %r." % (chars, self._pos, char))
+        self._pos += 1
+        return char
+
+    def value(self):
+        """
+        Decodes the next value. Values in a list response are always followed
+        by a delimiter, so a value that isn't yet (such as a number split
+        across chunks) may be incomplete and more is read first.
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except ValueError:
+                if not self._read_more():
+                    raise
+                continue
+            if (end < len(self._buffer) and
+                    self._buffer[end] in _DELIMITERS) or not self._read_more():
+                self._pos = end
+                return value
+
+
+def iter_list_response(chunks, list_keys=LIST_KEYS):
+    """
+    Parses a list response incrementally from an iterable of byte chunks,
+    such as `requests.Response.iter_content()`. Yields `('item', value)` for
+    each element of the list stored under one of `list_keys`, and
+    `('field', (key, value))` for the other keys of the response, in the
+    order they appear.
+    """
+    reader = _Reader(chunks)
+    reader.expect('{')
+    if reader.peek() == '}':
+        return
+
+    while True:
+        key = reader.value()
+        reader.expect(':')
+        if key in list_keys and reader.peek() == '[':
+            reader.expect('[')
+            if reader.peek() != ']':
+                while True:
+                    yield 'item', reader.value()
+                    if reader.expect(',]') == ']':
+                        break
+            else:
+                reader.expect(']')
+        else:
+            yield 'field', (key, reader.value())
+
+        if reader.expect(',}') == '}':
+            return
@@ -1,14 +1,38 @@
 import abc
+import collections
+import threading
+import time
 
 from . import exceptions
+from .util import lru_evict, lru_get
 
 class Throttling:
     __metaclass__ = abc.ABCMeta
 
     def __init__(self, max_retries=2):
         self.max_delay = 10
-        self.counter = 0
         self.max_retries = max_retries
+        # The same strategy is shared by every request using a
+        # configuration, so count rate-limited attempts per thread.
+        self._local = threading.local()
+
+    def __getstate__(self):
+        # The counters are per thread, so they aren't kept.
+        state = self.__dict__.copy()
+        del state['_local']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._local = threading.local()
+
+    @property
+    def counter(self):
+        return getattr(self._local, 'counter', 0)
+
+    @counter.setter
+    def counter(self, value):
+        self._local.counter = value
 
     def _header_check(self, response):
         if 'Retry-After' in response.headers:
@@ -50,3 +74,127 @@ class ExpFallback(Throttling):
     def _get_delay(self, response):
         return max(0, int(2**(self.counter - 1)))
 
+class TokenBucket(object):
+    """
+    Allows `rate` requests per second on average, with bursts of up to
+    `capacity` requests. Thread-safe.
+    """
+
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else rate)
+        self._tokens = self.capacity
+        self._updated = time.time()
+        self._lock = threading.Lock()
+
+    def reserve(self, max_delay=None):
+        """
+        Takes a token and returns the number of seconds to wait before it
+        may be used. If that would be `max_delay` seconds or more, no token
+        is taken and the delay is returned all the same.
+        """
+        with self._lock:
+            now = time.time()
+            self._tokens = min(
+                self.capacity,
+                self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            delay = 0
+            if self._tokens < 1:
+                delay = (1 - self._tokens) / self.rate
+            if max_delay is None or delay < max_delay:
+                self._tokens -= 1
+            return delay
+
+    def idle(self):
+        """
+        Whether the bucket is full, so that replacing it with a new one
+        makes no difference.
+        """
+        with self._lock:
+            tokens = self._tokens + (time.time() - self._updated) * self.rate
+            return tokens >= self.capacity
+
+    def refund(self):
+        """
+        Returns a token taken by `reserve()` that won't be used.
+        """
+        with self._lock:
+            self._tokens = min(self.capacity, self._tokens + 1)
+
+    def acquire(self):
+        """
+        Blocks until a token is available.
+        """
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+class RateLimiter(object):
+    """
+    Paces requests before they are sent so that they stay under a quota,
+    rather than reacting to rate limiting once it has occurred. Set it with
+    `kloudless.configure(rate_limiter=RateLimiter(...))`.
+
+    `rate` requests per second are allowed for each API Key, Bearer token
+    or Developer Key, and `account_rate` requests per second for each
+    account. Either may be None for no limit. `burst` and `account_burst`
+    are the number of requests that may be sent at once after a period of
+    inactivity, and default to one second's worth of requests. At most
+    `max_buckets` credentials and accounts are tracked, discarding those
+    used least recently, preferably those that are idle.
+    """
+
+    def __init__(self, rate=None, burst=None, account_rate=None,
+                 account_burst=None, max_buckets=10000):
+        self.rate = rate
+        self.burst = burst
+        self.account_rate = account_rate
+        self.account_burst = account_burst
+        self.max_buckets = max_buckets
+        self._buckets = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def _bucket(self, key, rate, capacity):
+        with self._lock:
+            bucket = lru_get(self._buckets, key)
+            if bucket is None:
+                bucket = self._buckets[key] = TokenBucket(rate, capacity)
+                lru_evict(self._buckets, self.max_buckets,
+                          idle=TokenBucket.idle)
+        return bucket
+
+    def reserve(self, credential, account_id=None, max_delay=None):
+        """
+        Reserves a request for the credential (the Authorization header)
+        and account, and returns the number of seconds to wait before
+        sending it. If that would be `max_delay` seconds or more, such as
+        past a deadline, nothing is reserved and the delay is returned all
+        the same.
+        """
+        buckets = []
+        if self.rate is not None:
+            buckets.append(self._bucket(('credential', credential),
+                                        self.rate, self.burst))
+        if self.account_rate is not None and account_id is not None:
+            buckets.append(self._bucket(('account', account_id),
+                                        self.account_rate,
+                                        self.account_burst))
+
+        delay = 0
+        for i, bucket in enumerate(buckets):
+            bucket_delay = bucket.reserve(max_delay=max_delay)
+            delay = max(delay, bucket_delay)
+            if max_delay is not None and bucket_delay >= max_delay:
+                for reserved in buckets[:i]:
+                    reserved.refund()
+                break
+        return delay
+
+    def acquire(self, credential, account_id=None):
+        """
+        Blocks until a request may be sent.
+        """
+        delay = self.reserve(credential, account_id=account_id)
+        if delay > 0:
+            time.sleep(delay)
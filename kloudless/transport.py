@@ -0,0 +1,127 @@
+import json
+import re
+import threading
+
+import requests
+from requests.models import Response
+from requests.structures import CaseInsensitiveDict
+from six.moves.urllib.parse import urlsplit
+
+
+class Transport(object):
+    """
+    Sends HTTP requests to the Kloudless API. Set the transport to use via
+    `kloudless.configure(transport=...)`.
+
+    Sub-classes implement `send()`, which receives the HTTP method name
+    (such as 'get'), the full URL and the keyword arguments accepted by
+    `requests.request` (`params`, `data`, `headers`, `auth`, `stream`, ...).
+    It returns a response-like object providing `status_code`, `ok`,
+    `headers`, `url`, `content`, `text` and `json()`, such as a
+    `requests.Response`.
+    """
+
+    def send(self, method, url, **kwargs):
+        raise NotImplementedError("Subclasses must implement send.")
+
+    def close(self):
+        """
+        Releases any resources, such as connections, held by the transport.
+        """
+        pass
+
+
+class RequestsTransport(Transport):
+    """
+    Opens a new connection for each request using the `requests` module.
+    This is the default transport.
+    """
+
+    def send(self, method, url, **kwargs):
+        return requests.request(method, url, **kwargs)
+
+
+class FakeRequest(object):
+    """
+    A request received by a `FakeTransport`.
+    """
+
+    def __init__(self, method, url, path, kwargs):
+        self.method = method
+        self.url = url
+        self.path = path
+        self.params = kwargs.get('params') or {}
+        self.headers = kwargs.get('headers') or {}
+        self.data = kwargs.get('data')
+        self.kwargs = kwargs
+
+
+class FakeTransport(Transport):
+    """
+    Serves canned responses in-process without any network access. Useful
+    for tests:
+
+        transport = FakeTransport()
+        transport.add('get', 'accounts/7', json={'id': 7})
+        kloudless.configure(api_key='KEY', transport=transport)
+
+        account = kloudless.Account.retrieve(7)
+        assert transport.requests[0].path == 'accounts/7'
+
+    Paths are relative to the API version, as in `http.request`. Requests
+    for paths without a response receive a 404.
+    """
+
+    _version_prefix = re.compile(r'^/v[^/]+/')
+
+    def __init__(self):
+        self.routes = {}
+        self.requests = []
+        self._lock = threading.Lock()
+
+    def add(self, method, path, status_code=200, json=None, content=b'',
+            headers=None):
+        """
+        Adds a response for requests to `path` with `method`. Adding several
+        responses for the same request returns them in order, with the last
+        one repeated.
+        `json`: Data to be JSON-encoded as the response body.
+        `content`: The response body, if `json` is not provided.
+        """
+        if json is not None:
+            content = _json_dumps(json)
+        if not isinstance(content, bytes):
+            content = content.encode('utf-8')
+        key = (method.upper(), path)
+        with self._lock:
+            self.routes.setdefault(key, []).append(
+                (status_code, content, headers or {}))
+
+    def send(self, method, url, **kwargs):
+        path = self._version_prefix.sub('', urlsplit(url).path)
+        key = (method.upper(), path)
+        with self._lock:
+            self.requests.append(FakeRequest(method.upper(), url, path,
+                                             kwargs))
+            responses = self.routes.get(key)
+            if not responses:
+                route = (404, b'{"error_code": "not_found"}', {})
+            elif len(responses) > 1:
+                route = responses.pop(0)
+            else:
+                route = responses[0]
+
+        status_code, content, headers = route
+        response = Response()
+        response.status_code = status_code
+        response.reason = 'Fake'
+        response._content = content
+        response._content_consumed = True
+        response.encoding = 'utf-8'
+        response.headers = CaseInsensitiveDict(headers)
+        response.url = url
+        return response
+
+
+def _json_dumps(data):
+    return json.dumps(data)
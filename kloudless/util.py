@@ -1,6 +1,8 @@
 import logging
+import re
 
 import dateutil.parser
+import dateutil.tz
 from datetime import datetime
 
 import six
@@ -8,14 +10,88 @@ import six
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+_account_path = re.compile(r'^accounts/([^/]+)')
+
+def account_id_from_path(path):
+    """
+    Returns the ID of the account a request path belongs to, or None.
+    """
+    match = _account_path.match(path)
+    if match:
+        return match.group(1)
+
+def lru_get(entries, key):
+    """
+    Returns the value of `key` in the OrderedDict `entries`, or None, and
+    moves it to the end, where the most recently used entries are.
+    """
+    value = entries.pop(key, None)
+    if value is not None:
+        entries[key] = value
+    return value
+
+def lru_evict(entries, max_entries, idle=None):
+    """
+    Removes the least recently used entries of the OrderedDict `entries`
+    until it holds at most `max_entries`. Entries whose value `idle(value)`
+    returns False for are only removed if there aren't enough others. The
+    most recently used entry, such as one just added, is kept.
+    """
+    excess = len(entries) - max_entries
+    if excess <= 0:
+        return
+    newest = next(reversed(entries))
+    keys = []
+    if idle is not None:
+        for key, value in six.iteritems(entries):
+            if len(keys) == excess:
+                break
+            if key != newest and idle(value):
+                keys.append(key)
+    for key in entries:
+        if len(keys) == excess:
+            break
+        if key not in keys:
+            keys.append(key)
+    for key in keys:
+        del entries[key]
+
+# The format of the timestamps returned by the API.
+_iso_timestamp = re.compile(
+    r'(\d{4})-(\d\d)-(\d\d)T(\d\d):(\d\d):(\d\d)(?:\.(\d{1,6}))?'
+    r'(Z|[+-]\d\d:\d\d)?$')
+
+_utc = dateutil.tz.tzutc()
+
 def to_datetime(timestamp):
     """
-    Converts ISO 8601 timestamp to datetime object.
+    Converts ISO 8601 timestamp to datetime object. Timestamps in the format
+    returned by the API are parsed directly, and others by dateutil.
     """
     if isinstance(timestamp, datetime) or timestamp is None:
         return timestamp
 
-    return dateutil.parser.parse(timestamp)
+    match = _iso_timestamp.match(timestamp)
+    if match is None:
+        return dateutil.parser.parse(timestamp)
+
+    (year, month, day, hour, minute, second, fraction,
+     offset) = match.groups()
+    tzinfo = None
+    if offset == 'Z':
+        tzinfo = _utc
+    elif offset:
+        seconds = int(offset[1:3]) * 3600 + int(offset[4:6]) * 60
+        if offset[0] == '-':
+            seconds = -seconds
+        tzinfo = dateutil.tz.tzoffset(None, seconds) if seconds else _utc
+    try:
+        return datetime(int(year), int(month), int(day), int(hour),
+                        int(minute), int(second),
+                        int(fraction.ljust(6, '0')) if fraction else 0,
+                        tzinfo)
+    except ValueError:
+        return dateutil.parser.parse(timestamp)
 
 def to_iso(obj):
     """
@@ -25,6 +25,12 @@ install_requires=[
     'python-dateutil',
     ]
 
+extras_require = {
+    'async': ['aiohttp>=3.0'],
+    'fast': ['orjson; python_version >= "3.6"'],
+    'numpy': ['numpy'],
+    }
+
 test_requires = [
     'selenium>=2.48.0',
     'pytz>=2013d',
@@ -42,6 +48,7 @@ if __name__ == '__main__':
         long_description=read(opj(curdir, 'README.md')),
         url='https://kloudless.com/',
         install_requires=install_requires,
+        extras_require=extras_require,
         license='MIT',
         classifiers=[
             'Programming Language :: Python',
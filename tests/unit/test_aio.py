@@ -0,0 +1,206 @@
+import io
+import json
+import threading
+
+import pytest
+
+aiohttp = pytest.importorskip('aiohttp')
+
+import asyncio
+
+from six.moves.BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+
+import helpers
+import kloudless
+from kloudless import aio, exceptions
+from kloudless.resources import Account, File, Folder, Multipart
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """
+    Serves canned responses for the paths in `routes` and records the
+    requests it receives. A route may have a list of responses, which are
+    served in turn until the last one.
+    """
+    routes = {}
+    received = []
+
+    def _handle(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+        self.received.append((self.command, self.path, dict(self.headers),
+                              body))
+        path = self.path.split('?', 1)[0]
+        route = self.routes.get((self.command, path),
+                                (404, '{"id": "missing"}'))
+        if isinstance(route, list):
+            route = route.pop(0) if len(route) > 1 else route[0]
+        status, content = route[:2]
+        headers = route[2] if len(route) > 2 else {}
+        content = content.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        for k, v in headers.items():
+            self.send_header(k, v)
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _handle
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    StandInHandler.routes = {}
+    StandInHandler.received = []
+    httpd = HTTPServer(('127.0.0.1', 0), StandInHandler)
+    thread = threading.Thread(target=httpd.serve_forever,
+                              kwargs={'poll_interval': 0.05})
+    thread.daemon = True
+    thread.start()
+    default_config = kloudless.config.configure()
+    kloudless.configure(api_key='FAKE',
+                        base_url='http://127.0.0.1:%s' % httpd.server_port)
+    yield StandInHandler
+    kloudless.configure(**default_config)
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def run(coro):
+    async def run_and_close():
+        try:
+            return await coro
+        finally:
+            await aio.close()
+    return asyncio.new_event_loop().run_until_complete(run_and_close())
+
+
+def test_account_list(server):
+    server.routes[('GET', '/v1/accounts')] = (200, helpers.account_list)
+    accounts = run(Account.all_async(active=True))
+    assert len(accounts) == 7
+    assert all(isinstance(x, Account) for x in accounts)
+    method, path, headers, body = server.received[0]
+    assert path == '/v1/accounts?active=True'
+    assert headers['Authorization'] == 'APIKey FAKE'
+
+
+def test_raw_account_list(server):
+    server.routes[('GET', '/v1/accounts')] = (200, helpers.account_list)
+    accounts = run(Account.all_async(raw=True))
+    assert accounts == json.loads(helpers.account_list)
+    assert server.received[0][1] == '/v1/accounts'
+
+
+def test_retrieve_through_proxy(server):
+    account = Account.create_from_data(json.loads(helpers.account))
+    folder_data = json.loads(helpers.folder_data)
+    server.routes[('GET', '/v1/accounts/%s/storage/folders/%s' % (
+        account.id, folder_data['id']))] = (200, helpers.folder_data)
+    folder = run(account.folders.retrieve_async(folder_data['id']))
+    assert isinstance(folder, Folder)
+    assert folder.name == folder_data['name']
+
+
+def test_concurrent_retrieves(server):
+    server.routes[('GET', '/v1/accounts/7')] = (200, helpers.account)
+
+    async def fan_out():
+        return await asyncio.gather(
+            *[Account.retrieve_async(7) for _ in range(20)])
+
+    accounts = run(fan_out())
+    assert len(accounts) == 20
+    assert all(a.service == 'gdrive' for a in accounts)
+
+
+def test_create_and_save(server):
+    account = Account.create_from_data(json.loads(helpers.account))
+    folders_path = '/v1/accounts/%s/storage/folders' % account.id
+    folder_data = json.loads(helpers.folder_data)
+    server.routes[('POST', folders_path)] = (201, helpers.folder_data)
+    new_data = dict(folder_data, name='Renamed')
+    server.routes[('PATCH', '%s/%s' % (folders_path, folder_data['id']))] = (
+        200, json.dumps(new_data))
+    # The folder's account ID is a string, so the account is refreshed.
+    server.routes[('GET', '/v1/accounts/%s' % account.id)] = (
+        200, helpers.account)
+
+    folder = run(account.folders.create_async(
+        data={'name': 'Kloudless', 'parent_id': 'root'}))
+    assert isinstance(folder, Folder)
+    assert json.loads(server.received[0][3].decode('utf-8')) == {
+        'name': 'Kloudless', 'parent_id': 'root'}
+
+    folder.name = 'Renamed'
+    assert run(folder.save_async()) is True
+    assert folder.name == 'Renamed'
+    assert json.loads(server.received[1][3].decode('utf-8')) == {
+        'name': 'Renamed'}
+
+
+def test_file_contents_and_delete(server):
+    account = Account.create_from_data(json.loads(helpers.account))
+    file_obj = File.create_from_data(json.loads(helpers.file_data),
+                                     parent_resource=account)
+    server.routes[('GET', '/v1/%s/contents' % file_obj.detail_path())] = (
+        200, helpers.file_contents)
+    server.routes[('DELETE', '/v1/%s' % file_obj.detail_path())] = (204, '')
+
+    async def download():
+        response = await file_obj.contents_async()
+        try:
+            return await response.read()
+        finally:
+            response.close()
+
+    assert run(download()) == helpers.file_contents.encode('utf-8')
+    run(file_obj.delete_async())
+    assert server.received[-1][0] == 'DELETE'
+
+
+def test_latest_cursor(server):
+    account = Account.create_from_data(json.loads(helpers.account))
+    server.routes[('GET', '/v1/accounts/%s/events/latest' % account.id)] = (
+        200, '{"cursor": "abc"}')
+    assert run(account.events.latest_cursor_async()) == 'abc'
+
+
+def test_error_raises(server):
+    server.routes[('GET', '/v1/accounts/7')] = (500, '{"id": "req"}')
+    with pytest.raises(exceptions.ServerException):
+        run(Account.retrieve_async(7))
+
+
+def test_hooks(server):
+    events = []
+    server.routes[('GET', '/v1/accounts/7')] = (200, helpers.account)
+    run(Account.retrieve_async(7, configuration={'hooks': [events.append]}))
+    assert events[0].endpoint == 'accounts/{id}'
+    assert events[0].status == 200
+    assert events[0].bytes_received == len(helpers.account)
+
+
+def test_upload_chunk_rewinds_file_bodies(server):
+    path = '/v1/accounts/7/storage/multipart/3'
+    multipart = Multipart(id=3, parent_resource=Account(id=7))
+    rate_limited = (429, '{}', {'Retry-After': '0.01'})
+    server.routes[('PUT', path)] = [rate_limited, (200, '{}')]
+    assert run(multipart.upload_chunk_async(
+        part_number=1, data=io.BytesIO(b'hello world')))
+    assert [r[3] for r in server.received] == [b'hello world'] * 2
+
+    class Unseekable(io.BytesIO):
+        def seekable(self):
+            return False
+
+    server.received[:] = []
+    server.routes[('PUT', path)] = [rate_limited, (200, '{}')]
+    with pytest.raises(exceptions.RateLimitException):
+        run(multipart.upload_chunk_async(
+            part_number=1, data=Unseekable(b'hello world')))
+    assert len(server.received) == 1
@@ -0,0 +1,247 @@
+import json
+import threading
+import time
+
+import pytest
+
+import helpers
+from kloudless import cache, config
+from kloudless.cache import ResponseCache, SingleFlight, ValidatorCache
+from kloudless.resources import Account, Folder
+from kloudless.transport import FakeTransport
+
+
+def conditional_transport(path, content, etag='"v1"'):
+    transport = FakeTransport()
+    transport.add('get', path, content=content, headers={'ETag': etag})
+    transport.add('get', path, status_code=304)
+    return transport
+
+
+@helpers.configured_test
+def test_retrieve_revalidates():
+    transport = conditional_transport('accounts/7', helpers.account.encode())
+    validator_cache = ValidatorCache()
+    configuration = {'transport': transport,
+                     'validator_cache': validator_cache}
+
+    account = Account.retrieve(7, configuration=configuration)
+    assert 'If-None-Match' not in transport.requests[0].kwargs['headers']
+
+    account.service = 'changed'
+    account.refresh()
+    assert transport.requests[1].kwargs['headers']['If-None-Match'] == '"v1"'
+    assert account.service == json.loads(helpers.account)['service']
+
+    again = Account.retrieve(7, configuration=configuration)
+    assert again == account
+    assert validator_cache.stats() == {'entries': 1, 'hits': 2, 'misses': 1}
+
+
+@helpers.configured_test
+def test_folder_contents_revalidates():
+    path = 'accounts/7/storage/folders/root/contents'
+    transport = conditional_transport(
+        path, helpers.root_folder_contents.encode())
+    configuration = {'transport': transport,
+                     'validator_cache': ValidatorCache()}
+    folder = Folder(id='root', parent_resource=Account(id=7),
+                    configuration=configuration)
+    first = folder.contents()
+    second = folder.contents()
+    assert transport.requests[1].kwargs['headers']['If-None-Match'] == '"v1"'
+    assert [f.id for f in first] == [f.id for f in second]
+    assert first[0] is not second[0]
+
+
+@helpers.configured_test
+def test_request_key():
+    configuration = config.merge({'api_key': 'a'})
+    key = cache.request_key(configuration, 'accounts/7', {'b': 1, 'a': 2})
+    assert key == cache.request_key(configuration, 'accounts/7',
+                                    {'a': 2, 'b': 1})
+    assert key != cache.request_key(config.merge({'api_key': 'b'}),
+                                    'accounts/7', {'a': 2, 'b': 1})
+
+
+class FakeResponse(object):
+    def __init__(self, headers):
+        self.headers = headers
+
+
+def test_validators_and_eviction():
+    validator_cache = ValidatorCache(max_entries=1)
+    validator_cache.store('a', FakeResponse({}), {'id': 'a'})
+    assert validator_cache.request_headers('a') == {}
+
+    validator_cache.store('a', FakeResponse(
+        {'Last-Modified': 'Wed, 21 Oct 2015 07:28:00 GMT'}), {'id': 'a'})
+    assert validator_cache.request_headers('a') == {
+        'If-Modified-Since': 'Wed, 21 Oct 2015 07:28:00 GMT'}
+
+    validator_cache.store('b', FakeResponse({'ETag': 'x'}), {'id': 'b'})
+    assert validator_cache.revalidated('a') is None
+    assert validator_cache.revalidated('b') == {'id': 'b'}
+
+
+@helpers.configured_test
+def test_response_cache():
+    transport = FakeTransport()
+    transport.add('get', 'accounts', content=helpers.account_list.encode())
+    transport.add('get', 'accounts/7', content=helpers.account.encode())
+    transport.add('patch', 'accounts/7/storage/folders/abc',
+                  json={'id': 'abc', 'name': 'new'})
+    response_cache = ResponseCache()
+    configuration = {'transport': transport, 'response_cache': response_cache}
+
+    first = Account.all(configuration=configuration)
+    second = Account.all(configuration=configuration)
+    assert [a.id for a in first] == [a.id for a in second]
+    account = Account.retrieve(7, configuration=configuration)
+    Account.retrieve(7, configuration=configuration)
+    assert len(transport.requests) == 2
+
+    account.refresh()
+    assert len(transport.requests) == 3
+
+    folder = Folder(id='abc', parent_resource=account,
+                    configuration=configuration)
+    folder.name = 'new'
+    folder.save()
+    # The account list isn't affected by writes within an account.
+    Account.all(configuration=configuration)
+    Account.retrieve(7, configuration=configuration)
+    assert len(transport.requests) == 5
+
+    stats = response_cache.stats()
+    assert stats['hits'] == 3
+    assert stats['invalidations'] == 1
+
+
+
+@helpers.configured_test
+def test_response_cache_copies_nested_data():
+    transport = FakeTransport()
+    transport.add('get', 'accounts', content=helpers.account_list.encode())
+    configuration = {'transport': transport,
+                     'response_cache': ResponseCache()}
+
+    first = Account.all(configuration=configuration, raw=True)
+    first['objects'][0]['service'] = 'changed'
+    del first['objects'][1:]
+    second = Account.all(configuration=configuration, raw=True)
+    assert second == json.loads(helpers.account_list)
+    assert len(transport.requests) == 1
+
+
+def test_response_cache_eviction_and_expiry():
+    response_cache = ResponseCache(max_entries=1)
+    response_cache.set('a', {'id': 'a'})
+    response_cache.set('b', {'id': 'b'})
+    assert response_cache.get('a') is None
+    assert response_cache.get('b') == {'id': 'b'}
+
+    response_cache = ResponseCache(ttl=0)
+    response_cache.set('a', {'id': 'a'})
+    assert response_cache.get('a') is None
+    assert response_cache.stats()['expirations'] == 1
+
+
+@helpers.configured_test
+def test_invalidation_scopes():
+    configuration = config.merge({'response_cache': ResponseCache()})
+    response_cache = configuration['response_cache']
+    paths = ['accounts', 'accounts/7', 'accounts/7/storage/files/abc',
+             'accounts/70/storage/files/abc']
+    for path in paths:
+        response_cache.set(cache.request_key(configuration, path), {})
+
+    cache.invalidate(configuration, 'accounts/7/storage/files/def')
+    assert response_cache.stats()['entries'] == 2
+    cache.invalidate(configuration, 'accounts/70')
+    assert response_cache.stats()['entries'] == 0
+
+
+class SlowTransport(FakeTransport):
+    def send(self, method, url, **kwargs):
+        time.sleep(0.1)
+        return super(SlowTransport, self).send(method, url, **kwargs)
+
+
+@helpers.configured_test
+def test_single_flight():
+    transport = SlowTransport()
+    transport.add('get', 'accounts/7', content=helpers.account.encode())
+    single_flight = SingleFlight()
+    configuration = {'transport': transport, 'single_flight': single_flight}
+    accounts = []
+
+    def retrieve():
+        accounts.append(Account.retrieve(7, configuration=configuration))
+
+    threads = [threading.Thread(target=retrieve) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(transport.requests) == 1
+    assert single_flight.stats() == {'requests': 1, 'shared': 4,
+                                     'in_flight': 0}
+    accounts[0].service = 'changed'
+    assert all(a.service == 'gdrive' for a in accounts[1:])
+
+
+def test_single_flight_shares_errors():
+    single_flight = SingleFlight()
+    started = threading.Event()
+    errors = []
+
+    def fail():
+        started.set()
+        time.sleep(0.1)
+        raise ValueError('failed')
+
+    def follow():
+        started.wait()
+        try:
+            single_flight.do('a', lambda: 'unused')
+        except ValueError as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=follow)
+    thread.start()
+    with pytest.raises(ValueError):
+        single_flight.do('a', fail)
+    thread.join()
+    assert len(errors) == 1
+    assert single_flight.do('a', lambda: {'id': 'a'}) == {'id': 'a'}
+
+
+class Interrupted(BaseException):
+    pass
+
+
+def test_single_flight_shares_base_exceptions():
+    single_flight = SingleFlight()
+    started = threading.Event()
+    errors = []
+
+    def interrupt():
+        started.set()
+        time.sleep(0.1)
+        raise Interrupted()
+
+    def follow():
+        started.wait()
+        try:
+            single_flight.do('a', lambda: 'unused')
+        except Interrupted as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=follow)
+    thread.start()
+    with pytest.raises(Interrupted):
+        single_flight.do('a', interrupt)
+    thread.join()
+    assert len(errors) == 1
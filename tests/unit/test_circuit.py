@@ -0,0 +1,117 @@
+import json
+import time
+
+import pytest
+
+import helpers
+from kloudless import exceptions, http
+from kloudless.circuit import CircuitBreaker, CircuitBreakers
+from kloudless.resources import Account
+from kloudless.transport import FakeTransport
+
+
+def test_breaker_opens_and_closes():
+    breaker = CircuitBreaker(failure_rate=0.5, min_requests=4, window=4,
+                             reset_timeout=0.05)
+    for failed in (False, True, False, True):
+        breaker.release(breaker.acquire(), failed)
+    assert breaker.stats()['state'] == 'open'
+    with pytest.raises(exceptions.CircuitOpenException) as excinfo:
+        breaker.acquire()
+    assert 0 < excinfo.value.retry_after <= 0.05
+
+    time.sleep(0.05)
+    token = breaker.acquire()
+    assert breaker.stats()['state'] == 'half_open'
+    with pytest.raises(exceptions.CircuitOpenException):
+        breaker.acquire()
+    breaker.release(token, False)
+    assert breaker.stats() == {'state': 'closed', 'requests': 0,
+                               'failures': 0, 'rejected': 2}
+
+
+def test_failed_probe_reopens():
+    breaker = CircuitBreaker(min_requests=1, reset_timeout=0.01)
+    breaker.release(breaker.acquire(), True)
+    time.sleep(0.01)
+    breaker.release(breaker.acquire(), True)
+    assert breaker.stats()['state'] == 'open'
+
+
+def test_unknown_outcomes_are_ignored():
+    breaker = CircuitBreaker(min_requests=1)
+    breaker.release(breaker.acquire(), None)
+    assert breaker.stats()['state'] == 'closed'
+
+
+def test_only_probes_close_the_breaker():
+    breaker = CircuitBreaker(min_requests=2, window=2, reset_timeout=0.01,
+                             probes=2)
+    slow = breaker.acquire()
+    breaker.release(breaker.acquire(), True)
+    breaker.release(breaker.acquire(), True)
+    assert breaker.stats()['state'] == 'open'
+
+    time.sleep(0.01)
+    first, second = breaker.acquire(), breaker.acquire()
+    # A request sent while closed that completes while half-open isn't a
+    # probe.
+    breaker.release(slow, False)
+    assert breaker.stats()['state'] == 'half_open'
+    with pytest.raises(exceptions.CircuitOpenException):
+        breaker.acquire()
+
+    breaker.release(first, True)
+    time.sleep(0.01)
+    probes = [breaker.acquire(), breaker.acquire()]
+    # Nor is a probe from a previous half-open state.
+    breaker.release(second, False)
+    with pytest.raises(exceptions.CircuitOpenException):
+        breaker.acquire()
+    for probe in probes:
+        breaker.release(probe, False)
+    assert breaker.stats()['state'] == 'closed'
+
+
+@helpers.configured_test
+def test_requests_fail_fast():
+    transport = FakeTransport()
+    transport.add('get', 'accounts/7', status_code=500)
+    configuration = {
+        'transport': transport,
+        'retry_policy': None,
+        'circuit_breaker': CircuitBreakers(min_requests=2),
+    }
+    for _ in range(2):
+        with pytest.raises(exceptions.ServerException):
+            http.request('get', 'accounts/7', configuration=configuration)
+    with pytest.raises(exceptions.CircuitOpenException):
+        http.request('get', 'accounts/7', configuration=configuration)
+    assert len(transport.requests) == 2
+
+    # Other accounts and requests outside of accounts are unaffected.
+    transport.add('get', 'accounts/8', content=helpers.account)
+    transport.add('get', 'accounts', content=helpers.account_list)
+    http.request('get', 'accounts/8', configuration=configuration)
+    http.request('get', 'accounts', configuration=configuration)
+
+
+@helpers.configured_test
+def test_breakers_per_service():
+    breakers = CircuitBreakers(per='service')
+    Account.create_from_data(json.loads(helpers.account_list),
+                             configuration={'circuit_breaker': breakers})
+    assert breakers.get_breaker('8') is breakers.get_breaker('9')  # box
+    assert breakers.get_breaker('8') is not breakers.get_breaker('16')
+    assert breakers.get_breaker(None) is None
+    assert breakers.get_breaker('unknown') is None
+
+
+def test_breakers_are_bounded():
+    breakers = CircuitBreakers(max_breakers=2, min_requests=1)
+    failing = breakers.get_breaker('1')
+    failing.release(failing.acquire(), True)
+    breakers.get_breaker('2')
+    breakers.get_breaker('3')
+    assert sorted(breakers.stats()) == ['1', '3']
+    assert breakers.get_breaker('1') is failing
@@ -0,0 +1,58 @@
+import pytest
+
+import helpers
+from kloudless import codec, http
+from kloudless.transport import FakeTransport
+
+
+def available_codecs():
+    codecs = []
+    for cls in codec.CODECS:
+        try:
+            codecs.append(cls())
+        except ImportError:
+            pass
+    return codecs
+
+
+@pytest.mark.parametrize('json_codec', available_codecs(),
+                         ids=lambda c: c.name)
+def test_codec(json_codec):
+    data = {u'name': u'☀ été', 'size': 2 ** 40, 'items': [1.5, None]}
+    assert isinstance(json_codec.encode(data), bytes)
+    assert json_codec.loads(json_codec.encode(data)) == data
+    with pytest.raises(ValueError):
+        json_codec.loads(b'{"a": ')
+
+
+def test_orjson_falls_back_for_unsupported_data():
+    pytest.importorskip('orjson')
+    json_codec = codec.get_codec('orjson')
+    data = {'big': 2 ** 70 + 1, 1: 'a'}
+    decoded = json_codec.loads(json_codec.encode(data))
+    assert decoded == {'big': 2 ** 70 + 1, '1': 'a'}
+    assert isinstance(decoded['big'], int)
+    assert json_codec.loads(b'{"name": "bad\\udc80name.txt"}') == {
+        'name': u'bad\udc80name.txt'}
+
+
+def test_get_codec():
+    assert codec.get_codec('json').name == 'json'
+    assert codec.get_codec().name == available_codecs()[0].name
+    with pytest.raises(ValueError):
+        codec.get_codec('unknown')
+
+
+@helpers.configured_test
+def test_request_uses_configured_codec():
+    class UpperCodec(codec.JSONCodec):
+        def encode(self, data):
+            return super(UpperCodec, self).encode(data).upper()
+
+    transport = FakeTransport()
+    transport.add('post', 'accounts/7/storage/folders', json={'id': 'a'})
+    configuration = {'transport': transport, 'json_codec': UpperCodec()}
+    response = http.request('post', 'accounts/7/storage/folders',
+                            configuration=configuration, data={'name': 'a'})
+    assert transport.requests[0].kwargs['data'] == b'{"NAME": "A"}'
+    assert http.response_json(response, configuration) == {'id': 'a'}
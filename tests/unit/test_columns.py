@@ -0,0 +1,45 @@
+import json
+
+import pytest
+
+import helpers
+from kloudless import columns
+from kloudless.columns import MISSING, ColumnarListing
+
+
+def listing():
+    data = json.loads(helpers.root_folder_contents)
+    data['objects'][0]['parent'] = {'id': 'root', 'name': 'All Files'}
+    data['objects'][1]['size'] = None
+    result = ColumnarListing()
+    result.add_page(data)
+    return result
+
+
+def test_columns(monkeypatch):
+    monkeypatch.setattr(columns, '_numpy', lambda: None)
+    arrays = listing().arrays()
+    assert len(arrays['id']) == 18
+    assert arrays['size'][:3] == [4420, MISSING, 0]
+    assert arrays['modified'][0] == 1396395414  # 2014-04-01T23:36:54Z
+    assert arrays['name'][0] == 'dogedog.png'
+    assert arrays['type'][3] == 'folder'
+    assert arrays['parent_id'][:2] == ['root', None]
+    assert arrays['mime_type'][0] is None
+
+    with pytest.raises(ImportError):
+        listing().structured()
+
+
+def test_numpy_columns():
+    numpy = pytest.importorskip('numpy')
+    arrays = listing().arrays()
+    assert arrays['size'].dtype == numpy.int64
+    assert arrays['size'][1] == MISSING
+    assert arrays['size'][arrays['size'] != MISSING].sum() == sum(
+        int(f['size']) for f in json.loads(
+            helpers.root_folder_contents)['objects'][2:]) + 4420
+
+    structured = listing().structured()
+    assert structured['name'][0] == 'dogedog.png'
+    assert structured['modified'][0] == 1396395414
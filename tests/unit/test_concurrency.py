@@ -0,0 +1,105 @@
+import collections
+import json
+import threading
+
+import helpers
+from kloudless import concurrency, http
+from kloudless.concurrency import AdaptiveConcurrencyLimiter, AdaptiveLimit
+from kloudless.resources import Account
+from kloudless.transport import FakeTransport
+
+
+class FakeResponse(object):
+    def __init__(self, status_code=200):
+        self.status_code = status_code
+        self.ok = status_code < 400
+
+
+def test_limit_grows_while_fast():
+    limit = AdaptiveLimit(initial_limit=2, max_limit=4)
+    for _ in range(20):
+        limit.acquire()
+        limit.release(FakeResponse(), latency=0.01)
+    assert limit.stats()['limit'] == 4
+
+
+def test_limit_shrinks_when_throttled():
+    limit = AdaptiveLimit(initial_limit=8)
+    limit.acquire()
+    limit.release(FakeResponse(429))
+    assert limit.stats()['limit'] == 4
+    assert limit.stats()['in_flight'] == 0
+
+
+def test_limit_shrinks_when_latency_rises():
+    limit = AdaptiveLimit(initial_limit=8, smoothing=1)
+    limit.acquire()
+    limit.release(FakeResponse(), latency=0.001)
+    limit.acquire()
+    limit.release(FakeResponse(), latency=0.01)
+    assert limit.stats()['limit'] == 4
+
+
+def test_acquire_blocks_at_limit():
+    limit = AdaptiveLimit(initial_limit=1)
+    limit.acquire()
+    acquired = threading.Event()
+
+    def acquire():
+        limit.acquire()
+        acquired.set()
+
+    thread = threading.Thread(target=acquire)
+    thread.start()
+    assert not acquired.wait(0.05)
+    limit.release(FakeResponse(), latency=0.001)
+    assert acquired.wait(1)
+    thread.join()
+
+
+def test_acquire_times_out():
+    limit = AdaptiveLimit(initial_limit=1)
+    assert limit.acquire(timeout=0.01)
+    assert not limit.acquire(timeout=0.01)
+    assert limit.stats()['in_flight'] == 1
+
+
+@helpers.configured_test
+def test_limits_per_service():
+    limiter = AdaptiveConcurrencyLimiter()
+    Account.create_from_data(json.loads(helpers.account_list),
+                             configuration={'concurrency_limiter': limiter})
+    assert limiter.get_limit('8') is limiter.get_limit('9')  # box
+    assert limiter.get_limit('8') is not limiter.get_limit('16')  # gdrive
+
+    transport = FakeTransport()
+    transport.add('get', 'accounts/16', content=helpers.account)
+    http.request('get', 'accounts/16',
+                 configuration={'transport': transport,
+                                'concurrency_limiter': limiter})
+    stats = limiter.stats()['gdrive']
+    assert stats['in_flight'] == 0
+    assert stats['latency'] is not None
+
+
+def test_account_services_are_bounded(monkeypatch):
+    monkeypatch.setattr(concurrency, '_account_services',
+                        collections.OrderedDict())
+    monkeypatch.setattr(concurrency, '_max_account_services', 2)
+    concurrency.register_account_service(1, 'box')
+    concurrency.register_account_service(2, 'gdrive')
+    assert concurrency.get_account_service(1) == 'box'
+    concurrency.register_account_service(3, 'dropbox')
+    assert concurrency.get_account_service(2) is None
+    assert concurrency.get_account_service('1') == 'box'
+    assert concurrency.get_account_service(3) == 'dropbox'
+
+
+def test_limits_are_bounded():
+    limiter = AdaptiveConcurrencyLimiter(per='account', max_limits=2)
+    busy = limiter.get_limit('1')
+    busy.acquire()
+    limiter.get_limit('2')
+    limiter.get_limit('3')
+    assert sorted(limiter.stats()) == ['1', '3']
+    assert limiter.get_limit('1') is busy
@@ -1,3 +1,5 @@
+import json
+
 import helpers
 
 import kloudless
@@ -16,3 +18,29 @@ def test_configure():
     for key in six.iterkeys(configs):
         assert configs[key] == kloudless.config._configuration[key]
     kloudless.configure(**default_configs)
+
+def test_merge_returns_frozen_configuration():
+    configuration = kloudless.config.merge({'api_key': 'TESTKEY'})
+    assert isinstance(configuration, kloudless.config.Configuration)
+    assert configuration['api_key'] == 'TESTKEY'
+    assert configuration.auth.auth_header == 'APIKey TESTKEY'
+    assert configuration.url_prefix == 'https://api.kloudless.com/v1/'
+    assert kloudless.config.merge(configuration) is configuration
+    try:
+        configuration.url_prefix = 'example.com'
+    except AttributeError:
+        pass
+    else:
+        assert False, "Configuration should be immutable."
+
+def test_configuration_shared_by_resources():
+    configuration = kloudless.config.merge({'api_key': 'TESTKEY'})
+    account = kloudless.Account.create_from_data(
+        json.loads(helpers.account), configuration=configuration)
+    folder = account.folders()
+    contents = kloudless.Folder.create_from_data(
+        json.loads(helpers.root_folder_contents),
+        parent_resource=account, configuration=folder._configuration)
+    assert account._configuration is configuration
+    assert folder._configuration is configuration
+    assert all(x._configuration is configuration for x in contents['objects'])
@@ -0,0 +1,122 @@
+import threading
+import time
+
+import pytest
+
+import helpers
+import kloudless
+from kloudless import deadlines, exceptions, http
+from kloudless.cache import SingleFlight
+from kloudless.concurrency import AdaptiveConcurrencyLimiter
+from kloudless.retry import RetryPolicy
+from kloudless.throttling import RateLimiter
+from kloudless.transport import FakeTransport
+
+
+def test_timeout_is_capped():
+    deadline = deadlines.Deadline(5)
+    assert deadline.timeout((1, 60)) == (1, pytest.approx(5, abs=0.1))
+    assert deadline.timeout(None) == pytest.approx(5, abs=0.1)
+    assert deadline.timeout(2) == 2
+
+    with pytest.raises(exceptions.DeadlineExceededException):
+        deadlines.Deadline(0).timeout(1)
+    with pytest.raises(exceptions.DeadlineExceededException):
+        deadline.check(10)
+
+
+def test_nested_deadlines():
+    assert deadlines.current() is None
+    with kloudless.deadline(1) as outer:
+        with kloudless.deadline(10) as inner:
+            assert inner is outer
+        with kloudless.deadline(0.5) as inner:
+            assert deadlines.current() is inner
+        assert deadlines.current() is outer
+    assert deadlines.current() is None
+
+
+@helpers.configured_test
+def test_timeout_passed_to_transport():
+    transport = FakeTransport()
+    transport.add('get', 'accounts/7', content=helpers.account)
+    configuration = {'transport': transport}
+    http.request('get', 'accounts/7', configuration=configuration)
+    assert transport.requests[-1].kwargs['timeout'] == (10, 60)
+
+    with kloudless.deadline(5):
+        http.request('get', 'accounts/7', configuration=configuration)
+    connect, read = transport.requests[-1].kwargs['timeout']
+    assert connect <= 5
+    assert read <= 5
+
+
+@helpers.configured_test
+def test_deadline_stops_retries():
+    transport = FakeTransport()
+    transport.add('get', 'accounts/7', status_code=503)
+    configuration = {
+        'transport': transport,
+        'retry_policy': RetryPolicy(base_delay=1),
+        'deadline': 0.5,
+    }
+    start = time.time()
+    with pytest.raises(exceptions.DeadlineExceededException):
+        http.request('get', 'accounts/7', configuration=configuration)
+    assert time.time() - start < 0.5
+    assert len(transport.requests) == 1
+
+
+@helpers.configured_test
+def test_deadline_bounds_waiting_for_the_concurrency_limit():
+    transport = FakeTransport()
+    transport.add('get', 'accounts/7', content=helpers.account)
+    limiter = AdaptiveConcurrencyLimiter(per='account', initial_limit=1)
+    limit = limiter.get_limit('7')
+    limit.acquire()
+    configuration = {'transport': transport, 'concurrency_limiter': limiter,
+                     'deadline': 0.1}
+    start = time.time()
+    with pytest.raises(exceptions.DeadlineExceededException):
+        http.request('get', 'accounts/7', configuration=configuration)
+    assert time.time() - start < 0.5
+    assert not transport.requests
+    assert limit.stats()['in_flight'] == 1
+
+
+@helpers.configured_test
+def test_deadline_checked_before_rate_limiting():
+    transport = FakeTransport()
+    transport.add('get', 'accounts/7', content=helpers.account)
+    rate_limiter = RateLimiter(rate=1, burst=1)
+    configuration = {'transport': transport, 'rate_limiter': rate_limiter,
+                     'deadline': 0.5}
+    http.request('get', 'accounts/7', configuration=configuration)
+    with pytest.raises(exceptions.DeadlineExceededException):
+        http.request('get', 'accounts/7', configuration=configuration)
+    # The request that wasn't sent didn't use up the next token.
+    time.sleep(1)
+    http.request('get', 'accounts/7', configuration=configuration)
+    assert len(transport.requests) == 2
+
+
+def test_deadline_bounds_waiting_for_a_shared_request():
+    single_flight = SingleFlight()
+    started = threading.Event()
+    finish = threading.Event()
+
+    def lead():
+        single_flight.do('a', lambda: started.set() or finish.wait())
+
+    thread = threading.Thread(target=lead)
+    thread.start()
+    started.wait()
+    start = time.time()
+    try:
+        with pytest.raises(exceptions.DeadlineExceededException):
+            single_flight.do('a', lambda: 'unused',
+                             deadline=deadlines.Deadline(0.1))
+        assert time.time() - start < 0.5
+    finally:
+        finish.set()
+        thread.join()
@@ -0,0 +1,110 @@
+import threading
+import time
+
+import pytest
+
+import helpers
+from kloudless.hedging import HedgingPolicy
+from kloudless.resources import Account
+from kloudless.transport import FakeTransport
+
+
+class FakeResponse(object):
+    def __init__(self, name):
+        self.name = name
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def primed_policy(endpoint='endpoint', latency=0.01, count=5, **kwargs):
+    kwargs.setdefault('min_samples', 5)
+    kwargs.setdefault('max_ratio', 1)
+    policy = HedgingPolicy(**kwargs)
+    for _ in range(count):
+        policy.observe(endpoint, latency)
+    return policy
+
+
+def slow_then_fast(responses):
+    calls = []
+    lock = threading.Lock()
+
+    def send():
+        with lock:
+            calls.append(None)
+            first = len(calls) == 1
+        if first:
+            time.sleep(0.3)
+        response = FakeResponse('slow' if first else 'fast')
+        responses.append(response)
+        return response
+    return send
+
+
+def test_slow_request_is_hedged():
+    policy = primed_policy()
+    responses = []
+    start = time.time()
+    response = policy.send(slow_then_fast(responses), 'endpoint')
+    assert time.time() - start < 0.2
+    assert response.name == 'fast'
+    assert policy.stats() == {'requests': 1, 'hedged': 1, 'hedge_wins': 1}
+
+    time.sleep(0.35)
+    assert [r.closed for r in responses] == [False, True]
+
+
+def test_not_hedged_without_samples():
+    policy = HedgingPolicy()
+    assert policy.hedge_delay('endpoint') is None
+    response = policy.send(lambda: FakeResponse('a'), 'endpoint')
+    assert response.name == 'a'
+    assert policy.stats()['hedged'] == 0
+
+
+def test_hedge_delay():
+    policy = primed_policy(latency=0.2)
+    assert policy.hedge_delay('endpoint') == 0.2
+    assert policy.hedge_delay('other') is None
+    assert primed_policy(latency=0.001).hedge_delay('endpoint') == 0.05
+
+
+def test_hedges_are_limited_to_a_ratio_of_requests():
+    policy = primed_policy(max_ratio=0.5, count=40)
+    for _ in range(4):
+        policy.send(slow_then_fast([]), 'endpoint')
+    assert policy.stats()['hedged'] == 2
+
+
+def test_errors_are_raised_once_all_attempts_fail():
+    policy = primed_policy()
+
+    def send():
+        time.sleep(0.1)
+        raise ValueError()
+
+    with pytest.raises(ValueError):
+        policy.send(send, 'endpoint')
+
+
+class SlowFirstTransport(FakeTransport):
+    def send(self, method, url, **kwargs):
+        if not self.requests:
+            self.requests.append(None)
+            time.sleep(0.3)
+        return super(SlowFirstTransport, self).send(method, url, **kwargs)
+
+
+@helpers.configured_test
+def test_retrieve_is_hedged():
+    transport = SlowFirstTransport()
+    transport.add('get', 'accounts/7', content=helpers.account)
+    policy = primed_policy('accounts/{id}')
+    start = time.time()
+    account = Account.retrieve(7, configuration={'transport': transport,
+                                                 'hedging': policy})
+    assert time.time() - start < 0.2
+    assert account.service == 'gdrive'
+    assert policy.stats()['hedge_wins'] == 1
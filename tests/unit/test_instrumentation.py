@@ -0,0 +1,97 @@
+import pytest
+
+import helpers
+from kloudless import config, exceptions, http
+from kloudless.instrumentation import (Histogram, MetricsCollector,
+                                       endpoint_template)
+from kloudless.retry import RetryPolicy
+from kloudless.transport import FakeTransport
+
+
+def test_endpoint_template():
+    assert endpoint_template('accounts') == 'accounts'
+    assert (endpoint_template('accounts/7/storage/files/abc/contents') ==
+            'accounts/{id}/storage/files/{id}/contents')
+    assert (endpoint_template('accounts/7/storage/files/upload_url') ==
+            'accounts/{id}/storage/files/upload_url')
+    assert (endpoint_template('accounts/7/team/users/1/memberships') ==
+            'accounts/{id}/team/users/{id}/memberships')
+    assert (endpoint_template('applications/1/apikeys/abc') ==
+            'applications/{id}/apikeys/{id}')
+
+
+def test_histogram():
+    histogram = Histogram(bounds=(1, 10, 100))
+    for value in (0.5, 5, 5, 50, 500):
+        histogram.observe(value)
+    assert histogram.export()['counts'] == [1, 2, 1, 1]
+    assert histogram.export()['sum'] == 560.5
+    assert histogram.percentile(50) == 10
+    assert histogram.percentile(100) == float('inf')
+    assert Histogram().percentile(50) is None
+
+
+@helpers.configured_test
+def test_hooks_receive_events():
+    events = []
+    transport = FakeTransport()
+    transport.add('get', 'accounts/7', status_code=503)
+    transport.add('get', 'accounts/7', content=helpers.account)
+    transport.add('post', 'accounts/7/storage/folders', status_code=400)
+    configuration = {
+        'transport': transport,
+        'retry_policy': RetryPolicy(base_delay=0.001),
+        'hooks': [events.append],
+    }
+
+    http.request('get', 'accounts/7', configuration=configuration)
+    with pytest.raises(exceptions.APIException):
+        http.request('post', 'accounts/7/storage/folders',
+                     configuration=configuration, data={'name': 'a'})
+
+    event = events[0]
+    assert event.method == 'GET'
+    assert event.endpoint == 'accounts/{id}'
+    assert event.status == 200
+    assert event.error is None
+    assert event.retries == 1
+    assert event.backoff_time > 0
+    assert event.bytes_sent == 0
+    assert event.bytes_received == len(helpers.account)
+    assert event.latency >= event.backoff_time
+
+    event = events[1]
+    assert event.status == 400
+    assert isinstance(event.error, exceptions.APIException)
+    assert event.bytes_sent == len(
+        config.configure()['json_codec'].encode({'name': 'a'}))
+
+
+@helpers.configured_test
+def test_metrics_collector():
+    metrics = MetricsCollector()
+    transport = FakeTransport()
+    transport.add('get', 'accounts/7', content=helpers.account)
+    transport.add('get', 'accounts/8', content=helpers.account)
+    configuration = {'transport': transport, 'hooks': [metrics]}
+    http.request('get', 'accounts/7', configuration=configuration)
+    http.request('get', 'accounts/8', configuration=configuration)
+
+    exported = metrics.export()[('GET', 'accounts/{id}')]
+    assert exported['latency']['count'] == 2
+    assert exported['bytes_received']['sum'] == 2 * len(helpers.account)
+    assert exported['statuses'] == {200: 2}
+    assert exported['retries'] == 0
+
+
+@helpers.configured_test
+def test_failing_hook_does_not_fail_request():
+    def hook(event):
+        raise ValueError()
+
+    transport = FakeTransport()
+    transport.add('get', 'accounts/7', content=helpers.account)
+    response = http.request('get', 'accounts/7',
+                            configuration={'transport': transport,
+                                           'hooks': [hook]})
+    assert response.status_code == 200
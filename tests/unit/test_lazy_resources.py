@@ -0,0 +1,82 @@
+import datetime
+import json
+
+import helpers
+from kloudless.resources import Account, File, Folder
+from kloudless.transport import FakeTransport
+
+file_with_parent = dict(json.loads(helpers.file_data), parent={
+    'id': 'root', 'name': 'All Files', 'type': 'folder'})
+
+
+def lazy_file():
+    return File.create_from_data(
+        file_with_parent, parent_resource=Account(id=7),
+        configuration={'lazy_resources': True})
+
+
+@helpers.configured_test
+def test_values_converted_on_access():
+    f = lazy_file()
+    assert dict.__getitem__(f, 'created') == file_with_parent['created']
+    assert isinstance(dict.__getitem__(f, 'parent'), dict)
+    assert not f._has_changes()
+
+    assert isinstance(f.created, datetime.datetime)
+    assert isinstance(f.parent, Folder)
+    assert f.parent.name == 'All Files'
+    assert f.parent is f['parent']
+    assert set(f._lazy_keys) == {'modified'}
+
+
+@helpers.configured_test
+def test_same_as_eager():
+    eager = File.create_from_data(file_with_parent,
+                                  parent_resource=Account(id=7))
+    f = lazy_file()
+    assert f == eager
+    assert f.get('modified') == eager['modified']
+    assert dict(f.items()) == dict(eager.items())
+    assert f.serialize(lazy_file()) == file_with_parent
+
+
+
+@helpers.configured_test
+def test_copies_converted():
+    eager = File.create_from_data(file_with_parent,
+                                  parent_resource=Account(id=7))
+    copied = dict(lazy_file())
+    assert copied == dict(eager)
+    assert isinstance(copied['parent'], Folder)
+    copied = lazy_file().copy()
+    assert copied == eager.copy()
+    assert isinstance(copied['created'], datetime.datetime)
+    assert repr(lazy_file()) == repr(eager)
+
+
+@helpers.configured_test
+def test_only_changed_data_saved():
+    f = lazy_file()
+    assert f.created and f.parent.name
+    f.name = 'renamed.burp'
+    assert f._changed_data() == {'name': 'renamed.burp'}
+
+    f.parent.name = 'Renamed'
+    assert f._changed_data()['parent']['name'] == 'Renamed'
+
+
+@helpers.configured_test
+def test_listing():
+    transport = FakeTransport()
+    transport.add('get', 'accounts/7/storage/folders/root/contents',
+                  content=helpers.root_folder_contents)
+    folder = Folder(id='root', parent_resource=Account(id=7),
+                    configuration={'transport': transport,
+                                   'lazy_resources': True})
+    contents = folder.contents()
+    assert [f.name for f in contents][:2] == ['dogedog.png'] * 2
+    assert 'created' in contents[0]._lazy_keys
+    assert 'name' not in contents[0]._lazy_keys
+    # Only values that need converting are tracked, in a shared tuple.
+    assert 'size' not in contents[1]._lazy_keys
+    assert contents[2]._lazy_keys is contents[3]._lazy_keys
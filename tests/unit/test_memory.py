@@ -0,0 +1,61 @@
+import gc
+import json
+
+import pytest
+
+import helpers
+from kloudless import config
+from kloudless.resources import Account, Folder
+
+tracemalloc = pytest.importorskip('tracemalloc')
+
+
+def traced_size(func):
+    """
+    Returns the bytes still allocated by the result of `func()`.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = func()
+        gc.collect()
+        return tracemalloc.get_traced_memory()[0], result
+    finally:
+        tracemalloc.stop()
+
+
+def contents_data(count=500):
+    data = json.loads(helpers.root_folder_contents)
+    item = data['objects'][0]
+    data['objects'] = [dict(item, id=str(i)) for i in range(count)]
+    return data
+
+
+@helpers.configured_test
+def test_listing_shares_configuration():
+    account = Account(id=7)
+    configuration = {'api_key': 'other'}
+    files = Folder.create_from_data(contents_data()['objects'],
+                                    parent_resource=account,
+                                    configuration=configuration)
+    assert len(set(id(f._configuration) for f in files)) == 1
+    assert all(f._parent_resource is account for f in files)
+
+
+@helpers.configured_test
+def test_per_object_overhead():
+    account = Account(id=7)
+    merged = config.merge({'api_key': 'other'})
+    data = contents_data()['objects']
+
+    def create(configuration):
+        return Folder.create_from_data(data, parent_resource=account,
+                                       configuration=configuration)
+
+    # Instances don't hold a Configuration or any other state of their own.
+    shared, _ = traced_size(lambda: create(merged))
+    separate, _ = traced_size(lambda: create({'api_key': 'other'}))
+    assert separate < shared * 1.05
+
+    files = create(merged)
+    assert all('_removed_keys' not in vars(f) for f in files)
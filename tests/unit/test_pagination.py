@@ -0,0 +1,127 @@
+import threading
+import time
+
+import pytest
+
+import helpers
+import kloudless
+from kloudless import pagination
+from kloudless.resources import Account, Events
+from kloudless.transport import FakeTransport
+
+
+def test_next_params():
+    assert pagination.next_params({'next_page': 2}, {'a': 1}) == {
+        'a': 1, 'page': 2}
+    assert pagination.next_params({'cursor': 5, 'remaining': 3}, {}) == {
+        'cursor': 5}
+    assert pagination.next_params({'cursor': 5, 'remaining': 0}, {}) is None
+    assert pagination.next_params({'next_page': None, 'page': 3}, {}) is None
+    assert pagination.next_params({'next_page': 2}, {'page': 2}) is None
+
+
+def test_prefetch_is_bounded():
+    fetched = []
+
+    def pages():
+        for i in range(10):
+            fetched.append(i)
+            yield i
+
+    prefetched = pagination.prefetch(pages(), depth=2)
+    assert next(prefetched) == 0
+    time.sleep(0.1)
+    # One page is used, two wait in the queue and one waits to be queued.
+    assert len(fetched) == 4
+    assert list(prefetched) == list(range(1, 10))
+
+
+def test_prefetch_raises_errors_in_order():
+    def pages():
+        yield 1
+        raise ValueError()
+
+    prefetched = pagination.prefetch(pages())
+    assert next(prefetched) == 1
+    with pytest.raises(ValueError):
+        next(prefetched)
+
+
+def test_prefetch_stops_when_closed():
+    threads = threading.active_count()
+    prefetched = pagination.prefetch(iter(range(100)))
+    next(prefetched)
+    prefetched.close()
+    time.sleep(0.3)
+    assert threading.active_count() <= threads
+
+
+class Interrupted(BaseException):
+    pass
+
+
+def test_prefetch_raises_base_exceptions():
+    def pages():
+        yield 1
+        raise Interrupted()
+
+    prefetched = pagination.prefetch(pages())
+    assert next(prefetched) == 1
+    with pytest.raises(Interrupted):
+        next(prefetched)
+
+
+@helpers.configured_test
+def test_iter_all_follows_cursor():
+    transport = FakeTransport()
+    path = 'accounts/7/events'
+    transport.add('get', path, json={'objects': [{'id': '1'}, {'id': '2'}],
+                                     'cursor': 'b', 'remaining': 1})
+    transport.add('get', path, json={'objects': [{'id': '3'}],
+                                     'cursor': 'c', 'remaining': 0})
+    events = Events.iter_all(parent_resource=Account(id=7), cursor='a',
+                             configuration={'transport': transport})
+    assert [e.id for e in events] == ['1', '2', '3']
+    assert [r.kwargs['params'] for r in transport.requests] == [
+        {'cursor': 'a'}, {'cursor': 'b'}]
+
+
+@helpers.configured_test
+def test_iter_contents_follows_pages():
+    transport = FakeTransport()
+    path = 'accounts/7/storage/folders/root/contents'
+    transport.add('get', path, json={'objects': [{'id': '1'}],
+                                     'page': 1, 'next_page': 2})
+    transport.add('get', path, json={'objects': [{'id': '2'}],
+                                     'page': 2, 'next_page': None})
+    folder = Account(id=7, configuration={'transport': transport}).folders()
+    ids = [f.id for f in folder.iter_contents(prefetch=0, page_size=1)]
+    assert ids == ['1', '2']
+    assert transport.requests[1].kwargs['params'] == {'page_size': 1,
+                                                      'page': 2}
+
+
+@helpers.configured_test
+def test_iter_all_deadline_set_when_called():
+    for prefetch in (0, 1):
+        transport = FakeTransport()
+        path = 'accounts/7/events'
+        transport.add('get', path, json={'objects': [{'id': '1'}],
+                                         'cursor': 'b', 'remaining': 1})
+        transport.add('get', path, json={'objects': [{'id': '2'}],
+                                         'cursor': 'c', 'remaining': 0})
+        with kloudless.deadline(5):
+            events = Events.iter_all(parent_resource=Account(id=7),
+                                     cursor='a', prefetch=prefetch,
+                                     configuration={'transport': transport})
+        # The pages are requested after the block, within its deadline.
+        assert [e.id for e in events] == ['1', '2']
+        assert [max(r.kwargs['timeout']) <= 5
+                for r in transport.requests] == [True, True]
+
+
+def test_iter_all_rejects_raw():
+    with pytest.raises(TypeError):
+        Events.iter_all(parent_resource=Account(id=7), raw=True)
+    with pytest.raises(TypeError):
+        Account(id=7).folders().iter_contents(raw=True)
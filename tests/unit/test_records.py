@@ -0,0 +1,57 @@
+import json
+
+import pytest
+
+import helpers
+from kloudless.records import Record, RecordFactory
+from kloudless.resources import Account, File, Folder
+from kloudless.transport import FakeTransport
+
+
+def test_record():
+    factory = RecordFactory(File, parent_resource=Account(id=7))
+    data = json.loads(helpers.file_data)
+    record = factory.create(data)
+    assert record.name == record['name'] == 'derp.burp'
+    assert record.get('missing') is None
+    assert record.created == data['created']
+    assert sorted(record.keys()) == sorted(data)
+    assert record.to_dict() == data and record == factory.create(data)
+
+    with pytest.raises(AttributeError):
+        record.missing
+    with pytest.raises(KeyError):
+        record['missing']
+    with pytest.raises(AttributeError):
+        record.name = 'renamed'
+
+    resource = record.to_resource()
+    assert isinstance(resource, File)
+    assert resource.detail_path() == 'accounts/7/storage/files/%s' % data['id']
+
+
+def test_records_share_schema():
+    factory = RecordFactory(Folder)
+    contents = json.loads(helpers.root_folder_contents)['objects']
+    first, second = [factory.create(d) for d in contents[:2]]
+    assert first._schema is second._schema
+
+
+@helpers.configured_test
+def test_compact_contents():
+    transport = FakeTransport()
+    transport.add('get', 'accounts/7/storage/folders/root/contents',
+                  content=helpers.root_folder_contents)
+    folder = Folder(id='root', parent_resource=Account(id=7),
+                    configuration={'transport': transport,
+                                   'compact_lists': True})
+    contents = folder.contents()
+    assert contents.count == 18
+    assert all(isinstance(r, Record) for r in contents)
+    assert isinstance(contents[0].to_resource(), File)
+    assert isinstance(contents[3].to_resource(), Folder)
+
+    transport.add('get', 'accounts/7/storage/folders/root/contents',
+                  content=helpers.root_folder_contents)
+    streamed = list(folder.stream_contents())
+    assert streamed == list(contents)
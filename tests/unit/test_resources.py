@@ -1,12 +1,17 @@
+import copy
 import json
+import pickle
 import requests
 
+import pytest
 from mock import MagicMock, patch, call
 from requests.models import Response
 
 import helpers
 import kloudless
+from kloudless import codec
 from kloudless.resources import Account, Folder, File
+from kloudless.transport import FakeTransport
 
 @helpers.configured_test
 def test_account_list():
@@ -253,3 +258,110 @@ def test_file_copy():
                                configuration=file_obj._configuration),
                          ]
         mock_req.assert_has_calls(expected_calls)
+
+@helpers.configured_test
+def test_changed_data():
+    account = Account.create_from_data(json.loads(helpers.account))
+    file_data = dict(json.loads(helpers.file_data),
+                     parent={'id': 'root', 'name': 'All Files'})
+    file_obj = File.create_from_data(file_data, parent_resource=account)
+    assert file_obj._changed_data() == {}
+
+    file_obj.name = file_data['name']
+    file_obj['size'] = '0'
+    assert file_obj._changed_data() == {'size': '0'}
+
+    file_obj.parent.name = 'Renamed'
+    assert file_obj._changed_data()['parent'] == {'id': 'root',
+                                                   'name': 'Renamed'}
+
+
+@helpers.configured_test
+def test_changed_data_lists_modified_in_place():
+    account = Account.create_from_data(json.loads(helpers.account))
+    file_data = dict(json.loads(helpers.file_data),
+                     tags=['a', ['b']], parent={'id': 'root'})
+    file_obj = File.create_from_data(file_data, parent_resource=account)
+    file_obj.tags.append('c')
+    assert file_obj._changed_data() == {'tags': ['a', ['b'], 'c']}
+
+    file_obj.populate(file_data)
+    file_obj.tags[1].append('c')
+    assert file_obj._changed_data() == {'tags': ['a', ['b', 'c']]}
+
+    for configuration in ({}, {'lazy_resources': True}):
+        file_data = dict(file_data, tags=['a'])
+        file_obj = File.create_from_data(file_data, parent_resource=account,
+                                         configuration=configuration)
+        file_obj.parent['ancestors'] = []
+        file_obj.parent['ancestors'].append('root')
+        file_obj.tags = ['a']
+        file_obj.modified = file_obj.modified
+        assert file_obj._changed_data() == {
+            'parent': {'id': 'root', 'ancestors': ['root']}}
+
+@helpers.configured_test
+def test_raw_responses():
+    account = Account.create_from_data(json.loads(helpers.account))
+    with patch('kloudless.resources.request') as mock_req:
+        resp = Response()
+        resp._content = helpers.root_folder_contents.encode('utf-8')
+        resp.encoding = 'utf-8'
+        mock_req.return_value = resp
+        contents = account.folders().contents(raw=True)
+        assert contents == json.loads(helpers.root_folder_contents)
+
+        resp._content = helpers.account_list.encode('utf-8')
+        accounts = Account.all(raw=True, active=True)
+        assert accounts == json.loads(helpers.account_list)
+        mock_req.assert_called_with(requests.get, 'accounts',
+                                    configuration=None,
+                                    params={'active': True})
+
+        resp._content = helpers.file_data.encode('utf-8')
+        file_data = account.files.retrieve('fMEI3', raw=True)
+        assert file_data == json.loads(helpers.file_data)
+
+
+@pytest.mark.parametrize('codec_class', codec.CODECS)
+@helpers.configured_test
+def test_file_upload_non_ascii_name(codec_class):
+    try:
+        json_codec = codec_class()
+    except ImportError:
+        pytest.skip('%s is not installed.' % codec_class.name)
+    account = Account.create_from_data(json.loads(helpers.account))
+    transport = FakeTransport()
+    transport.add('post', 'accounts/7/storage/files',
+                  content=helpers.file_data)
+    File.create(parent_resource=account, file_name=u'\u2600 \xe9t\xe9.txt',
+                parent_id='root', file_data=helpers.file_contents,
+                configuration={'transport': transport,
+                               'json_codec': json_codec})
+    metadata = transport.requests[0].kwargs['headers']['X-Kloudless-Metadata']
+    assert metadata == '{"name": "\\u2600 \\u00e9t\\u00e9.txt", ' \
+                       '"parent_id": "root"}'
+    metadata.encode('ascii')
+
+
+@helpers.configured_test
+def test_copy_and_pickle():
+    account = Account.create_from_data(json.loads(helpers.account))
+    for configuration in ({}, {'lazy_resources': True}):
+        file_obj = File.create_from_data(
+            json.loads(helpers.file_data), parent_resource=account,
+            configuration=configuration)
+        copied = copy.deepcopy(file_obj)
+        pickled = pickle.loads(pickle.dumps(file_obj))
+        for other in (copied, pickled):
+            assert other == file_obj
+            assert other._changed_data() == {}
+            assert other._parent_resource.id == account.id
+        assert copied._configuration is file_obj._configuration
+        assert pickled._configuration['retry_policy'].stats() == \
+            file_obj._configuration['retry_policy'].stats()
+        assert pickled._configuration['throttle_retry_strategy'].counter == 0
+
+        copied.name = 'renamed.burp'
+        assert copied._changed_data() == {'name': 'renamed.burp'}
+        assert file_obj._changed_data() == {}
@@ -0,0 +1,171 @@
+import io
+
+import pytest
+import requests
+
+import helpers
+from kloudless import exceptions, http
+from kloudless.retry import RetryBudget, RetryPolicy
+from kloudless.transport import FakeTransport, Transport
+
+
+class FailingTransport(Transport):
+    """
+    Raises `errors` in order before returning the responses of `transport`.
+    """
+
+    def __init__(self, errors, transport):
+        self.errors = list(errors)
+        self.transport = transport
+        self.calls = 0
+
+    def send(self, method, url, **kwargs):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return self.transport.send(method, url, **kwargs)
+
+
+def _configuration(transport, **policy_kwargs):
+    policy_kwargs.setdefault('base_delay', 0.001)
+    policy_kwargs.setdefault('max_delay', 0.01)
+    return {'transport': transport,
+            'retry_policy': RetryPolicy(**policy_kwargs)}
+
+
+@helpers.configured_test
+def test_server_error_retried_for_get():
+    transport = FakeTransport()
+    transport.add('get', 'accounts/7', status_code=503)
+    transport.add('get', 'accounts/7', content=helpers.account)
+    configuration = _configuration(transport)
+    response = http.request('get', 'accounts/7', configuration=configuration)
+    assert response.status_code == 200
+    assert len(transport.requests) == 2
+
+    stats = configuration['retry_policy'].stats()
+    assert stats['requests'] == 1
+    assert stats['attempts'] == 2
+    assert stats['retries'] == 1
+    assert stats['wait_time'] > 0
+
+
+@helpers.configured_test
+def test_server_error_not_retried_for_post():
+    transport = FakeTransport()
+    transport.add('post', 'accounts/7/storage/folders', status_code=503)
+    with pytest.raises(exceptions.ServerException):
+        http.request('post', 'accounts/7/storage/folders',
+                     configuration=_configuration(transport),
+                     data={'name': 'test'})
+    assert len(transport.requests) == 1
+
+
+@helpers.configured_test
+def test_max_retries():
+    transport = FakeTransport()
+    transport.add('get', 'accounts/7', status_code=502)
+    with pytest.raises(exceptions.ServerException):
+        http.request('get', 'accounts/7',
+                     configuration=_configuration(transport, max_retries=2))
+    assert len(transport.requests) == 3
+
+
+@helpers.configured_test
+def test_connection_errors():
+    fake = FakeTransport()
+    fake.add('get', 'accounts/7', content=helpers.account)
+    fake.add('post', 'accounts', content=helpers.account)
+
+    transport = FailingTransport([requests.exceptions.ReadTimeout()], fake)
+    response = http.request('get', 'accounts/7',
+                            configuration=_configuration(transport))
+    assert response.status_code == 200
+    assert transport.calls == 2
+
+    # The server may have processed the POST before the connection failed.
+    transport = FailingTransport([requests.exceptions.ReadTimeout()], fake)
+    with pytest.raises(requests.exceptions.ReadTimeout):
+        http.request('post', 'accounts',
+                     configuration=_configuration(transport))
+    assert transport.calls == 1
+
+    # The POST never reached the server.
+    transport = FailingTransport([requests.exceptions.ConnectTimeout()], fake)
+    response = http.request('post', 'accounts',
+                            configuration=_configuration(transport))
+    assert response.status_code == 200
+
+
+@helpers.configured_test
+def test_retry_budget():
+    transport = FakeTransport()
+    transport.add('get', 'accounts/7', status_code=503)
+    budget = RetryBudget(ratio=0, min_retries=1)
+    configuration = _configuration(transport, budget=budget)
+    with pytest.raises(exceptions.ServerException):
+        http.request('get', 'accounts/7', configuration=configuration)
+    assert len(transport.requests) == 2
+    assert configuration['retry_policy'].stats()['budget_exhausted'] == 1
+
+
+@helpers.configured_test
+def test_rate_limit_retry_jitter():
+    transport = FakeTransport()
+    transport.add('get', 'accounts/7', status_code=429,
+                  headers={'Retry-After': '0.01'})
+    transport.add('get', 'accounts/7', content=helpers.account)
+    configuration = _configuration(transport, throttle_jitter=1)
+    http.request('get', 'accounts/7', configuration=configuration)
+    wait_time = configuration['retry_policy'].stats()['wait_time']
+    assert 0.01 <= wait_time <= 0.02
+
+
+def test_first_retry_is_jittered():
+    policy = RetryPolicy(base_delay=1, max_delay=10)
+    delays = set(policy._backoff(None) for _ in range(20))
+    assert len(delays) > 1
+    assert all(1 <= d <= 3 for d in delays)
+    assert RetryPolicy(base_delay=1, max_delay=2)._backoff(None) <= 2
+
+
+class ReadingTransport(FakeTransport):
+    """
+    Reads file-like request bodies as a transport sending them would.
+    """
+
+    def send(self, method, url, **kwargs):
+        response = super(ReadingTransport, self).send(method, url, **kwargs)
+        self.requests[-1].body = kwargs['data'].read()
+        return response
+
+
+class Unseekable(object):
+    def __init__(self, content):
+        self.content = content
+
+    def read(self, *args):
+        content, self.content = self.content, b''
+        return content
+
+
+@helpers.configured_test
+def test_file_bodies_rewound_or_not_retried():
+    path = 'accounts/7/storage/files/1'
+    headers = {'Content-Type': 'application/octet-stream'}
+    transport = ReadingTransport()
+    transport.add('put', path, status_code=503)
+    transport.add('put', path, content=helpers.file_data)
+    body = io.BytesIO(b'xxcontents')
+    body.read(2)
+    http.request('put', path, configuration=_configuration(transport),
+                 data=body, headers=dict(headers))
+    assert [r.body for r in transport.requests] == [b'contents'] * 2
+
+    transport = ReadingTransport()
+    transport.add('put', path, status_code=503)
+    transport.add('put', path, content=helpers.file_data)
+    with pytest.raises(exceptions.ServerException):
+        http.request('put', path, configuration=_configuration(transport),
+                     data=Unseekable(b'contents'), headers=dict(headers))
+    assert len(transport.requests) == 1
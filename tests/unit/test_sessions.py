@@ -0,0 +1,92 @@
+import pytest
+import requests
+
+from mock import patch
+from requests.models import Response
+
+import helpers
+import kloudless
+from kloudless import http
+from kloudless.sessions import SessionPool
+
+try:
+    from requests.packages.urllib3.exceptions import ProtocolError
+except ImportError:
+    ProtocolError = Exception
+
+
+def _response(status_code=200, content=b'{}'):
+    resp = Response()
+    resp.status_code = status_code
+    resp._content = content
+    resp.encoding = 'utf-8'
+    return resp
+
+
+def _stale_error():
+    return requests.exceptions.ConnectionError(
+        ProtocolError('Connection aborted.', Exception('RemoteDisconnected')))
+
+
+def test_session_reused_per_credential():
+    pool = SessionPool()
+    key1 = http.APIKeyAuth('KEY1')
+    key2 = http.APIKeyAuth('KEY2')
+    url = 'https://api.kloudless.com/v1/accounts'
+    assert pool.get_session(url, key1) is pool.get_session(url, key1)
+    assert pool.get_session(url, key1) is not pool.get_session(url, key2)
+    assert pool.stats()['sessions'] == 2
+
+
+def test_stale_connection_retried_once():
+    pool = SessionPool()
+    with patch.object(requests.Session, 'request') as mock_req:
+        mock_req.side_effect = [_stale_error(), _response()]
+        resp = pool.send('get', 'https://api.kloudless.com/v1/accounts')
+        assert resp.status_code == 200
+        assert mock_req.call_count == 2
+    stats = pool.stats()
+    assert stats['requests'] == 1
+    assert stats['stale_retries'] == 1
+
+
+def test_stale_connection_not_retried_twice():
+    pool = SessionPool()
+    with patch.object(requests.Session, 'request') as mock_req:
+        mock_req.side_effect = [_stale_error(), _stale_error()]
+        with pytest.raises(requests.exceptions.ConnectionError):
+            pool.send('get', 'https://api.kloudless.com/v1/accounts')
+        assert mock_req.call_count == 2
+
+
+def test_stale_connection_post_not_retried():
+    pool = SessionPool()
+    with patch.object(requests.Session, 'request') as mock_req:
+        mock_req.side_effect = [_stale_error(), _response()]
+        with pytest.raises(requests.exceptions.ConnectionError):
+            pool.send('post', 'https://api.kloudless.com/v1/accounts/7/'
+                      'storage/folders', data=b'{"name": "a"}')
+        assert mock_req.call_count == 1
+    assert pool.stats()['stale_retries'] == 0
+
+
+def test_connect_failure_not_retried():
+    pool = SessionPool()
+    with patch.object(requests.Session, 'request') as mock_req:
+        mock_req.side_effect = requests.exceptions.ConnectionError(
+            'Failed to establish a new connection')
+        with pytest.raises(requests.exceptions.ConnectionError):
+            pool.send('get', 'https://api.kloudless.com/v1/accounts')
+        assert mock_req.call_count == 1
+
+
+@helpers.configured_test
+def test_request_uses_session_pool():
+    pool = SessionPool()
+    with patch.object(pool, 'send') as mock_req:
+        mock_req.return_value = _response()
+        http.request(requests.get, 'accounts',
+                     configuration={'transport': pool})
+        args, kwargs = mock_req.call_args
+        assert args == ('get', 'https://api.kloudless.com/v1/accounts')
+        assert isinstance(kwargs['auth'], http.APIKeyAuth)
@@ -0,0 +1,86 @@
+import json
+
+import pytest
+
+import helpers
+from kloudless import exceptions
+from kloudless.resources import Account, Folder, Permission
+from kloudless.streaming import iter_list_response
+from kloudless.transport import FakeTransport
+
+
+def chunked(data, size):
+    data = data.encode('utf-8')
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize('size', [1, 2, 3, 7, 1000])
+def test_iter_list_response(size):
+    data = (u'{"count": 3, "objects": [{"id": "a", "name": "été"},'
+            u' 12345, {"nested": [1, {"b": null}]}], "cursor": "xyz", '
+            u'"remaining": 0.5}')
+    events = list(iter_list_response(chunked(data, size)))
+    assert events == [
+        ('field', ('count', 3)),
+        ('item', {'id': 'a', 'name': u'été'}),
+        ('item', 12345),
+        ('item', {'nested': [1, {'b': None}]}),
+        ('field', ('cursor', 'xyz')),
+        ('field', ('remaining', 0.5)),
+    ]
+
+
+def test_iter_list_response_empty():
+    assert list(iter_list_response([b'{}'])) == []
+    assert (list(iter_list_response([b'{"objects": [ ]}'])) == [])
+
+
+def test_iter_list_response_invalid():
+    with pytest.raises(ValueError):
+        list(iter_list_response([b'{"objects": [1, 2']))
+    with pytest.raises(ValueError):
+        list(iter_list_response([b'[1, 2]']))
+
+
+@helpers.configured_test
+def test_stream_accounts():
+    transport = FakeTransport()
+    transport.add('get', 'accounts', content=helpers.account_list.encode())
+    accounts = Account.stream(configuration={'transport': transport})
+    expected = json.loads(helpers.account_list)
+
+    ids = [account.id for account in accounts]
+    assert ids == [a['id'] for a in expected['objects']]
+    assert accounts.count == expected['count']
+    assert transport.requests[0].kwargs['stream'] is True
+
+    with pytest.raises(exceptions.KloudlessException):
+        list(accounts)
+
+
+@helpers.configured_test
+def test_stream_folder_contents():
+    transport = FakeTransport()
+    content = json.dumps({'objects': [
+        {'id': 'f1', 'type': 'file', 'account': 7},
+        {'id': 'd1', 'type': 'folder', 'account': 7},
+    ]}).encode()
+    transport.add('get', 'accounts/7/storage/folders/root/contents',
+                  content=content)
+    folder = Folder(id='root', parent_resource=Account(id=7),
+                    configuration={'transport': transport})
+    contents = list(folder.stream_contents())
+    assert [type(c).__name__ for c in contents] == ['File', 'Folder']
+
+
+@helpers.configured_test
+def test_stream_permissions():
+    transport = FakeTransport()
+    content = json.dumps({'permissions': [{'role': 'reader'}]}).encode()
+    transport.add('get', 'accounts/7/storage/files/abc/permissions',
+                  content=content)
+    account = Account(id=7)
+    permissions = list(account.files(id='abc').permissions.stream(
+        configuration={'transport': transport}))
+    assert isinstance(permissions[0], Permission)
+    assert permissions[0].role == 'reader'
@@ -0,0 +1,84 @@
+import threading
+import time
+
+import helpers
+from kloudless import http
+from kloudless.throttling import ExpFallback, RateLimiter, TokenBucket
+from kloudless.transport import FakeTransport
+
+
+def test_token_bucket_burst_then_paced():
+    bucket = TokenBucket(rate=10, capacity=2)
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    assert 0.09 < bucket.reserve() <= 0.1
+    assert 0.19 < bucket.reserve() <= 0.2
+
+
+def test_rate_limiter_keys():
+    limiter = RateLimiter(rate=1, burst=1, account_rate=1, account_burst=1)
+    assert limiter.reserve('APIKey A', account_id='1') == 0
+    # Another credential and account are not limited.
+    assert limiter.reserve('APIKey B', account_id='2') == 0
+    # The same account is limited even with another credential.
+    assert limiter.reserve('APIKey C', account_id='1') > 0
+    assert limiter.reserve('APIKey A') > 0
+
+
+
+def test_reserve_within_max_delay():
+    limiter = RateLimiter(rate=10, burst=1, account_rate=1, account_burst=1)
+    assert limiter.reserve('APIKey A', account_id='1', max_delay=0.5) == 0
+    # The account can't send another request within 0.5s, so nothing is
+    # reserved for the credential either.
+    assert limiter.reserve('APIKey A', account_id='1', max_delay=0.5) > 0.5
+    time.sleep(0.1)
+    assert limiter.reserve('APIKey A', max_delay=0.5) == 0
+
+
+@helpers.configured_test
+def test_rate_limited_requests():
+    transport = FakeTransport()
+    transport.add('get', 'accounts/7', content=helpers.account)
+    configuration = {'transport': transport,
+                     'rate_limiter': RateLimiter(account_rate=100,
+                                                 account_burst=1)}
+    start = time.time()
+    for _ in range(5):
+        http.request('get', 'accounts/7', configuration=configuration)
+    assert time.time() - start >= 0.04
+
+
+def test_throttle_counter_per_thread():
+    strategy = ExpFallback(max_retries=1)
+
+    class Throttled(object):
+        status_code = 429
+        headers = {}
+
+    strategy.track(Throttled())
+    errors = []
+
+    def track_in_thread():
+        try:
+            strategy.track(Throttled())
+        except Exception as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=track_in_thread)
+    thread.start()
+    thread.join()
+    assert not errors
+    assert strategy.counter == 1
+
+
+def test_buckets_are_bounded():
+    limiter = RateLimiter(account_rate=100, account_burst=1, max_buckets=2)
+    limiter.reserve('APIKey A', account_id='1')
+    time.sleep(0.02)
+    for _ in range(10):
+        limiter.reserve('APIKey A', account_id='2')
+    # The bucket of account 1 is full again, unlike that of account 2.
+    limiter.reserve('APIKey A', account_id='3')
+    assert sorted(k[1] for k in limiter._buckets) == ['2', '3']
+    assert limiter.reserve('APIKey A', account_id='2') > 0
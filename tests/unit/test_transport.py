@@ -0,0 +1,59 @@
+import json
+
+import pytest
+
+import helpers
+import kloudless
+from kloudless import exceptions
+from kloudless.resources import Account, Folder, File
+from kloudless.transport import FakeTransport, RequestsTransport
+
+
+def test_default_transport():
+    assert isinstance(kloudless.config.configure()['transport'],
+                      RequestsTransport)
+
+
+@helpers.configured_test
+def test_fake_transport_retrieve():
+    transport = FakeTransport()
+    transport.add('get', 'accounts/7', content=helpers.account)
+    account = Account.retrieve(7, configuration={'transport': transport})
+    assert isinstance(account, Account)
+    assert account.service == 'gdrive'
+
+    fake_request = transport.requests[0]
+    assert fake_request.method == 'GET'
+    assert fake_request.url == 'https://api.kloudless.com/v1/accounts/7'
+    assert fake_request.kwargs['auth'].auth_header == 'APIKey FAKE'
+
+
+@helpers.configured_test
+def test_fake_transport_configured_globally():
+    transport = FakeTransport()
+    kloudless.configure(transport=transport)
+    account = Account.create_from_data(json.loads(helpers.account))
+    transport.add('get', 'accounts/7/storage/folders/root/contents',
+                  content=helpers.root_folder_contents)
+    contents = account.folders().contents()
+    assert len(contents) == 18
+    assert all(isinstance(x, (Folder, File)) for x in contents)
+
+
+@helpers.configured_test
+def test_fake_transport_response_sequence():
+    transport = FakeTransport()
+    transport.add('get', 'accounts/7', status_code=429,
+                  headers={'Retry-After': '0.01'})
+    transport.add('get', 'accounts/7', content=helpers.account)
+    account = Account.retrieve(7, configuration={'transport': transport})
+    assert account.id == 7
+    assert len(transport.requests) == 2
+
+
+@helpers.configured_test
+def test_fake_transport_unknown_path():
+    transport = FakeTransport()
+    with pytest.raises(exceptions.APIException) as excinfo:
+        Account.retrieve(7, configuration={'transport': transport})
+    assert excinfo.value.status == 404
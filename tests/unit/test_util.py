@@ -0,0 +1,48 @@
+import collections
+import datetime
+
+import dateutil.parser
+import pytest
+
+from kloudless import util
+
+
+@pytest.mark.parametrize('timestamp', [
+    '2014-04-01T00:54:02.177000Z',
+    '2014-04-01T20:38:55.691493Z',
+    '2019-02-28T20:26:56Z',
+    '2019-02-28T20:26:56.5Z',
+    '2019-02-28T20:26:56+00:00',
+    '2019-02-28T20:26:56.630000-05:30',
+    '2019-02-28T20:26:56',
+    '2019-02-28',
+    '2019-02-28 20:26:56Z',
+    'Feb 28 2019',
+])
+def test_to_datetime(timestamp):
+    assert util.to_datetime(timestamp) == dateutil.parser.parse(timestamp)
+
+
+def test_to_datetime_timezone():
+    parsed = util.to_datetime('2014-04-01T00:54:02.177000Z')
+    assert parsed.utcoffset() == datetime.timedelta(0)
+    assert util.to_iso(parsed) == '2014-04-01T00:54:02.177000+00:00'
+    assert util.to_datetime(parsed) is parsed
+    assert util.to_datetime(None) is None
+
+    with pytest.raises(ValueError):
+        util.to_datetime('2019-02-30T20:26:56Z')
+
+
+def test_lru_eviction():
+    entries = collections.OrderedDict((k, k) for k in 'abcd')
+    assert util.lru_get(entries, 'a') == 'a'
+    assert util.lru_get(entries, 'x') is None
+    util.lru_evict(entries, 3)
+    assert list(entries) == ['c', 'd', 'a']
+    # Entries that aren't idle are kept while there are others.
+    entries['e'] = 'e'
+    util.lru_evict(entries, 3, idle=lambda v: v in 'ae')
+    assert list(entries) == ['c', 'd', 'e']
+    util.lru_evict(entries, 1, idle=lambda v: False)
+    assert list(entries) == ['e']